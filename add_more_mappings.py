@@ -1,16 +1,24 @@
 #!/usr/bin/env python3
 """
 Add comprehensive distillery mappings for all major duplicates
+
+Writes to a staged copy of the database and swaps it in atomically
+(db_swap), as create_distillery_mappings.py does.
 """
 
 import sqlite3
 from pathlib import Path
 
+from create_distillery_mappings import refresh_canonical_distilleries
+from data_version import bump_data_version
+from db_connections import connect_writer
+from db_swap import discard, publish, stage_copy
+
 DB_PATH = Path(__file__).parent / "databases" / "whiskey_production.db"
 
-def add_comprehensive_mappings():
+def add_comprehensive_mappings(db_path=DB_PATH):
     """Add mappings for all identified duplicates"""
-    conn = sqlite3.connect(DB_PATH)
+    conn = connect_writer(db_path, wal=False)
     cursor = conn.cursor()
 
     # Comprehensive list of mappings
@@ -197,10 +205,14 @@ def add_comprehensive_mappings():
             skipped += 1
 
     conn.commit()
+    updated = refresh_canonical_distilleries(conn)
+    bump_data_version(conn)
     conn.close()
 
     print(f"✅ Inserted {inserted} new mappings")
     print(f"⏭️  Skipped {skipped} existing mappings")
+    if updated is not None:
+        print(f"✅ Refreshed canonical distillery on {updated} whiskeys")
 
     return inserted
 
@@ -209,7 +221,13 @@ if __name__ == '__main__':
     print("ADDING COMPREHENSIVE DISTILLERY MAPPINGS")
     print("=" * 80)
 
-    count = add_comprehensive_mappings()
+    staged_path, source_signature = stage_copy(DB_PATH)
+    try:
+        count = add_comprehensive_mappings(staged_path)
+        publish(staged_path, DB_PATH, source_signature)
+    except BaseException:
+        discard(staged_path)
+        raise
 
     print("\n" + "=" * 80)
     print(f"✅ Added {count} new mappings!")
@@ -4,23 +4,36 @@ Flask API for Whiskey Sensory Training App
 Provides search and quiz generation endpoints
 """
 
-from flask import Flask, jsonify, request
+from flask import Flask, Response, g, jsonify, request
 from flask_cors import CORS
-import sqlite3
 from pathlib import Path
+import gc
+import hashlib
+import math
+import time
 import random
 import re
 import os
 import logging
 
+from data_version import read_data_version
+from autocomplete_index import AutocompleteIndex, MAX_SUGGESTIONS
+from db_connections import ReadOnlyConnectionPool, connect_readonly
+from metrics import MetricsRegistry, instrumented_connect
+from quiz_corpus import DEFAULT_DIFFICULTY, DIFFICULTIES, QuizCorpusCache
+from search_index import has_range_columns, has_search_index, search_whiskeys as run_search
+from structured_logging import configure_logging
+from serialization import FastJSONProvider, active_serializer, dumps as dump_json
+from slugs import create_slug, has_slug_column
+from snapshots import LRUCache, SnapshotCache, file_signature, prepare_payload
+
 app = Flask(__name__)
+# orjson when installed, stdlib json otherwise (see serialization.py)
+app.json = FastJSONProvider(app)
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s [%(levelname)s] %(name)s: %(message)s',
-    handlers=[logging.StreamHandler()]
-)
+# Configure logging: JSON lines written by a background thread, success
+# logs sampled per endpoint (LOG_* env vars, see structured_logging.py)
+configure_logging()
 logger = logging.getLogger(__name__)
 
 # Determine environment
@@ -42,6 +55,7 @@ else:
 CORS(app, origins=ALLOWED_ORIGINS)
 logger.info(f"Environment: {'Development' if DEBUG else 'Production'}")
 logger.info(f"CORS enabled for origins: {ALLOWED_ORIGINS}")
+logger.info(f"JSON serializer: {active_serializer()}")
 
 # ============================================================================
 # Security Headers Middleware
@@ -60,52 +74,223 @@ def set_security_headers(response):
 
     return response
 
-# Database path
-DB_PATH = Path(__file__).parent / "databases" / "whiskey_production.db"
+# ============================================================================
+# Request Metrics (served at /api/metrics)
+# ============================================================================
+
+metrics_registry = MetricsRegistry()
+
+@app.before_request
+def start_request_metrics():
+    """Runs first, so 304s answered by later hooks are counted too"""
+    g.metrics_endpoint = request.endpoint or 'unmatched'
+    g.metrics_start = time.perf_counter()
+    metrics_registry.request_started(g.metrics_endpoint)
+
+@app.after_request
+def record_response_status(response):
+    g.metrics_status = response.status_code
+    return response
+
+@app.teardown_request
+def finish_request_metrics(exc):
+    """Always runs, even when a view raised, so in-flight counts never leak"""
+    start = g.pop('metrics_start', None)
+    if start is None:
+        return
+    metrics_registry.request_finished(
+        g.metrics_endpoint, g.get('metrics_status', 500), time.perf_counter() - start
+    )
+
+# Database path (DB_PATH overrides, e.g. to point at a benchmark catalog)
+DB_PATH = Path(os.getenv('DB_PATH', Path(__file__).parent / "databases" / "whiskey_production.db"))
 
 # ============================================================================
 # Database Helper Functions
 # ============================================================================
 
+# Per-thread pool of read-only connections (see db_connections.py)
+# Pooled connections count and time their SQL for /api/metrics
+db_pool = ReadOnlyConnectionPool(DB_PATH, connect=instrumented_connect)
+
 def get_db_connection():
-    """Create database connection with context manager support"""
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row  # Return rows as dictionaries
-    return conn
+    """
+    Get this thread's pooled read-only connection
 
-def dict_from_row(row):
-    """Convert sqlite3.Row to dictionary"""
-    return dict(zip(row.keys(), row))
+    Still usable as `with get_db_connection() as conn:` - the context
+    manager only wraps a transaction, it never closes the connection.
+    """
+    return db_pool.get()
 
-# ============================================================================
-# Utility Functions
-# ============================================================================
+# Per-worker quiz snapshot, rebuilt when the database file changes
+quiz_corpus = QuizCorpusCache(DB_PATH, lambda: connect_readonly(DB_PATH))
 
-def create_slug(name):
+# Per-worker autocomplete prefix index, rebuilt when the database file changes
+autocomplete_index = SnapshotCache(
+    DB_PATH,
+    lambda: connect_readonly(DB_PATH),
+    lambda conn: AutocompleteIndex.load(conn, slugify=create_slug)
+)
+
+def warm_snapshots():
+    """Build the in-memory snapshots at startup so the first requests don't pay for them"""
+    if not DB_PATH.exists():
+        logger.warning(f"Database not found at {DB_PATH}; snapshots will load on first request")
+        return
+    try:
+        corpus = quiz_corpus.get()
+        logger.info(
+            "Quiz corpus loaded: " + ", ".join(
+                f"{section}={len(data.correct)} whiskeys/{len(data.pool)} descriptors"
+                for section, data in corpus.sections.items()
+            )
+        )
+        logger.info(f"Autocomplete index loaded: {len(autocomplete_index.get())} entries")
+        distilleries_payload.get()
+    except Exception as e:
+        logger.error(f"Failed to warm snapshots: {str(e)}", exc_info=True)
+
+# Gunicorn preload mode (see gunicorn.conf.py): the master imports this
+# module - building the snapshots above once - and forks workers that share
+# those pages copy-on-write until they rebuild after a database change.
+
+def prepare_for_fork():
+    """In the gunicorn master, once the app is loaded and before workers fork"""
+    # SQLite connections must not be carried across fork
+    db_pool.close_all()
+    # Move everything allocated so far out of the collector's reach, so
+    # collections in the workers don't write to (and un-share) these pages
+    gc.collect()
+    gc.freeze()
+    logger.info("Preloaded snapshots frozen for copy-on-write sharing (%d objects)",
+                gc.get_freeze_count())
+
+def reinit_after_fork():
+    """In each worker right after fork: restart state that doesn't survive it"""
+    # The log writer thread only exists in the master
+    configure_logging()
+
+# Optional schema features, re-checked when the DB file changes
+_schema_state = {"signature": None, "features": {}}
+
+def schema_features(conn):
     """
-    Create URL-safe slug from whiskey name
+    Check (once per database version) which optional migrations are applied
 
-    Examples:
-        "Jack Daniel's Old No. 7" -> "jack-daniels-old-no-7"
-        "Maker's Mark 46" -> "makers-mark-46"
-        "Old Forester 1920 (Prohibition Style)" -> "old-forester-1920-prohibition-style"
+    Returns:
+        dict: {"search_index": bool (migration 002), "slugs": bool (migration 005),
+               "range_filters": bool (migration 008)}
     """
-    if not name:
-        return ""
+    signature = file_signature(DB_PATH)
+    if _schema_state["signature"] != signature:
+        features = {
+            "search_index": has_search_index(conn),
+            "slugs": has_slug_column(conn),
+            "range_filters": has_range_columns(conn),
+        }
+        if not features["search_index"]:
+            logger.warning("whiskey_search FTS index missing; search falls back to LIKE scans")
+        if not features["slugs"]:
+            logger.warning("whiskeys.slug column missing; slugs are computed per request")
+        _schema_state.update(signature=signature, features=features)
+    return _schema_state["features"]
 
-    # Convert to lowercase
-    slug = name.lower()
+# ============================================================================
+# HTTP Caching (ETag / 304 / Cache-Control)
+# ============================================================================
 
-    # Remove all non-alphanumeric characters except spaces and hyphens
-    slug = re.sub(r'[^a-z0-9\s-]', '', slug)
+# Current data_version marker (see data_version.py), re-read when the DB file changes
+data_version_cache = SnapshotCache(DB_PATH, lambda: connect_readonly(DB_PATH), read_data_version)
 
-    # Replace multiple spaces/hyphens with single hyphen
-    slug = re.sub(r'[-\s]+', '-', slug)
+def current_data_version():
+    """
+    Version token for the served data
 
-    # Remove leading/trailing hyphens
-    slug = slug.strip('-')
+    Uses the data_version table when present; databases that predate it
+    fall back to the file signature, which also changes on every write.
+    """
+    version = data_version_cache.get()
+    if version is None:
+        return "f" + "-".join(str(part) for part in data_version_cache.signature or ())
+    return str(version)
+
+# Cache-Control per endpoint. Override with CACHE_CONTROL_<ENDPOINT>, e.g.
+# CACHE_CONTROL_GET_DISTILLERIES="public, max-age=600"
+CACHE_CONTROL_DEFAULTS = {
+    'search_whiskeys': 'public, max-age=300',
+    'autocomplete_whiskeys': 'public, max-age=300',
+    'get_distilleries': 'public, max-age=3600',
+    'get_whiskey_by_slug': 'public, max-age=3600',
+    # Only seeded quizzes (see CACHEABLE_WHEN) - same seed, same quiz
+    'get_quiz': 'public, max-age=86400, immutable',
+}
+CACHE_CONTROL = {
+    endpoint: os.getenv(f'CACHE_CONTROL_{endpoint.upper()}', default)
+    for endpoint, default in CACHE_CONTROL_DEFAULTS.items()
+}
+
+# Endpoints that are only cacheable for some requests
+CACHEABLE_WHEN = {
+    'get_quiz': lambda: 'seed' in request.args,
+}
+
+def cache_policy():
+    """Cache-Control value for this request, or None if it mustn't be cached"""
+    policy = CACHE_CONTROL.get(request.endpoint)
+    condition = CACHEABLE_WHEN.get(request.endpoint)
+    if policy is None or (condition is not None and not condition()):
+        return None
+    return policy
+
+def compute_etag():
+    """Strong ETag from (endpoint, params, data_version, content encoding)"""
+    key = "|".join([
+        request.endpoint,
+        repr(sorted((request.view_args or {}).items())),
+        repr(sorted(request.args.items(multi=True))),
+        current_data_version(),
+        # gzip and identity bodies are different representations
+        'gzip' if request.accept_encodings['gzip'] else 'identity',
+    ])
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+@app.before_request
+def answer_conditional_get():
+    """Return 304 for a matching If-None-Match before any SQL runs"""
+    policy = cache_policy() if request.method == 'GET' else None
+    if policy is None:
+        return None
 
-    return slug
+    try:
+        etag = compute_etag()
+    except Exception as e:
+        # No validators is always safe - just serve the full response
+        logger.warning("Could not compute ETag for %s: %s", request.endpoint, e)
+        return None
+
+    g.etag = etag
+    g.cache_policy = policy
+    if etag in request.if_none_match:
+        response = Response(status=304)
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = policy
+        response.vary.add('Accept-Encoding')
+        return response
+    return None
+
+@app.after_request
+def set_cache_headers(response):
+    """Attach ETag + Cache-Control to successful cacheable responses"""
+    etag = g.get('etag')
+    if etag and response.status_code == 200:
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = g.cache_policy
+        response.vary.add('Accept-Encoding')
+    return response
+
+# ============================================================================
+# Utility Functions
+# ============================================================================
 
 def validate_search_query(query):
     """
@@ -129,36 +314,139 @@ def validate_search_query(query):
 
     return True, sanitized.strip(), None
 
+# Search range filters: parameter name -> (whiskeys column, factor to column units)
+RANGE_FILTERS = {
+    'proof': ('proof_numeric', 1),
+    'age': ('age_months', 12),  # years in the API, months in the database
+    'price': ('price_usd', 1),
+}
+
+def parse_range_filters(args):
+    """
+    Read min_/max_ proof, age (years) and price (USD) search parameters
+
+    Returns: (ranges, error_message) - ranges maps whiskeys column -> (low, high)
+    """
+    ranges = {}
+    for name, (column, factor) in RANGE_FILTERS.items():
+        bounds = []
+        for param in (f'min_{name}', f'max_{name}'):
+            raw = args.get(param, '').strip()
+            if not raw:
+                bounds.append(None)
+                continue
+            try:
+                value = float(raw)
+            except ValueError:
+                return None, f"'{param}' must be a number"
+            if not math.isfinite(value) or value < 0:
+                return None, f"'{param}' must be a non-negative number"
+            bounds.append(value * factor)
+        low, high = bounds
+        if low is not None and high is not None and low > high:
+            return None, f"'min_{name}' is greater than 'max_{name}'"
+        if low is not None or high is not None:
+            ranges[column] = (low, high)
+    return ranges, None
+
 # ============================================================================
 # Endpoint 1: Health Check
 # ============================================================================
 
+# Worker start, for liveness uptime
+STARTED_AT = time.monotonic()
+
+# Catalog counters, recomputed only when the data version changes
+_catalog_state = {"version": None, "counts": None}
+
+def catalog_counts(conn):
+    """Whiskey/review/descriptor counts for the current data version"""
+    version = current_data_version()
+    if _catalog_state["version"] != version:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT
+                (SELECT COUNT(*) FROM whiskeys),
+                (SELECT COUNT(DISTINCT whiskey_id) FROM aggregated_whiskey_descriptors),
+                (SELECT COUNT(*) FROM reviews),
+                (SELECT COUNT(*) FROM descriptor_vocabulary WHERE is_active = 1)
+        """)
+        whiskeys, quiz_ready, reviews, descriptors = cursor.fetchone()
+        _catalog_state.update(version=version, counts={
+            "whiskeys": whiskeys,
+            "quiz_ready_whiskeys": quiz_ready,
+            "reviews": reviews,
+            "descriptors": descriptors
+        })
+    return _catalog_state["counts"]
+
+def snapshot_status():
+    """Load state and age of each per-worker snapshot (never triggers a rebuild)"""
+    return {
+        "quiz_corpus": quiz_corpus.status(),
+        "autocomplete_index": autocomplete_index.status(),
+        "distilleries": distilleries_payload.status(),
+    }
+
+@app.route('/api/health/live', methods=['GET'])
+def health_live():
+    """
+    Liveness probe: the worker is up and serving requests
+
+    Never touches the database, so a slow or missing database file
+    doesn't get workers restarted.
+    """
+    return jsonify({
+        "status": "ok",
+        "pid": os.getpid(),
+        "uptime_seconds": round(time.monotonic() - STARTED_AT, 1)
+    }), 200
+
+@app.route('/api/health/ready', methods=['GET'])
 @app.route('/api/health', methods=['GET'])
 def health_check():
     """
-    Health check endpoint
-    Returns API status and database connectivity
+    Readiness probe: the database is reachable and the catalog is loaded
+
+    Uses this worker's pooled connection (health-checked by the pool) and
+    catalog counters cached per data version, so a probe normally runs no
+    SQL at all. Not logged on success - platforms probe every few seconds.
+
+    Returns:
+      {
+        "status": "ok",
+        "database": "connected",
+        "data_version": "3",
+        "whiskeys": 2125,
+        "quiz_ready_whiskeys": 2109,
+        "reviews": 2164,
+        "descriptors": 81,
+        "snapshots": {
+          "quiz_corpus": {"loaded": true, "age_seconds": 812.4, "current": true},
+          ...
+        }
+      }
     """
     try:
-        with get_db_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT COUNT(*) as count FROM whiskeys")
-            whiskey_count = cursor.fetchone()['count']
+        conn = get_db_connection()
+        counts = catalog_counts(conn)
 
-        logger.info(f"Health check successful: {whiskey_count} whiskeys in database")
         return jsonify({
             "status": "ok",
             "database": "connected",
-            "whiskeys": whiskey_count
+            "data_version": current_data_version(),
+            **counts,
+            "snapshots": snapshot_status()
         }), 200
 
     except Exception as e:
-        logger.error(f"Health check failed: {str(e)}", exc_info=True)
+        logger.error("Health check failed: %s", e, exc_info=True)
         return jsonify({
             "status": "error",
             "database": "disconnected",
-            "message": "Database connection failed"
-        }), 500
+            "message": "Database connection failed",
+            "snapshots": snapshot_status()
+        }), 503
 
 # ============================================================================
 # Endpoint 2: Search Whiskeys
@@ -169,8 +457,11 @@ def search_whiskeys():
     """
     Search whiskeys by name
     Query params:
-      - q: search query (required)
+      - q: search query (required unless a range filter is given)
       - limit: max results (default: 20)
+      - min_proof / max_proof: proof range
+      - min_age / max_age: age range in years
+      - min_price / max_price: price range in USD
 
     Returns:
       {
@@ -189,38 +480,51 @@ def search_whiskeys():
     query = request.args.get('q', '').strip()
     limit = min(request.args.get('limit', 20, type=int), 50)  # Cap at 50
 
-    # Validate and sanitize query
-    is_valid, sanitized_query, error_msg = validate_search_query(query)
-    if not is_valid:
-        logger.warning(f"Invalid search query: {query}")
+    ranges, error_msg = parse_range_filters(request.args)
+    if error_msg:
+        logger.warning("Invalid search range filter: %s", error_msg)
         return jsonify({"error": error_msg}), 400
 
+    # Validate and sanitize query (optional when filtering by range only)
+    sanitized_query = None
+    if query or not ranges:
+        is_valid, sanitized_query, error_msg = validate_search_query(query)
+        if not is_valid:
+            logger.warning("Invalid search query: %s", query)
+            return jsonify({"error": error_msg}), 400
+
     try:
         with get_db_connection() as conn:
-            cursor = conn.cursor()
+            features = schema_features(conn)
+            if ranges and not features["range_filters"]:
+                return jsonify({
+                    "error": "Range filters are not available yet. Please try again later."
+                }), 503
 
             # Search whiskeys by name or canonical distillery name
-            cursor.execute("""
-                SELECT
-                    w.whiskey_id,
-                    w.name,
-                    COALESCE(dm.canonical_name, w.distillery) as distillery
-                FROM whiskeys w
-                LEFT JOIN distillery_mappings dm ON w.distillery = dm.variant_name
-                WHERE w.name LIKE ?
-                   OR COALESCE(dm.canonical_name, w.distillery) LIKE ?
-                ORDER BY w.name
-                LIMIT ?
-            """, (f"%{sanitized_query}%", f"%{sanitized_query}%", limit))
-
-            results = []
-            for row in cursor.fetchall():
-                whiskey = dict_from_row(row)
-                # Generate URL-friendly slug using proper function
-                whiskey['slug'] = create_slug(whiskey['name'])
-                results.append(whiskey)
-
-        logger.info(f"Search query '{sanitized_query}' returned {len(results)} results")
+            # (bm25-ranked FTS5 trigram match, LIKE fallback - see search_index.py),
+            # narrowed by indexed proof/age/price ranges
+            rows = run_search(conn, sanitized_query, limit,
+                              use_fts=features["search_index"],
+                              with_slugs=features["slugs"],
+                              ranges=ranges)
+
+            # Build result objects straight from the row tuples. The stored
+            # slug (migration 005) is computed only on older databases; a
+            # whiskey added without one stays null until slugs.backfill_slugs()
+            # runs, since /api/whiskeys/<slug> only resolves stored slugs.
+            with_slugs = features["slugs"]
+            results = [
+                {
+                    "whiskey_id": whiskey_id,
+                    "name": name,
+                    "distillery": distillery,
+                    "slug": slug if with_slugs else create_slug(name)
+                }
+                for whiskey_id, name, distillery, slug in rows
+            ]
+
+        logger.info("Search query '%s' returned %d results", sanitized_query, len(results))
         return jsonify({
             "query": sanitized_query,
             "count": len(results),
@@ -228,7 +532,7 @@ def search_whiskeys():
         }), 200
 
     except Exception as e:
-        logger.error(f"Search failed for query '{sanitized_query}': {str(e)}", exc_info=True)
+        logger.error("Search failed for query '%s': %s", sanitized_query, e, exc_info=True)
         return jsonify({
             "error": "An error occurred while searching. Please try again."
         }), 500
@@ -237,11 +541,81 @@ def search_whiskeys():
 # Endpoint 3: Get Distilleries List
 # ============================================================================
 
+def load_distilleries(conn):
+    """
+    Distilleries with whiskey counts, alphabetical (case-insensitive)
+
+    Uses the materialized whiskeys.canonical_distillery column (migration 003)
+    when present, otherwise joins distillery_mappings on the fly.
+    """
+    cursor = conn.cursor()
+    cursor.execute("PRAGMA table_info(whiskeys)")
+    has_canonical_column = 'canonical_distillery' in {row[1] for row in cursor.fetchall()}
+
+    if has_canonical_column:
+        cursor.execute("""
+            SELECT
+                canonical_distillery as name,
+                COUNT(*) as whiskey_count
+            FROM whiskeys
+            WHERE distillery IS NOT NULL
+              AND distillery != ''
+            GROUP BY canonical_distillery
+            ORDER BY name COLLATE NOCASE
+        """)
+    else:
+        # Get distilleries with canonical names from mappings
+        # Use COALESCE to prefer canonical name, fallback to original
+        cursor.execute("""
+            SELECT
+                COALESCE(dm.canonical_name, w.distillery) as name,
+                COUNT(DISTINCT w.whiskey_id) as whiskey_count
+            FROM whiskeys w
+            LEFT JOIN distillery_mappings dm ON w.distillery = dm.variant_name
+            WHERE w.distillery IS NOT NULL
+              AND w.distillery != ''
+            GROUP BY COALESCE(dm.canonical_name, w.distillery)
+            HAVING COUNT(DISTINCT w.whiskey_id) > 0
+            ORDER BY name COLLATE NOCASE
+        """)
+
+    return [
+        {"name": name, "whiskey_count": whiskey_count}
+        for name, whiskey_count in cursor.fetchall()
+    ]
+
+def build_distilleries_payload(conn):
+    """Render the /api/distilleries body once per database version"""
+    distilleries = load_distilleries(conn)
+    body = dump_json({
+        "distilleries": distilleries,
+        "total": len(distilleries)
+    }) + b"\n"
+    return prepare_payload(body)
+
+# Pre-serialized, pre-gzipped /api/distilleries body, rebuilt when the database file changes
+distilleries_payload = SnapshotCache(
+    DB_PATH, lambda: connect_readonly(DB_PATH), build_distilleries_payload
+)
+
+def prepared_json_response(payload, status=200):
+    """Serve a PreparedPayload, gzipped if the client accepts it"""
+    if request.accept_encodings['gzip']:
+        response = Response(payload.gzipped, status=status, mimetype='application/json')
+        response.headers['Content-Encoding'] = 'gzip'
+    else:
+        response = Response(payload.body, status=status, mimetype='application/json')
+    response.vary.add('Accept-Encoding')
+    return response
+
 @app.route('/api/distilleries', methods=['GET'])
 def get_distilleries():
     """
     Get alphabetical list of all distilleries with whiskey counts
 
+    The body only changes when the pipeline rewrites the database, so it is
+    rendered and gzipped once per database version and served as-is.
+
     Returns:
       {
         "distilleries": [
@@ -255,34 +629,10 @@ def get_distilleries():
       }
     """
     try:
-        with get_db_connection() as conn:
-            cursor = conn.cursor()
-
-            # Get distilleries with canonical names from mappings
-            # Use COALESCE to prefer canonical name, fallback to original
-            cursor.execute("""
-                SELECT
-                    COALESCE(dm.canonical_name, w.distillery) as name,
-                    COUNT(DISTINCT w.whiskey_id) as whiskey_count
-                FROM whiskeys w
-                LEFT JOIN distillery_mappings dm ON w.distillery = dm.variant_name
-                WHERE w.distillery IS NOT NULL
-                  AND w.distillery != ''
-                GROUP BY COALESCE(dm.canonical_name, w.distillery)
-                HAVING COUNT(DISTINCT w.whiskey_id) > 0
-                ORDER BY name COLLATE NOCASE
-            """)
-
-            distilleries = [dict_from_row(row) for row in cursor.fetchall()]
-
-        logger.info(f"Distilleries list returned {len(distilleries)} distilleries")
-        return jsonify({
-            "distilleries": distilleries,
-            "total": len(distilleries)
-        }), 200
+        return prepared_json_response(distilleries_payload.get())
 
     except Exception as e:
-        logger.error(f"Failed to fetch distilleries: {str(e)}", exc_info=True)
+        logger.error("Failed to fetch distilleries: %s", e, exc_info=True)
         return jsonify({
             "error": "An error occurred while fetching distilleries. Please try again."
         }), 500
@@ -291,13 +641,46 @@ def get_distilleries():
 # Endpoint 4: Get Quiz Data
 # ============================================================================
 
+# Seeds accepted by /api/quiz (non-negative 31-bit, so they survive any client)
+MAX_QUIZ_SEED = 2**31 - 1
+
+# Rendered seeded quizzes, keyed by (whiskey_id, seed, difficulty, data_version)
+QUIZ_CACHE_SIZE = int(os.getenv('QUIZ_CACHE_SIZE', 2048))
+seeded_quizzes = LRUCache(QUIZ_CACHE_SIZE)
+
+def quiz_rng(whiskey_id, seed, difficulty, data_version):
+    """Random generator fully determined by the seeded quiz's cache key"""
+    return random.Random(f"{whiskey_id}:{seed}:{difficulty}:{data_version}")
+
+def parse_quiz_seed(value):
+    """Validate a quiz seed; returns an int or raises ValueError"""
+    if type(value) is not int:
+        value = str(value)
+        if not value.isdigit():
+            raise ValueError(value)
+        value = int(value)
+    if not 0 <= value <= MAX_QUIZ_SEED:
+        raise ValueError(value)
+    return value
+
 @app.route('/api/quiz/<int:whiskey_id>', methods=['GET'])
 def get_quiz(whiskey_id):
     """
     Generate quiz data for a specific whiskey
 
+    Query params:
+      - difficulty: easy | medium | hard (default: medium). Controls how
+        plausible the wrong answers are (see quiz_corpus.DIFFICULTIES)
+      - seed: optional integer 0..2147483647. The same (whiskey, seed,
+        difficulty) gives the same quiz until the data changes, so seeded
+        responses are served from an in-process LRU and sent with an ETag
+        and an immutable Cache-Control. Unseeded quizzes stay random and
+        uncached.
+
     Returns:
       {
+        "difficulty": "medium",
+        "seed": 42,  // only when requested with a seed
         "whiskey": {
           "id": 4,
           "name": "garrison brothers cowboy bourbon (2025)",
@@ -313,117 +696,247 @@ def get_quiz(whiskey_id):
         }
       }
     """
+    difficulty = request.args.get('difficulty', DEFAULT_DIFFICULTY)
+    if difficulty not in DIFFICULTIES:
+        return jsonify({"error": f"difficulty must be one of: {', '.join(DIFFICULTIES)}"}), 400
+
+    seed = request.args.get('seed')
+    if seed is not None:
+        try:
+            seed = parse_quiz_seed(seed)
+        except ValueError:
+            return jsonify({"error": f"seed must be an integer between 0 and {MAX_QUIZ_SEED}"}), 400
+
     try:
+        rng = random
+        if seed is not None:
+            data_version = current_data_version()
+            cache_key = (whiskey_id, seed, difficulty, data_version)
+            cached = seeded_quizzes.get(cache_key)
+            if cached is not None:
+                return prepared_json_response(cached)
+            rng = quiz_rng(*cache_key)
+
         with get_db_connection() as conn:
             cursor = conn.cursor()
+            # Get whiskey details and source review URLs
+            whiskeys, source_reviews = fetch_quiz_whiskeys(cursor, [whiskey_id])
+
+        whiskey = whiskeys.get(whiskey_id)
+        if not whiskey:
+            logger.warning("Quiz requested for non-existent whiskey_id: %s", whiskey_id)
+            return jsonify({
+                "error": "Whiskey not found"
+            }), 404
+
+        # Generate quiz for each section from the in-memory snapshot
+        payload = build_quiz(quiz_corpus.get(), whiskey, source_reviews[whiskey_id],
+                             rng, difficulty, seed)
+        if payload is None:
+            return jsonify({
+                "error": "No tasting data available for this whiskey"
+            }), 404
+
+        logger.info("Generated quiz for whiskey_id %s: %s", whiskey_id, whiskey['name'])
+        if seed is None:
+            return jsonify(payload), 200
+
+        prepared = prepare_payload(dump_json(payload) + b"\n")
+        seeded_quizzes.put(cache_key, prepared)
+        return prepared_json_response(prepared)
 
-            # Get whiskey details
-            cursor.execute("""
-                SELECT whiskey_id, name, distillery
-                FROM whiskeys
-                WHERE whiskey_id = ?
-            """, (whiskey_id,))
-
-            whiskey_row = cursor.fetchone()
-            if not whiskey_row:
-                logger.warning(f"Quiz requested for non-existent whiskey_id: {whiskey_id}")
-                return jsonify({
-                    "error": "Whiskey not found"
-                }), 404
+    except Exception as e:
+        logger.error("Quiz generation failed for whiskey_id %s: %s", whiskey_id, e, exc_info=True)
+        return jsonify({
+            "error": "An error occurred while generating the quiz. Please try again."
+        }), 500
 
-            whiskey = dict_from_row(whiskey_row)
+# Upper bound on whiskey ids per /api/quiz/batch request
+MAX_BATCH_QUIZZES = int(os.getenv('MAX_BATCH_QUIZZES', 25))
 
-            # Get source review URLs for this whiskey
-            cursor.execute("""
-                SELECT DISTINCT source_site, source_url
-                FROM reviews
-                WHERE whiskey_id = ?
-                AND source_url IS NOT NULL
-                ORDER BY source_site
-            """, (whiskey_id,))
-
-            source_reviews = [
-                {
-                    "site": row['source_site'],
-                    "url": row['source_url']
-                }
-                for row in cursor.fetchall()
-            ]
+@app.route('/api/quiz/batch', methods=['POST'])
+def get_quiz_batch():
+    """
+    Generate quizzes for several whiskeys in one request (e.g. a tasting flight)
 
-            # Generate quiz for each section
-            quiz = {}
-            for section in ['nose', 'palate', 'finish']:
-                section_data = generate_quiz_section(cursor, whiskey_id, section)
-                if section_data is None:
-                    logger.warning(f"No tasting data for whiskey_id {whiskey_id}, section {section}")
-                    return jsonify({
-                        "error": "No tasting data available for this whiskey"
-                    }), 404
-                quiz[section] = section_data
-
-        logger.info(f"Generated quiz for whiskey_id {whiskey_id}: {whiskey['name']}")
+    Request body:
+      {"whiskey_ids": [4, 12, 31], "difficulty": "hard", "seed": 42}
+      // difficulty and seed optional
+
+    Returns:
+      {
+        "count": 2,
+        "quizzes": {
+          "4": {"whiskey": {...}, "quiz": {...}, "source_reviews": [...]},
+          "12": {...}
+        },
+        "errors": {
+          "31": "No tasting data available for this whiskey"
+        }
+      }
+
+    Every quiz has the same shape as GET /api/quiz/<whiskey_id>, and with
+    a seed each one matches the single-quiz response for that seed. Whiskey
+    details and source reviews are fetched with one IN (...) query each;
+    quiz sections come from the in-memory snapshot.
+    """
+    data = request.get_json(silent=True)
+    whiskey_ids = data.get('whiskey_ids') if isinstance(data, dict) else None
+
+    if not isinstance(whiskey_ids, list) or not whiskey_ids:
+        return jsonify({"error": "Body must be JSON with a non-empty 'whiskey_ids' list"}), 400
+    if any(type(whiskey_id) is not int for whiskey_id in whiskey_ids):
+        return jsonify({"error": "'whiskey_ids' must contain integers only"}), 400
+
+    # De-duplicate, keeping request order
+    whiskey_ids = list(dict.fromkeys(whiskey_ids))
+    if len(whiskey_ids) > MAX_BATCH_QUIZZES:
+        return jsonify({"error": f"Too many whiskey ids (max {MAX_BATCH_QUIZZES})"}), 400
+
+    difficulty = data.get('difficulty', DEFAULT_DIFFICULTY)
+    if difficulty not in DIFFICULTIES:
+        return jsonify({"error": f"difficulty must be one of: {', '.join(DIFFICULTIES)}"}), 400
+
+    seed = data.get('seed')
+    if seed is not None:
+        try:
+            seed = parse_quiz_seed(seed)
+        except ValueError:
+            return jsonify({"error": f"seed must be an integer between 0 and {MAX_QUIZ_SEED}"}), 400
+
+    try:
+        data_version = current_data_version() if seed is not None else None
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            whiskeys, source_reviews = fetch_quiz_whiskeys(cursor, whiskey_ids)
+
+        corpus = quiz_corpus.get()
+        quizzes = {}
+        errors = {}
+        for whiskey_id in whiskey_ids:
+            whiskey = whiskeys.get(whiskey_id)
+            if not whiskey:
+                errors[str(whiskey_id)] = "Whiskey not found"
+                continue
+
+            rng = random
+            if seed is not None:
+                rng = quiz_rng(whiskey_id, seed, difficulty, data_version)
+            payload = build_quiz(corpus, whiskey, source_reviews[whiskey_id],
+                                 rng, difficulty, seed)
+            if payload is None:
+                errors[str(whiskey_id)] = "No tasting data available for this whiskey"
+                continue
+            quizzes[str(whiskey_id)] = payload
+
+        logger.info("Generated %d quizzes in batch (%d errors)", len(quizzes), len(errors))
         return jsonify({
-            "whiskey": {
-                "id": whiskey['whiskey_id'],
-                "name": whiskey['name'],
-                "distillery": whiskey['distillery']
-            },
-            "quiz": quiz,
-            "source_reviews": source_reviews
+            "count": len(quizzes),
+            "quizzes": quizzes,
+            "errors": errors
         }), 200
 
     except Exception as e:
-        logger.error(f"Quiz generation failed for whiskey_id {whiskey_id}: {str(e)}", exc_info=True)
+        logger.error("Batch quiz generation failed for whiskey_ids %s: %s", whiskey_ids, e, exc_info=True)
         return jsonify({
-            "error": "An error occurred while generating the quiz. Please try again."
+            "error": "An error occurred while generating the quizzes. Please try again."
         }), 500
 
-def generate_quiz_section(cursor, whiskey_id, section):
+def fetch_quiz_whiskeys(cursor, whiskey_ids):
+    """
+    Load whiskey details and source review links for quiz payloads
+
+    Two queries regardless of how many ids are requested.
+
+    Returns:
+        (whiskeys, source_reviews):
+            whiskeys: {whiskey_id: {"whiskey_id", "name", "distillery"}}
+            source_reviews: {whiskey_id: [{"site", "url"}, ...]} for each found whiskey
+    """
+    placeholders = ','.join('?' * len(whiskey_ids))
+
+    cursor.execute(f"""
+        SELECT whiskey_id, name, distillery
+        FROM whiskeys
+        WHERE whiskey_id IN ({placeholders})
+    """, whiskey_ids)
+    whiskeys = {
+        whiskey_id: {"whiskey_id": whiskey_id, "name": name, "distillery": distillery}
+        for whiskey_id, name, distillery in cursor.fetchall()
+    }
+
+    source_reviews = {whiskey_id: [] for whiskey_id in whiskeys}
+    if whiskeys:
+        cursor.execute(f"""
+            SELECT DISTINCT whiskey_id, source_site, source_url
+            FROM reviews
+            WHERE whiskey_id IN ({placeholders})
+            AND source_url IS NOT NULL
+            ORDER BY whiskey_id, source_site, source_url
+        """, whiskey_ids)
+        for whiskey_id, site, url in cursor.fetchall():
+            source_reviews[whiskey_id].append({"site": site, "url": url})
+
+    return whiskeys, source_reviews
+
+def build_quiz(corpus, whiskey, source_reviews, rng=random, difficulty=DEFAULT_DIFFICULTY,
+               seed=None):
+    """
+    Assemble the quiz payload for one whiskey
+
+    Output depends only on the arguments, so a seeded rng (see quiz_rng)
+    gives a reproducible quiz; seed is echoed in the payload when given.
+
+    Returns:
+        dict in the /api/quiz/<whiskey_id> response shape, or None if any
+        section has no tasting data
+    """
+    whiskey_id = whiskey['whiskey_id']
+    quiz = {}
+    for section in ['nose', 'palate', 'finish']:
+        section_data = generate_quiz_section(corpus, whiskey_id, section, rng, difficulty)
+        if section_data is None:
+            logger.warning("No tasting data for whiskey_id %s, section %s", whiskey_id, section)
+            return None
+        quiz[section] = section_data
+
+    payload = {"difficulty": difficulty}
+    if seed is not None:
+        payload["seed"] = seed
+    payload.update({
+        "whiskey": {
+            "id": whiskey_id,
+            "name": whiskey['name'],
+            "distillery": whiskey['distillery']
+        },
+        "quiz": quiz,
+        "source_reviews": source_reviews
+    })
+    return payload
+
+def generate_quiz_section(corpus, whiskey_id, section, rng=random, difficulty=DEFAULT_DIFFICULTY):
     """
     Generate quiz options for one section (nose/palate/finish)
 
     Algorithm:
     1. Get correct descriptors for this whiskey + section
-    2. Get incorrect descriptors from OTHER whiskeys (same section)
+    2. Get incorrect descriptors from OTHER whiskeys (same section),
+       chosen per difficulty (hard = nearest neighbors of the correct ones)
     3. Mix to create 9 total options (4-6 correct, 3-5 incorrect)
     4. Shuffle randomly
     5. Return with correct_count hint
+
+    Both descriptor lists come from the in-memory QuizCorpus snapshot,
+    so no SQL runs here.
     """
 
     # Get CORRECT descriptors for this whiskey
-    cursor.execute("""
-        SELECT dv.descriptor_id, dv.descriptor_name
-        FROM aggregated_whiskey_descriptors awd
-        JOIN descriptor_vocabulary dv ON awd.descriptor_id = dv.descriptor_id
-        WHERE awd.whiskey_id = ?
-          AND awd.tasting_section = ?
-        ORDER BY awd.review_count DESC, dv.descriptor_name
-    """, (whiskey_id, section))
-
-    correct_descriptors = [dict_from_row(row) for row in cursor.fetchall()]
+    correct_descriptors = corpus.correct_descriptors(section, whiskey_id)
 
     # Check if whiskey has any descriptors
     if len(correct_descriptors) == 0:
         return None  # Will be handled by caller
 
-    # Get INCORRECT descriptors from OTHER whiskeys
-    cursor.execute("""
-        SELECT DISTINCT dv.descriptor_id, dv.descriptor_name
-        FROM aggregated_whiskey_descriptors awd
-        JOIN descriptor_vocabulary dv ON awd.descriptor_id = dv.descriptor_id
-        WHERE awd.whiskey_id != ?
-          AND awd.tasting_section = ?
-          AND dv.descriptor_id NOT IN (
-              SELECT descriptor_id
-              FROM aggregated_whiskey_descriptors
-              WHERE whiskey_id = ? AND tasting_section = ?
-          )
-        ORDER BY RANDOM()
-        LIMIT 20
-    """, (whiskey_id, section, whiskey_id, section))
-
-    incorrect_descriptors = [dict_from_row(row) for row in cursor.fetchall()]
-
     # Determine how many correct vs incorrect to show
     # Goal: 9 total options, with 4-6 correct if available
     total_options = 9
@@ -442,33 +955,175 @@ def generate_quiz_section(cursor, whiskey_id, section):
 
     # Sample descriptors
     selected_correct = correct_descriptors[:num_correct]
-    selected_incorrect = incorrect_descriptors[:num_incorrect]
+    # Get INCORRECT descriptors from OTHER whiskeys
+    selected_incorrect = corpus.sample_distractors(
+        section, whiskey_id, num_incorrect, rng,
+        difficulty=difficulty, anchors=selected_correct
+    )
 
     # Build options list
     options = []
 
-    for desc in selected_correct:
+    for descriptor_id in selected_correct:
         options.append({
-            "id": desc['descriptor_id'],
-            "name": desc['descriptor_name'],
+            "id": descriptor_id,
+            "name": corpus.name(descriptor_id),
             "correct": True
         })
 
-    for desc in selected_incorrect:
+    for descriptor_id in selected_incorrect:
         options.append({
-            "id": desc['descriptor_id'],
-            "name": desc['descriptor_name'],
+            "id": descriptor_id,
+            "name": corpus.name(descriptor_id),
             "correct": False
         })
 
     # Shuffle options (so correct answers aren't always first)
-    random.shuffle(options)
+    rng.shuffle(options)
 
     return {
         "options": options,
         "correct_count": len(selected_correct)
     }
 
+# ============================================================================
+# Endpoint 5: Autocomplete
+# ============================================================================
+
+@app.route('/api/whiskeys/autocomplete', methods=['GET'])
+def autocomplete_whiskeys():
+    """
+    Search-as-you-type suggestions served from memory (no SQL per request)
+
+    Query params:
+      - prefix: what the user has typed so far (required)
+      - limit: max suggestions (default: 8, max: 20)
+
+    Returns:
+      {
+        "prefix": "buff",
+        "count": 2,
+        "suggestions": [
+          {"type": "distillery", "name": "Buffalo Trace Distillery", "whiskey_count": 23},
+          {
+            "type": "whiskey",
+            "whiskey_id": 12,
+            "name": "buffalo trace kentucky straight bourbon",
+            "distillery": "Buffalo Trace Distillery",
+            "slug": "buffalo-trace-kentucky-straight-bourbon"
+          }
+        ]
+      }
+    """
+    prefix = request.args.get('prefix', '').strip()
+    limit = min(request.args.get('limit', 8, type=int), MAX_SUGGESTIONS)
+
+    if not prefix:
+        return jsonify({"error": "Query parameter 'prefix' is required"}), 400
+    if len(prefix) > 100:
+        return jsonify({"error": "Prefix too long (max 100 characters)"}), 400
+
+    try:
+        suggestions = autocomplete_index.get().suggest(prefix, limit)
+        return jsonify({
+            "prefix": prefix,
+            "count": len(suggestions),
+            "suggestions": suggestions
+        }), 200
+
+    except Exception as e:
+        logger.error("Autocomplete failed for prefix '%s': %s", prefix, e, exc_info=True)
+        return jsonify({
+            "error": "An error occurred while fetching suggestions. Please try again."
+        }), 500
+
+# ============================================================================
+# Endpoint 6: Whiskey by Slug
+# ============================================================================
+
+# Slugs are create_slug() output, optionally with a -N collision suffix
+SLUG_PATTERN = re.compile(r'^[a-z0-9]+(?:-[a-z0-9]+)*$')
+
+# Serialized + gzipped detail bodies, keyed by (data_version, slug)
+MAX_CACHED_WHISKEY_PAYLOADS = int(os.getenv('MAX_CACHED_WHISKEY_PAYLOADS', 4096))
+whiskey_payloads = LRUCache(MAX_CACHED_WHISKEY_PAYLOADS)
+
+@app.route('/api/whiskeys/<slug>', methods=['GET'])
+def get_whiskey_by_slug(slug):
+    """
+    Resolve a whiskey URL slug (as returned by search/autocomplete)
+
+    Single lookup on the unique whiskeys.slug index (migration 005). The
+    rendered body is cached per slug and data version.
+
+    Returns:
+      {
+        "whiskey_id": 4,
+        "name": "garrison brothers cowboy bourbon (2025)",
+        "distillery": "Garrison Brothers",
+        "slug": "garrison-brothers-cowboy-bourbon-2025"
+      }
+    """
+    if len(slug) > 200 or not SLUG_PATTERN.match(slug):
+        return jsonify({"error": "Invalid slug"}), 400
+
+    cache_key = (current_data_version(), slug)
+    payload = whiskey_payloads.get(cache_key)
+    if payload is not None:
+        return prepared_json_response(payload)
+
+    try:
+        with get_db_connection() as conn:
+            if not schema_features(conn)["slugs"]:
+                return jsonify({"error": "Whiskey not found"}), 404
+
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT
+                    w.whiskey_id,
+                    w.name,
+                    COALESCE(dm.canonical_name, w.distillery) as distillery
+                FROM whiskeys w
+                LEFT JOIN distillery_mappings dm ON w.distillery = dm.variant_name
+                WHERE w.slug = ?
+            """, (slug,))
+            row = cursor.fetchone()
+
+        if not row:
+            return jsonify({"error": "Whiskey not found"}), 404
+
+        whiskey_id, name, distillery = row
+        payload = prepare_payload(dump_json({
+            "whiskey_id": whiskey_id,
+            "name": name,
+            "distillery": distillery,
+            "slug": slug
+        }) + b"\n")
+        whiskey_payloads.put(cache_key, payload)
+        return prepared_json_response(payload)
+
+    except Exception as e:
+        logger.error("Slug lookup failed for '%s': %s", slug, e, exc_info=True)
+        return jsonify({
+            "error": "An error occurred while fetching the whiskey. Please try again."
+        }), 500
+
+# ============================================================================
+# Endpoint 7: Metrics
+# ============================================================================
+
+@app.route('/api/metrics', methods=['GET'])
+def get_metrics():
+    """
+    Per-endpoint latency histograms, in-flight gauges, response counts and
+    SQL statement counts/time in Prometheus text format
+
+    Metrics are per worker process: each gunicorn worker reports its own.
+    """
+    return Response(metrics_registry.render(), mimetype='text/plain; version=0.0.4')
+
+warm_snapshots()
+
 # ============================================================================
 # Run Server
 # ============================================================================
@@ -478,10 +1133,16 @@ if __name__ == '__main__':
     logger.info("WHISKEY SENSORY TRAINING API")
     logger.info("=" * 80)
     logger.info("Endpoints:")
-    logger.info("  GET  /api/health")
+    logger.info("  GET  /api/health (alias of /api/health/ready)")
+    logger.info("  GET  /api/health/live")
+    logger.info("  GET  /api/health/ready")
     logger.info("  GET  /api/whiskeys/search?q=<query>")
+    logger.info("  GET  /api/whiskeys/autocomplete?prefix=<prefix>")
     logger.info("  GET  /api/distilleries")
     logger.info("  GET  /api/quiz/<whiskey_id>")
+    logger.info("  POST /api/quiz/batch")
+    logger.info("  GET  /api/whiskeys/<slug>")
+    logger.info("  GET  /api/metrics")
     logger.info("=" * 80)
 
     # Security: Use environment-based configuration
@@ -0,0 +1,175 @@
+"""
+In-memory prefix index for search-as-you-type suggestions.
+
+Every whiskey name and canonical distillery name is normalized and indexed
+at each word boundary ("eagle rare 10 year" -> "eagle rare 10 year",
+"rare 10 year", "10 year", "year"), so a prefix matches the start of any
+word. Keys live in one sorted list searched with bisect; prefixes up to
+SHORT_PREFIX_LENGTH characters (where ranges are widest) are answered from
+a precomputed top-k table.
+
+Entries are stored in popularity order, so "top k by popularity" is just
+"the k smallest entry indices" in a key range.
+"""
+
+import heapq
+import re
+from bisect import bisect_left
+
+from slugs import has_slug_column
+
+# Maximum suggestions a caller can ask for
+MAX_SUGGESTIONS = 20
+
+# Prefixes this short are served from the precomputed table
+SHORT_PREFIX_LENGTH = 3
+
+
+def normalize_for_index(text):
+    """
+    Normalize a name or typed prefix for matching.
+
+    Lowercases, drops apostrophes ("maker's" -> "makers") and turns any other
+    punctuation into spaces.
+
+    Examples:
+        "Maker's Mark 46" -> "makers mark 46"
+        "Old Forester 1920 (Prohibition Style)" -> "old forester 1920 prohibition style"
+    """
+    if not text:
+        return ""
+    text = text.lower().replace("'", "").replace("\u2019", "")
+    text = re.sub(r'[^\w\s]', ' ', text)
+    return ' '.join(text.split())
+
+
+def word_suffixes(normalized):
+    """Yield the normalized string starting at each word boundary."""
+    start = 0
+    while True:
+        yield normalized[start:]
+        start = normalized.find(' ', start) + 1
+        if start == 0:
+            return
+
+
+class AutocompleteIndex:
+    """Immutable prefix index over whiskey and distillery names."""
+
+    def __init__(self, entries, keys, key_entries, short_prefix_top):
+        # entries[i] is the suggestion payload, most popular first
+        self.entries = entries
+        # keys sorted ascending; key_entries[j] is the entry index for keys[j]
+        self.keys = keys
+        self.key_entries = key_entries
+        # prefix (len <= SHORT_PREFIX_LENGTH) -> top MAX_SUGGESTIONS entry indices
+        self.short_prefix_top = short_prefix_top
+
+    @classmethod
+    def load(cls, conn, slugify=None):
+        """
+        Build the index from whiskeys, reviews and distillery_mappings.
+
+        Popularity is review count for a whiskey, and the total review count
+        of its whiskeys for a distillery.
+
+        Args:
+            conn: sqlite3 connection to the production database
+            slugify: Optional callable name -> URL slug, used on databases
+                without the slug column. With the column, a whiskey that has
+                no slug yet gets None: /api/whiskeys/<slug> only resolves
+                stored slugs
+
+        Returns:
+            AutocompleteIndex
+        """
+        cursor = conn.cursor()
+        # Stored slugs (migration 005) when available
+        with_slugs = has_slug_column(conn)
+        slug_column = "w.slug" if with_slugs else "NULL"
+        cursor.execute(f"""
+            SELECT
+                w.whiskey_id,
+                w.name,
+                COALESCE(dm.canonical_name, w.distillery) as distillery,
+                (SELECT COUNT(*) FROM reviews r WHERE r.whiskey_id = w.whiskey_id) as review_count,
+                {slug_column} as slug
+            FROM whiskeys w
+            LEFT JOIN distillery_mappings dm ON w.distillery = dm.variant_name
+        """)
+
+        candidates = []  # (popularity, sort_name, payload)
+        distilleries = {}  # canonical name -> [whiskey_count, review_count]
+        for whiskey_id, name, distillery, review_count, slug in cursor.fetchall():
+            if not with_slugs and slugify:
+                slug = slugify(name)
+            candidates.append((review_count, name, {
+                "type": "whiskey",
+                "whiskey_id": whiskey_id,
+                "name": name,
+                "distillery": distillery,
+                "slug": slug,
+            }))
+            if distillery:
+                totals = distilleries.setdefault(distillery, [0, 0])
+                totals[0] += 1
+                totals[1] += review_count
+
+        for name, (whiskey_count, review_count) in distilleries.items():
+            candidates.append((review_count, name, {
+                "type": "distillery",
+                "name": name,
+                "whiskey_count": whiskey_count,
+            }))
+
+        candidates.sort(key=lambda c: (-c[0], c[1]))
+        entries = tuple(payload for _, _, payload in candidates)
+
+        pairs = []
+        short_prefix_top = {}
+        for index, entry in enumerate(entries):
+            for key in set(word_suffixes(normalize_for_index(entry["name"]))):
+                if not key:
+                    continue
+                pairs.append((key, index))
+                # Entries arrive in popularity order, so the first
+                # MAX_SUGGESTIONS seen for a prefix are its top-k
+                for length in range(1, min(len(key), SHORT_PREFIX_LENGTH) + 1):
+                    top = short_prefix_top.setdefault(key[:length], [])
+                    if len(top) < MAX_SUGGESTIONS and (not top or top[-1] != index):
+                        top.append(index)
+
+        pairs.sort()
+        keys = [key for key, _ in pairs]
+        key_entries = [index for _, index in pairs]
+        short_prefix_top = {prefix: tuple(top) for prefix, top in short_prefix_top.items()}
+
+        return cls(entries, keys, key_entries, short_prefix_top)
+
+    def suggest(self, prefix, limit=8):
+        """
+        Return up to `limit` suggestion payloads whose words start with prefix.
+
+        Args:
+            prefix (str): Raw user input
+            limit (int): Max suggestions (capped at MAX_SUGGESTIONS)
+
+        Returns:
+            list of dicts, most popular first
+        """
+        normalized = normalize_for_index(prefix)
+        limit = max(0, min(limit, MAX_SUGGESTIONS))
+        if not normalized or limit == 0:
+            return []
+
+        if len(normalized) <= SHORT_PREFIX_LENGTH:
+            indices = self.short_prefix_top.get(normalized, ())[:limit]
+        else:
+            lo = bisect_left(self.keys, normalized)
+            hi = bisect_left(self.keys, normalized + '\uffff', lo)
+            indices = heapq.nsmallest(limit, set(self.key_entries[lo:hi]))
+
+        return [self.entries[i] for i in indices]
+
+    def __len__(self):
+        return len(self.entries)
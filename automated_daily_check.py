@@ -25,12 +25,13 @@ from database import (
     get_connection,
     create_database,
     insert_review,
-    check_duplicate_review,
+    load_review_urls,
     log_scraper_run,
     insert_daily_summary,
     normalize_url,
     detect_missed_days
 )
+from db_connections import checkpoint
 from scrapers.breaking_bourbon import BreakingBourbonScraper
 
 
@@ -332,13 +333,15 @@ def check_reviews_for_date_internal(scraper, days_back: int, logger) -> Dict:
     reviews_added = 0
     duplicates = 0
     errors = []
+    # One query for the run; each URL is then a set lookup before fetching
+    known_urls = load_review_urls(conn, source_site)
     
     for i, url in enumerate(review_urls, 1):
         logger.info(f"Processing [{i}/{len(review_urls)}]: {url}")
         
         # Check if already in database
         normalized_url = normalize_url(url)
-        if check_duplicate_review(conn, source_site, normalized_url):
+        if normalized_url in known_urls:
             logger.info(f"  Duplicate - already in database")
             duplicates += 1
             continue
@@ -353,8 +356,9 @@ def check_reviews_for_date_internal(scraper, days_back: int, logger) -> Dict:
                 errors.append(f"{url}: {error_msg}")
                 continue
             
-            # Insert into database
+            # Insert into database (the insert itself also rejects duplicates)
             review_id = insert_review(conn, review_data)
+            known_urls.add(normalized_url)
             
             if review_id:
                 reviews_added += 1
@@ -414,6 +418,8 @@ def check_reviews_for_date_internal(scraper, days_back: int, logger) -> Dict:
     logger.info(f"  Errors: {len(errors)}")
     logger.info(f"  Execution time: {execution_time:.2f}s")
     
+    # Fold the run's writes back into the database file so the WAL stays small
+    checkpoint(conn)
     conn.close()
     
     return {
@@ -500,13 +506,15 @@ def check_reviews_for_specific_date(scraper, target_date: datetime, logger, is_b
     reviews_added = 0
     duplicates = 0
     errors = []
+    # One query for the run; each URL is then a set lookup before fetching
+    known_urls = load_review_urls(conn, source_site)
     
     for i, url in enumerate(review_urls, 1):
         logger.info(f"Processing [{i}/{len(review_urls)}]: {url}")
         
         # Check if already in database
         normalized_url = normalize_url(url)
-        if check_duplicate_review(conn, source_site, normalized_url):
+        if normalized_url in known_urls:
             logger.info(f"  Duplicate - already in database")
             duplicates += 1
             continue
@@ -521,8 +529,9 @@ def check_reviews_for_specific_date(scraper, target_date: datetime, logger, is_b
                 errors.append(f"{url}: {error_msg}")
                 continue
             
-            # Insert into database
+            # Insert into database (the insert itself also rejects duplicates)
             review_id = insert_review(conn, review_data)
+            known_urls.add(normalized_url)
             
             if review_id:
                 reviews_added += 1
@@ -583,6 +592,8 @@ def check_reviews_for_specific_date(scraper, target_date: datetime, logger, is_b
     logger.info(f"  Errors: {len(errors)}")
     logger.info(f"  Execution time: {execution_time:.2f}s")
     
+    # Fold the run's writes back into the database file so the WAL stays small
+    checkpoint(conn)
     conn.close()
     
     return {
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Before/after numbers for moving review text to review_bodies.
+
+Builds a synthetic catalog with the text still inline on reviews, then
+copies it and applies migrations/010_split_review_bodies.py - once storing
+plain text, once zlib-compressed - and VACUUMs each copy. Reports the file
+size, the pages reviews occupies (dbstat) and query times for:
+
+  - source URLs: the quiz endpoint's reviews lookup for 25 whiskeys
+  - reviews scan: a full scan of reviews (COUNT(DISTINCT source_url))
+  - aggregation: review_descriptors JOIN reviews, as rebuild_production.py
+  - text scan: every review's tasting notes through review_texts (the
+    cold path, which now pays for the join and decompression)
+
+Each query runs on a fresh read-only connection, so SQLite's page cache
+starts empty (the OS cache is warm); the best of --repeat runs is kept.
+
+Usage:
+    python3 benchmarks/bench_review_bodies.py [--scale 10] [--repeat 5] [--output report.json]
+"""
+
+import argparse
+import json
+import random
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from synthetic_catalog import ROOT, build_catalog
+
+import review_bodies
+from db_connections import connect_readonly, connect_writer
+from online_migrations import ensure_migrations_table, run_python_migration
+
+MIGRATION = ROOT / "migrations" / "010_split_review_bodies.py"
+
+QUERIES = {
+    "source URLs": """
+        SELECT DISTINCT whiskey_id, source_site, source_url FROM reviews
+        WHERE whiskey_id IN ({ids}) AND source_url IS NOT NULL
+        ORDER BY whiskey_id, source_site, source_url
+    """,
+    "reviews scan": "SELECT COUNT(*), COUNT(DISTINCT source_url) FROM reviews",
+    "aggregation": """
+        SELECT r.whiskey_id, rd.descriptor_id, rd.tasting_section, COUNT(*)
+        FROM review_descriptors rd JOIN reviews r ON rd.review_id = r.review_id
+        GROUP BY r.whiskey_id, rd.descriptor_id, rd.tasting_section
+    """,
+    "text scan": """
+        SELECT SUM(LENGTH(nose_text) + LENGTH(palate_text) + LENGTH(finish_text)
+                   + LENGTH(overall_notes))
+        FROM review_texts
+    """,
+}
+
+
+def split_copy(source, target, compression):
+    """Copy the inline catalog and apply migration 010 to the copy."""
+    shutil.copyfile(source, target)
+    review_bodies.COMPRESSION = compression
+    conn = connect_writer(target, wal=False)
+    ensure_migrations_table(conn)
+    run_python_migration(conn, MIGRATION, log=lambda message: None)
+    conn.execute("VACUUM")
+    conn.close()
+
+
+def measure(db_path, repeat):
+    conn = connect_readonly(db_path, row_factory=None)
+    whiskey_ids = [row[0] for row in conn.execute("SELECT whiskey_id FROM whiskeys")]
+    sample = random.Random(0).sample(whiskey_ids, 25)
+    pages = conn.execute("SELECT COUNT(*) FROM dbstat WHERE name = 'reviews'").fetchone()[0]
+    conn.close()
+
+    timings = {}
+    for label, sql in QUERIES.items():
+        sql = sql.format(ids=", ".join(map(str, sample)))
+        best = float("inf")
+        for _ in range(repeat):
+            conn = connect_readonly(db_path, row_factory=None)
+            review_bodies.attach_review_texts(conn)
+            started = time.perf_counter()
+            conn.execute(sql).fetchall()
+            best = min(best, time.perf_counter() - started)
+            conn.close()
+        timings[label] = round(best * 1000, 2)
+    return {"file_mib": round(db_path.stat().st_size / 2**20, 1), "reviews_pages": pages,
+            "ms": timings}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--scale", type=float, default=10.0, help="catalog size as a multiple of ~600 whiskeys")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", type=Path, help="also write the raw numbers as JSON")
+    args = parser.parse_args()
+
+    workdir = tempfile.TemporaryDirectory()
+    inline = Path(workdir.name) / "inline.db"
+    print(f"Building synthetic catalog (scale {args.scale:g}) with inline review text...")
+    build_catalog(inline, args.scale, python_migrations=False)
+
+    variants = {"inline": inline}
+    for compression in ("none", "zlib"):
+        variants[f"split ({compression})"] = Path(workdir.name) / f"split_{compression}.db"
+        split_copy(inline, variants[f"split ({compression})"], compression)
+
+    report = {"scale": args.scale}
+    print(f"\n  {'layout':<14}{'file MiB':>10}{'reviews pages':>15}" +
+          "".join(f"{label + ' ms':>18}" for label in QUERIES))
+    for name, path in variants.items():
+        report[name] = result = measure(path, args.repeat)
+        print(f"  {name:<14}{result['file_mib']:>10}{result['reviews_pages']:>15}" +
+              "".join(f"{result['ms'][label]:>18}" for label in QUERIES))
+
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"\n✓ Raw numbers written to {args.output}")
+    workdir.cleanup()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Microbenchmarks for JSON serialization and response building.
+
+Times each API endpoint through the Flask test client with every available
+serializer (see serialization.py), plus the row -> dict step on its own.
+Needs databases/whiskey_production.db.
+
+Usage:
+    python3 benchmarks/bench_serialization.py [--repeat 2000]
+"""
+
+import argparse
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import serialization
+from app import DB_PATH, app, quiz_corpus
+
+ENDPOINTS = [
+    ("search", lambda ids: "/api/whiskeys/search?q=bourbon&limit=50"),
+    ("autocomplete", lambda ids: "/api/whiskeys/autocomplete?prefix=bu"),
+    ("distilleries", lambda ids: "/api/distilleries"),
+    ("quiz", lambda ids: f"/api/quiz/{ids['whiskey_id']}"),
+    ("whiskey detail", lambda ids: f"/api/whiskeys/{ids['slug']}"),
+]
+
+
+def per_call_us(func, repeat):
+    """Best-of-3 mean time per call in microseconds."""
+    best = float('inf')
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            func()
+        best = min(best, time.perf_counter() - start)
+    return best / repeat * 1e6
+
+
+def sample_ids():
+    """A quiz-ready whiskey id and a slug to request."""
+    with app.test_client() as client:
+        result = client.get("/api/whiskeys/search?q=bourbon").get_json()["results"][0]
+    whiskey_id = next(iter(quiz_corpus.get().sections["nose"].correct))
+    return {"whiskey_id": whiskey_id, "slug": result["slug"]}
+
+
+def bench_endpoints(repeat):
+    ids = sample_ids()
+    print(f"\nEndpoints ({repeat} requests each, µs/request)")
+    print(f"  {'endpoint':<16}" + "".join(f"{name:>10}" for name in serialization.SERIALIZERS))
+
+    with app.test_client() as client:
+        for label, path_for in ENDPOINTS:
+            path = path_for(ids)
+            timings = []
+            for name in serialization.SERIALIZERS:
+                serialization.use(name)
+                client.get(path)  # warm caches
+                timings.append(per_call_us(lambda: client.get(path), repeat))
+            print(f"  {label:<16}" + "".join(f"{t:>10.1f}" for t in timings))
+
+
+def bench_payloads(repeat):
+    """Serializer cost alone, on real response bodies."""
+    with app.test_client() as client:
+        bodies = {
+            "search": client.get("/api/whiskeys/search?q=bourbon&limit=50").get_json(),
+            "distilleries": client.get("/api/distilleries").get_json(),
+        }
+
+    print(f"\nSerialize only ({repeat} calls each, µs/call)")
+    for label, body in bodies.items():
+        timings = {
+            name: per_call_us(lambda: dumps(body), repeat)
+            for name, dumps in serialization.SERIALIZERS.items()
+        }
+        line = ", ".join(f"{name} {t:.1f}" for name, t in timings.items())
+        if "orjson" in timings:
+            line += f" ({timings['stdlib'] / timings['orjson']:.1f}x)"
+        print(f"  {label:<16}{line}")
+
+
+def bench_row_building(repeat):
+    """dict(zip(row.keys(), row)) on sqlite3.Row vs building from tuples."""
+    conn = sqlite3.connect(f"file:{DB_PATH}?mode=ro", uri=True)
+    sql = "SELECT whiskey_id, name, distillery FROM whiskeys LIMIT 50"
+
+    conn.row_factory = sqlite3.Row
+    rows = conn.execute(sql).fetchall()
+    from_rows = per_call_us(lambda: [dict(zip(row.keys(), row)) for row in rows], repeat)
+
+    conn.row_factory = None
+    tuples = conn.execute(sql).fetchall()
+    from_tuples = per_call_us(lambda: [
+        {"whiskey_id": whiskey_id, "name": name, "distillery": distillery}
+        for whiskey_id, name, distillery in tuples
+    ], repeat)
+    conn.close()
+
+    print(f"\nRow building (50 rows, µs/call)")
+    print(f"  dict_from_row {from_rows:.1f}, tuple unpack {from_tuples:.1f} "
+          f"({from_rows / from_tuples:.1f}x)")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    if not DB_PATH.exists():
+        print(f"✗ Database not found at {DB_PATH}")
+        sys.exit(1)
+
+    print(f"Serializers available: {', '.join(serialization.SERIALIZERS)}")
+    bench_payloads(args.repeat)
+    bench_row_building(args.repeat)
+    bench_endpoints(max(args.repeat // 10, 50))
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Load test the API against a synthetic catalog.
+
+Builds (or reuses) a synthetic production-schema database with
+synthetic_catalog.py, points the app at it with DB_PATH, and drives the
+search, distilleries and quiz endpoints:
+
+  - in process through the Flask test client (app cost without HTTP), and
+  - over HTTP against a local gunicorn (needs gunicorn installed).
+
+Reports throughput and p50/p95/p99 latency per endpoint and writes them as
+JSON, optionally compared against an earlier run.
+
+Usage:
+    python3 benchmarks/load_test.py --scale 10
+    python3 benchmarks/load_test.py --scale 10 --target gunicorn --workers 4 --concurrency 16
+    python3 benchmarks/load_test.py --db /tmp/catalog.db --compare benchmarks/results/old.json
+"""
+
+import argparse
+import http.client
+import json
+import math
+import os
+import platform
+import random
+import shutil
+import socket
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+
+from synthetic_catalog import ROOT, STYLES, build_catalog
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+ENDPOINTS = ("search", "distilleries", "quiz")
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(math.ceil(pct / 100 * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+def summarize(target, endpoint, latencies, errors, seconds):
+    """Throughput and latency percentiles (milliseconds) for one run."""
+    latencies = sorted(latencies)
+    count = len(latencies)
+    return {
+        "target": target,
+        "endpoint": endpoint,
+        "requests": count,
+        "errors": errors,
+        "seconds": round(seconds, 3),
+        "rps": round(count / seconds, 1) if seconds else None,
+        "mean_ms": round(sum(latencies) / count * 1000, 3) if count else None,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3) if count else None,
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3) if count else None,
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3) if count else None,
+    }
+
+
+def request_paths(db_path, endpoint, count, seed=0):
+    """A reproducible list of request paths for one endpoint."""
+    rng = random.Random(seed)
+    if endpoint == "distilleries":
+        return ["/api/distilleries"] * count
+
+    conn = sqlite3.connect(db_path)
+    try:
+        if endpoint == "search":
+            names = [row[0] for row in conn.execute("SELECT canonical_name FROM distillery_mappings")]
+            names += [row[0] for row in conn.execute("SELECT DISTINCT distillery FROM whiskeys LIMIT 200")]
+            terms = [name.split()[0].lower()[:rng.randint(3, 6)] for name in names] + list(STYLES)
+            return [f"/api/whiskeys/search?q={rng.choice(terms).replace(' ', '+')}" for _ in range(count)]
+
+        whiskey_ids = [row[0] for row in conn.execute(
+            "SELECT DISTINCT whiskey_id FROM aggregated_whiskey_descriptors"
+        )]
+    finally:
+        conn.close()
+    return [f"/api/quiz/{rng.choice(whiskey_ids)}" for _ in range(count)]
+
+
+def run_test_client(db_path, requests_per_endpoint, warmup):
+    """Sequential requests through the Flask test client."""
+    os.environ["DB_PATH"] = str(db_path)
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    sys.path.insert(0, str(ROOT))
+    from app import app
+
+    results = []
+    with app.test_client() as client:
+        for endpoint in ENDPOINTS:
+            paths = request_paths(db_path, endpoint, requests_per_endpoint + warmup)
+            for path in paths[:warmup]:
+                client.get(path)
+
+            latencies = []
+            errors = 0
+            started = time.perf_counter()
+            for path in paths[warmup:]:
+                before = time.perf_counter()
+                status = client.get(path).status_code
+                latencies.append(time.perf_counter() - before)
+                errors += status >= 400
+            results.append(summarize("test_client", endpoint, latencies, errors,
+                                     time.perf_counter() - started))
+    return results
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_until_live(port, timeout=30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            conn.request("GET", "/api/health/live")
+            if conn.getresponse().status == 200:
+                return True
+        except OSError:
+            time.sleep(0.2)
+    return False
+
+
+def _http_get(port, path):
+    """One request on a fresh connection (sync workers close after each response)."""
+    before = time.perf_counter()
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    try:
+        conn.request("GET", path)
+        response = conn.getresponse()
+        response.read()
+        status = response.status
+    except OSError:
+        status = 599
+    finally:
+        conn.close()
+    return time.perf_counter() - before, status
+
+
+def run_gunicorn(db_path, requests_per_endpoint, warmup, workers, concurrency):
+    """Concurrent HTTP requests against a local gunicorn serving app:app."""
+    gunicorn = shutil.which("gunicorn")
+    if gunicorn is None:
+        print("⚠ gunicorn not installed - skipping the HTTP target")
+        return []
+
+    port = _free_port()
+    env = dict(os.environ, DB_PATH=str(db_path), LOG_LEVEL="WARNING")
+    server = subprocess.Popen(
+        [gunicorn, "app:app", "--bind", f"127.0.0.1:{port}", "--workers", str(workers)],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    results = []
+    try:
+        if not _wait_until_live(port):
+            print("✗ gunicorn did not become live")
+            return []
+
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            for endpoint in ENDPOINTS:
+                paths = request_paths(db_path, endpoint, requests_per_endpoint + warmup)
+                # Warm every worker's snapshots before timing
+                list(pool.map(lambda path: _http_get(port, path), paths[:warmup]))
+
+                started = time.perf_counter()
+                outcomes = list(pool.map(lambda path: _http_get(port, path), paths[warmup:]))
+                seconds = time.perf_counter() - started
+                results.append(summarize(
+                    f"gunicorn[{workers}w,{concurrency}c]", endpoint,
+                    [latency for latency, _ in outcomes],
+                    sum(status >= 400 for _, status in outcomes), seconds,
+                ))
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+    return results
+
+
+def compare(results, baseline_path):
+    """Print p50/p99/rps deltas against a previous results file."""
+    baseline = json.loads(Path(baseline_path).read_text())
+    previous = {(row["target"], row["endpoint"]): row for row in baseline["results"]}
+
+    print(f"\nCompared with {baseline_path}")
+    for row in results:
+        old = previous.get((row["target"], row["endpoint"]))
+        if old is None:
+            continue
+        deltas = []
+        for key in ("rps", "p50_ms", "p99_ms"):
+            if old[key] and row[key] is not None:
+                deltas.append(f"{key} {(row[key] - old[key]) / old[key] * 100:+.1f}%")
+        print(f"  {row['target']:<22}{row['endpoint']:<14}" + ", ".join(deltas))
+
+
+def print_table(results):
+    print(f"\n  {'target':<22}{'endpoint':<14}{'rps':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'errors':>8}")
+    for row in results:
+        print(f"  {row['target']:<22}{row['endpoint']:<14}{row['rps']:>9}"
+              f"{row['p50_ms']:>9}{row['p95_ms']:>9}{row['p99_ms']:>9}{row['errors']:>8}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--scale", type=float, default=1.0, help="catalog size as a multiple of ~600 whiskeys")
+    parser.add_argument("--db", type=Path, help="reuse (or build once at) this catalog path")
+    parser.add_argument("--target", choices=("test_client", "gunicorn", "both"), default="both")
+    parser.add_argument("--requests", type=int, default=1000, help="timed requests per endpoint")
+    parser.add_argument("--warmup", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--output", type=Path, help="results file (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--compare", type=Path, help="earlier results file to diff against")
+    args = parser.parse_args()
+
+    workdir = None
+    db_path = args.db
+    if db_path is None:
+        workdir = tempfile.TemporaryDirectory()
+        db_path = Path(workdir.name) / f"catalog_x{args.scale:g}.db"
+    if not db_path.exists():
+        print(f"Building synthetic catalog (scale {args.scale:g}) at {db_path}...")
+        counts = build_catalog(db_path, args.scale)
+    else:
+        conn = sqlite3.connect(db_path)
+        counts = {table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                  for table in ('whiskeys', 'reviews', 'aggregated_whiskey_descriptors')}
+        conn.close()
+    print("  " + ", ".join(f"{key}={value}" for key, value in counts.items()))
+
+    results = []
+    if args.target in ("test_client", "both"):
+        results += run_test_client(db_path, args.requests, args.warmup)
+    if args.target in ("gunicorn", "both"):
+        results += run_gunicorn(db_path, args.requests, args.warmup, args.workers, args.concurrency)
+    print_table(results)
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "scale": args.scale,
+            "catalog": counts,
+            "requests_per_endpoint": args.requests,
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+        },
+        "results": results,
+    }
+    output = args.output or RESULTS_DIR / f"load_{datetime.now():%Y%m%d_%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2) + "\n")
+    print(f"\n✓ Results written to {output}")
+
+    if args.compare:
+        compare(results, args.compare)
+    if workdir is not None:
+        workdir.cleanup()
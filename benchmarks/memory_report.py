@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Per-worker memory of gunicorn with and without preload.
+
+Starts gunicorn (gunicorn.conf.py) against a synthetic catalog twice -
+PRELOAD_APP=1 and PRELOAD_APP=0 - sends some traffic so every worker has
+touched its snapshots, and reads each worker's /proc/<pid>/smaps_rollup.
+PSS (proportional set size) splits shared pages between the processes
+sharing them, so the PSS total is what the workers really cost; RSS counts
+shared pages once per worker. Linux only; needs gunicorn installed.
+
+Usage:
+    python3 benchmarks/memory_report.py --scale 10 --workers 4 [--output report.json]
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from load_test import _free_port, _http_get, _wait_until_live, request_paths
+from synthetic_catalog import ROOT, build_catalog
+
+SMAPS_FIELDS = ("Rss", "Pss", "Shared_Clean", "Shared_Dirty", "Private_Clean", "Private_Dirty")
+
+
+def read_smaps_rollup(pid):
+    """Memory totals for a process in KiB, from /proc/<pid>/smaps_rollup."""
+    values = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            key, _, rest = line.partition(":")
+            if key in SMAPS_FIELDS:
+                values[key] = int(rest.split()[0])
+    return values
+
+
+def worker_pids(master_pid):
+    """Direct children of the gunicorn master."""
+    with open(f"/proc/{master_pid}/task/{master_pid}/children") as f:
+        return sorted(int(pid) for pid in f.read().split())
+
+
+def measure(db_path, preload, workers, requests):
+    """Start gunicorn, warm every worker, and return per-process memory."""
+    port = _free_port()
+    env = dict(os.environ, DB_PATH=str(db_path), PRELOAD_APP="1" if preload else "0",
+               LOG_LEVEL="WARNING")
+    server = subprocess.Popen(
+        [shutil.which("gunicorn"), "app:app", "-c", "gunicorn.conf.py",
+         "--bind", f"127.0.0.1:{port}", "--workers", str(workers)],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        if not _wait_until_live(port):
+            raise RuntimeError("gunicorn did not become live")
+        while len(worker_pids(server.pid)) < workers:
+            time.sleep(0.1)
+
+        paths = []
+        for endpoint in ("search", "distilleries", "quiz"):
+            paths += request_paths(db_path, endpoint, requests)
+        paths.append("/api/whiskeys/autocomplete?prefix=ba")
+        with ThreadPoolExecutor(max_workers=workers * 2) as pool:
+            list(pool.map(lambda path: _http_get(port, path), paths))
+
+        pids = worker_pids(server.pid)
+        return {
+            "master": read_smaps_rollup(server.pid),
+            "workers": [read_smaps_rollup(pid) for pid in pids],
+        }
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+
+def print_report(label, sample):
+    workers = sample["workers"]
+    mib = lambda kib: f"{kib / 1024:.1f}"
+    print(f"\n{label}")
+    print(f"  {'process':<10}{'RSS MiB':>10}{'PSS MiB':>10}{'shared MiB':>12}{'private MiB':>13}")
+    for name, values in [("master", sample["master"])] + [(f"worker {i}", w) for i, w in enumerate(workers, 1)]:
+        shared = values["Shared_Clean"] + values["Shared_Dirty"]
+        private = values["Private_Clean"] + values["Private_Dirty"]
+        print(f"  {name:<10}{mib(values['Rss']):>10}{mib(values['Pss']):>10}{mib(shared):>12}{mib(private):>13}")
+    total_pss = sum(w["Pss"] for w in workers) + sample["master"]["Pss"]
+    print(f"  total PSS (master + workers): {mib(total_pss)} MiB")
+    return total_pss
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--scale", type=float, default=1.0, help="catalog size as a multiple of ~600 whiskeys")
+    parser.add_argument("--db", type=Path, help="reuse (or build once at) this catalog path")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--requests", type=int, default=200, help="warm-up requests per endpoint")
+    parser.add_argument("--output", type=Path, help="also write the raw numbers as JSON")
+    args = parser.parse_args()
+
+    if shutil.which("gunicorn") is None or not Path("/proc/self/smaps_rollup").exists():
+        print("✗ Needs gunicorn and Linux /proc/<pid>/smaps_rollup")
+        sys.exit(1)
+
+    workdir = None
+    db_path = args.db
+    if db_path is None:
+        workdir = tempfile.TemporaryDirectory()
+        db_path = Path(workdir.name) / f"catalog_x{args.scale:g}.db"
+    if not db_path.exists():
+        print(f"Building synthetic catalog (scale {args.scale:g}) at {db_path}...")
+        build_catalog(db_path, args.scale)
+
+    report = {"scale": args.scale, "workers": args.workers}
+    totals = {}
+    for preload in (False, True):
+        label = "preload" if preload else "no_preload"
+        report[label] = measure(db_path, preload, args.workers, args.requests)
+        totals[label] = print_report(f"{label} ({args.workers} workers)", report[label])
+
+    saved = totals["no_preload"] - totals["preload"]
+    print(f"\nPreload saves {saved / 1024:.1f} MiB PSS "
+          f"({saved / totals['no_preload'] * 100:.0f}% of the no-preload total)")
+
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"✓ Raw numbers written to {args.output}")
+    if workdir is not None:
+        workdir.cleanup()
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Synthetic production-schema databases for load testing.
+
+Builds schema_mvp_v2.sql plus every migration in migrations/, then fills
+whiskeys, distillery_mappings, reviews, review_descriptors and
+aggregated_whiskey_descriptors with deterministic fake data at a
+configurable scale (scale 1 = the ~600 whiskeys in production). Slugs,
+typed age/proof/price columns, descriptor neighbor lists and the data
+version are filled the same way the real pipeline does, and the Python
+data migrations (e.g. moving review text to review_bodies) run once the
+rows exist, as they would on production.
+
+Usage:
+    python3 benchmarks/synthetic_catalog.py out.db [--scale 10] [--seed 0]
+"""
+
+import argparse
+import json
+import random
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from data_version import bump_data_version
+from database import backfill_numeric_attributes
+from descriptor_similarity import rebuild_descriptor_neighbors
+from online_migrations import ensure_migrations_table, run_python_migration
+from slugs import backfill_slugs
+
+SCHEMA_PATH = ROOT / "schema_mvp_v2.sql"
+MIGRATIONS_DIR = ROOT / "migrations"
+
+# Scale 1 roughly matches the production catalog
+BASE_WHISKEYS = 600
+REVIEWS_PER_WHISKEY = 3
+DESCRIPTORS = 150
+WHISKEYS_PER_DISTILLERY = 8
+
+SECTIONS = ('nose', 'palate', 'finish')
+CATEGORIES = ('fruity', 'spicy', 'woody', 'floral', 'grain', 'sweet', 'bitter',
+              'savory', 'smoky', 'mouthfeel', 'nutty')
+SITES = ('Breaking Bourbon', 'Whiskey Consensus', 'Bourbon Culture', 'The Whiskey Jug')
+STYLES = ('bourbon', 'rye', 'single barrel bourbon', 'small batch bourbon',
+          'bottled in bond', 'cask strength rye', 'wheated bourbon', 'single malt')
+
+# Syllables for distillery and descriptor names
+_ONSETS = ('b', 'br', 'c', 'ch', 'd', 'f', 'g', 'h', 'k', 'l', 'm', 'n', 'p',
+           'r', 's', 'st', 't', 'v', 'w')
+_NUCLEI = ('a', 'e', 'i', 'o', 'u', 'ea', 'oo', 'ai')
+_CODAS = ('', 'n', 'r', 'ck', 'll', 'ton', 'ford', 'ley', 'wood', 'field')
+
+# Review prose mixes these with descriptor names, so it compresses roughly
+# like real review text rather than like a repeated sentence
+_PROSE_WORDS = ('the', 'a', 'and', 'with', 'of', 'on', 'into', 'some', 'more', 'than',
+                'nose', 'palate', 'finish', 'sip', 'pour', 'glass', 'bottle', 'barrel',
+                'proof', 'year', 'char', 'heat', 'water', 'long', 'short', 'bright',
+                'deep', 'soft', 'bold', 'light', 'rich', 'dry', 'hint', 'notes', 'layer',
+                'opens', 'fades', 'lingers', 'builds', 'really', 'quite', 'though')
+
+
+def _word(rng, syllables):
+    return "".join(
+        rng.choice(_ONSETS) + rng.choice(_NUCLEI) + rng.choice(_CODAS)
+        for _ in range(syllables)
+    )
+
+
+def _unique_words(rng, count, syllables):
+    words = []
+    seen = set()
+    while len(words) < count:
+        word = _word(rng, syllables)
+        if word not in seen:
+            seen.add(word)
+            words.append(word)
+    return words
+
+
+def create_schema(conn):
+    """Base schema plus all migrations, in filename order."""
+    conn.executescript(SCHEMA_PATH.read_text())
+    for migration in sorted(MIGRATIONS_DIR.glob("[0-9][0-9][0-9]_*.sql")):
+        if migration.name.startswith("001_"):
+            continue  # quiz tables are already part of schema_mvp_v2.sql
+        conn.executescript(migration.read_text())
+
+
+def apply_python_migrations(conn):
+    """Data migrations (NNN_*.py), in filename order."""
+    ensure_migrations_table(conn)
+    for migration in sorted(MIGRATIONS_DIR.glob("[0-9][0-9][0-9]_*.py")):
+        run_python_migration(conn, migration, log=lambda message: None)
+
+
+def build_catalog(db_path, scale=1.0, seed=0, reviews_per_whiskey=REVIEWS_PER_WHISKEY,
+                  descriptors=DESCRIPTORS, python_migrations=True):
+    """
+    Create a synthetic catalog at db_path (replacing any existing file).
+
+    python_migrations=False leaves the catalog as it is before the Python
+    migrations (review text inline on reviews), for before/after benchmarks.
+
+    Returns:
+        dict: Row counts per table plus build time in seconds
+    """
+    started = time.perf_counter()
+    rng = random.Random(seed)
+    db_path = Path(db_path)
+    if db_path.exists():
+        db_path.unlink()
+
+    whiskey_count = max(int(BASE_WHISKEYS * scale), 1)
+    distillery_count = max(whiskey_count // WHISKEYS_PER_DISTILLERY, 1)
+
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode = OFF")
+    conn.execute("PRAGMA synchronous = OFF")
+    create_schema(conn)
+    cursor = conn.cursor()
+
+    # Descriptors, each usable in every section
+    descriptor_names = _unique_words(rng, descriptors, 2)
+    cursor.executemany("""
+        INSERT INTO descriptor_vocabulary (descriptor_name, category, applicable_sections)
+        VALUES (?, ?, ?)
+    """, [(name, rng.choice(CATEGORIES), json.dumps(list(SECTIONS))) for name in descriptor_names])
+    descriptor_ids = [row[0] for row in cursor.execute("SELECT descriptor_id FROM descriptor_vocabulary")]
+
+    # Distilleries; every fourth one is also stored under a variant name
+    distilleries = [f"{name.title()} Distillery" for name in _unique_words(rng, distillery_count, 2)]
+    variants = {name: name.lower() + " co." for name in distilleries[::4]}
+    cursor.executemany("""
+        INSERT INTO distillery_mappings (variant_name, canonical_name, notes)
+        VALUES (?, ?, 'synthetic')
+    """, [(variant, canonical) for canonical, variant in variants.items()])
+
+    # Whiskeys (distillery popularity is skewed, like the real catalog)
+    weights = [1.0 / (rank + 1) for rank in range(distillery_count)]
+    whiskey_rows = []
+    for index in range(whiskey_count):
+        distillery = rng.choices(distilleries, weights)[0]
+        stored_as = variants.get(distillery) if rng.random() < 0.5 else None
+        age = rng.choice((None, 4, 6, 8, 10, 12, 15, 18))
+        name = f"{distillery.lower()} {rng.choice(STYLES)}" + (f" {age} year" if age else "")
+        name += f" batch {index}"
+        whiskey_rows.append((
+            name, stored_as or distillery, f"{rng.randint(80, 140)} proof",
+            f"{age} Years" if age else None, f"${rng.randint(25, 250)}"
+        ))
+    cursor.executemany("""
+        INSERT INTO whiskeys (name, distillery, proof, age, price)
+        VALUES (?, ?, ?, ?, ?)
+    """, whiskey_rows)
+    whiskey_ids = [row[0] for row in cursor.execute("SELECT whiskey_id FROM whiskeys")]
+
+    # Reviews with pipe-delimited tasting notes, and their descriptor tags.
+    # Each whiskey leans on a small "profile" so co-occurrence is realistic.
+    review_rows = []
+    tags = []
+    prose_words = _PROSE_WORDS + tuple(descriptor_names)
+    review_id = 0
+    for whiskey_id in whiskey_ids:
+        profile = rng.sample(descriptor_ids, min(30, len(descriptor_ids)))
+        for review_number in range(reviews_per_whiskey):
+            review_id += 1
+            site = SITES[review_number % len(SITES)]
+            url = f"https://example.com/{site.lower().replace(' ', '-')}/review/{whiskey_id}-{review_number}"
+            notes = {}
+            for section in SECTIONS:
+                picked = rng.sample(profile, rng.randint(4, 8))
+                notes[section] = " | ".join(descriptor_names[d - 1] for d in picked)
+                tags.extend((review_id, descriptor_id, section) for descriptor_id in picked)
+            review_rows.append((
+                review_id, whiskey_id, site, url, url,
+                notes['nose'], notes['palate'], notes['finish'],
+                notes['nose'], notes['palate'], notes['finish'],
+                " ".join(rng.choice(prose_words) for _ in range(rng.randint(80, 600))) + ".",
+            ))
+    cursor.executemany("""
+        INSERT INTO reviews (review_id, whiskey_id, source_site, source_url, normalized_url,
+                             nose, palate, finish, nose_text, palate_text, finish_text,
+                             overall_notes)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, review_rows)
+    cursor.executemany("""
+        INSERT INTO review_descriptors (review_id, descriptor_id, tasting_section)
+        VALUES (?, ?, ?)
+    """, tags)
+
+    # Same aggregation as rebuild_production.py step 4
+    cursor.execute("""
+        INSERT INTO aggregated_whiskey_descriptors
+        (whiskey_id, descriptor_id, tasting_section, source_review_ids, review_count)
+        SELECT r.whiskey_id, rd.descriptor_id, rd.tasting_section,
+               json_group_array(rd.review_id), COUNT(*)
+        FROM review_descriptors rd
+        JOIN reviews r ON rd.review_id = r.review_id
+        GROUP BY r.whiskey_id, rd.descriptor_id, rd.tasting_section
+    """)
+    conn.commit()
+
+    backfill_slugs(conn)
+    backfill_numeric_attributes(conn)
+    if python_migrations:
+        apply_python_migrations(conn)
+    rebuild_descriptor_neighbors(conn)
+    bump_data_version(conn)
+
+    counts = {
+        table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        for table in ('whiskeys', 'distillery_mappings', 'reviews', 'descriptor_vocabulary',
+                      'review_descriptors', 'aggregated_whiskey_descriptors')
+    }
+    conn.execute("ANALYZE")
+    conn.execute("VACUUM")
+    conn.close()
+
+    counts['build_seconds'] = round(time.perf_counter() - started, 2)
+    return counts
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("db_path", type=Path)
+    parser.add_argument("--scale", type=float, default=1.0, help="multiple of ~600 whiskeys")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--reviews-per-whiskey", type=int, default=REVIEWS_PER_WHISKEY)
+    parser.add_argument("--skip-python-migrations", action="store_true",
+                        help="keep review text inline on reviews")
+    args = parser.parse_args()
+
+    counts = build_catalog(args.db_path, args.scale, args.seed, args.reviews_per_whiskey,
+                           python_migrations=not args.skip_python_migrations)
+    print(f"✓ Built {args.db_path}")
+    for table, count in counts.items():
+        print(f"  {table}: {count}")
@@ -4,11 +4,11 @@ Build MVP Database v2 - Auto-extracted from pipe-delimited reviews
 Replaces the manual tagging approach
 """
 
-import sqlite3
 from pathlib import Path
 import json
 from descriptor_vocabulary import DESCRIPTORS
 from match_descriptors_v2 import match_descriptors_in_text
+from db_connections import connect_readonly, connect_writer
 
 SOURCE_DB = Path("databases/whiskey_reviews.db")
 TARGET_DB = Path("archive/databases/whiskey_mvp_v2.db")
@@ -18,7 +18,7 @@ def create_mvp_database():
     if TARGET_DB.exists():
         TARGET_DB.unlink()
 
-    conn = sqlite3.connect(TARGET_DB)
+    conn = connect_writer(TARGET_DB)
     cursor = conn.cursor()
 
     # Read and execute the schema
@@ -33,7 +33,7 @@ def create_mvp_database():
 def populate_descriptor_vocabulary():
     """Populate descriptor_vocabulary table"""
     # First, get the full descriptor data from old database
-    old_conn = sqlite3.connect('archive/task5_manual_approach_abandoned_20260124/whiskey_mvp.db')
+    old_conn = connect_readonly('archive/task5_manual_approach_abandoned_20260124/whiskey_mvp.db', row_factory=None)
     old_cursor = old_conn.cursor()
 
     old_cursor.execute("""
@@ -45,7 +45,7 @@ def populate_descriptor_vocabulary():
     old_conn.close()
 
     # Insert into new database
-    conn = sqlite3.connect(TARGET_DB)
+    conn = connect_writer(TARGET_DB)
     cursor = conn.cursor()
 
     for desc_id, name, category, sections in descriptors:
@@ -67,7 +67,7 @@ def select_mvp_whiskeys():
     - Popular/well-known whiskeys
     - Variety of types
     """
-    conn = sqlite3.connect(SOURCE_DB)
+    conn = connect_readonly(SOURCE_DB, row_factory=None)
     cursor = conn.cursor()
 
     # Get whiskeys with 2 pipe-delimited reviews
@@ -96,8 +96,8 @@ def select_mvp_whiskeys():
 
 def copy_whiskey_and_reviews(whiskey_ids):
     """Copy selected whiskeys and their reviews to MVP database"""
-    source_conn = sqlite3.connect(SOURCE_DB)
-    target_conn = sqlite3.connect(TARGET_DB)
+    source_conn = connect_readonly(SOURCE_DB, row_factory=None)
+    target_conn = connect_writer(TARGET_DB)
 
     source_cursor = source_conn.cursor()
     target_cursor = target_conn.cursor()
@@ -147,7 +147,7 @@ def copy_whiskey_and_reviews(whiskey_ids):
 
 def auto_tag_reviews():
     """Auto-extract descriptors from pipe-delimited reviews"""
-    conn = sqlite3.connect(TARGET_DB)
+    conn = connect_writer(TARGET_DB)
     cursor = conn.cursor()
 
     # Get descriptor name to ID mapping
@@ -204,7 +204,7 @@ def auto_tag_reviews():
 
 def aggregate_descriptors():
     """Create aggregated_whiskey_descriptors table"""
-    conn = sqlite3.connect(TARGET_DB)
+    conn = connect_writer(TARGET_DB)
     cursor = conn.cursor()
 
     cursor.execute("""
@@ -230,7 +230,7 @@ def aggregate_descriptors():
 
 def verify_data():
     """Verify the MVP database is ready for quiz generation"""
-    conn = sqlite3.connect(TARGET_DB)
+    conn = connect_writer(TARGET_DB)
     cursor = conn.cursor()
 
     # Count everything
@@ -0,0 +1,91 @@
+"""
+Shared pytest fixtures: throwaway SQLite databases for the tests
+"""
+
+import os
+import shutil
+import sqlite3
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from benchmarks.synthetic_catalog import build_catalog
+
+ROOT = Path(__file__).parent
+SCHEMA_PATH = ROOT / "schema_mvp_v2.sql"
+MIGRATIONS_DIR = ROOT / "migrations"
+
+# Created by create_distillery_mappings.py rather than the schema file
+DISTILLERY_MAPPINGS_TABLE = """
+    CREATE TABLE distillery_mappings (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        variant_name TEXT NOT NULL UNIQUE,
+        canonical_name TEXT NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        notes TEXT
+    );
+"""
+
+
+@pytest.fixture
+def make_test_db():
+    """
+    Factory for test databases; connections still open are closed after the test.
+
+    make_test_db(*setup, path=":memory:", schema=False, mappings=False, migrations=(),
+                 row_factory=None)
+        setup: SQL scripts, or callables taking the connection, run in order
+        path: database file (e.g. tmp_path / "test.db"); in memory by default
+        schema: start from the production schema (schema_mvp_v2.sql)
+        mappings: add the distillery_mappings table
+        migrations: migrations/*.sql file names applied after setup
+        row_factory: set on the returned connection (e.g. sqlite3.Row)
+
+    Returns the open connection, with everything committed.
+    """
+    connections = []
+
+    def make(*setup, path=":memory:", schema=False, mappings=False, migrations=(), row_factory=None):
+        conn = sqlite3.connect(path)
+        connections.append(conn)
+        if schema:
+            conn.executescript(SCHEMA_PATH.read_text())
+        if mappings:
+            conn.executescript(DISTILLERY_MAPPINGS_TABLE)
+        for step in setup:
+            if callable(step):
+                step(conn)
+            else:
+                conn.executescript(step)
+        for name in migrations:
+            conn.executescript((MIGRATIONS_DIR / name).read_text())
+        conn.commit()
+        conn.row_factory = row_factory
+        return conn
+
+    yield make
+    for conn in connections:
+        conn.close()
+
+
+def pytest_configure(config):
+    # app.py reads DB_PATH once, when it is first imported - which for some
+    # test files is at collection - so it is set before any test file loads
+    config.production_db_dir = tempfile.mkdtemp(prefix="whiskey-tests-")
+    os.environ["DB_PATH"] = str(Path(config.production_db_dir) / "whiskey_production.db")
+
+
+def pytest_unconfigure(config):
+    shutil.rmtree(config.production_db_dir, ignore_errors=True)
+
+
+@pytest.fixture(scope="session")
+def production_db():
+    """
+    Synthetic production-schema catalog at DB_PATH for the tests that go
+    through app.py (benchmarks/synthetic_catalog.py, ~60 whiskeys)
+    """
+    db_path = Path(os.environ["DB_PATH"])
+    build_catalog(db_path, scale=0.1)
+    return db_path
@@ -1,16 +1,24 @@
 #!/usr/bin/env python3
 """
 Create distillery_mappings table and populate with initial mappings
+
+The writes go to a staged copy of the database (db_swap.stage_copy) that is
+swapped in atomically once they have all succeeded, so the API never sees
+the live file mid-edit.
 """
 
 import sqlite3
 from pathlib import Path
 
+from data_version import bump_data_version
+from db_connections import connect_readonly, connect_writer
+from db_swap import discard, publish, stage_copy
+
 DB_PATH = Path(__file__).parent / "databases" / "whiskey_production.db"
 
-def create_mappings_table():
+def create_mappings_table(db_path=DB_PATH):
     """Create the distillery_mappings table"""
-    conn = sqlite3.connect(DB_PATH)
+    conn = connect_writer(db_path, wal=False)
     cursor = conn.cursor()
 
     # Create table
@@ -36,7 +44,7 @@ def create_mappings_table():
 
 def find_distillery_variants():
     """Find distilleries that likely need mapping"""
-    conn = sqlite3.connect(DB_PATH)
+    conn = connect_readonly(DB_PATH, row_factory=None)
     cursor = conn.cursor()
 
     cursor.execute('''
@@ -80,9 +88,9 @@ def find_distillery_variants():
 
     return duplicates
 
-def insert_initial_mappings():
+def insert_initial_mappings(db_path=DB_PATH):
     """Insert initial mappings for common duplicates"""
-    conn = sqlite3.connect(DB_PATH)
+    conn = connect_writer(db_path, wal=False)
     cursor = conn.cursor()
 
     # Define initial mappings
@@ -120,13 +128,48 @@ def insert_initial_mappings():
             print(f"⚠️  Mapping already exists: {variant_name}")
 
     conn.commit()
+    updated = refresh_canonical_distilleries(conn)
+    bump_data_version(conn)
     conn.close()
 
     print(f"\n✅ Inserted {inserted} new mappings")
+    if updated is not None:
+        print(f"✅ Refreshed canonical distillery on {updated} whiskeys")
+
+def refresh_canonical_distilleries(conn):
+    """
+    Recompute whiskeys.canonical_distillery from distillery_mappings.
+
+    Migration 003 adds triggers that keep the column current on every
+    insert/update; this is a full resync for bulk edits or repairs.
+    Does nothing if the database hasn't had migration 003 applied.
+
+    Returns:
+        int or None: Number of whiskeys updated, None if column missing
+    """
+    cursor = conn.cursor()
+    cursor.execute("PRAGMA table_info(whiskeys)")
+    if 'canonical_distillery' not in {row[1] for row in cursor.fetchall()}:
+        return None
+
+    cursor.execute('''
+        UPDATE whiskeys
+        SET canonical_distillery = COALESCE(
+            (SELECT canonical_name FROM distillery_mappings WHERE variant_name = whiskeys.distillery),
+            distillery
+        )
+        WHERE canonical_distillery IS NOT COALESCE(
+            (SELECT canonical_name FROM distillery_mappings WHERE variant_name = whiskeys.distillery),
+            distillery
+        )
+    ''')
+    updated = cursor.rowcount
+    conn.commit()
+    return updated
 
 def verify_mappings():
     """Verify the mappings are working"""
-    conn = sqlite3.connect(DB_PATH)
+    conn = connect_readonly(DB_PATH, row_factory=None)
     cursor = conn.cursor()
 
     cursor.execute('''
@@ -155,14 +198,21 @@ if __name__ == '__main__':
     print("DISTILLERY MAPPINGS SETUP")
     print("=" * 80)
 
-    # Step 1: Create table
-    create_mappings_table()
+    # Step 1: Create table (on a staged copy, published after step 3)
+    staged_path, source_signature = stage_copy(DB_PATH)
+    try:
+        create_mappings_table(staged_path)
+
+        # Step 2: Find variants
+        find_distillery_variants()
 
-    # Step 2: Find variants
-    find_distillery_variants()
+        # Step 3: Insert initial mappings
+        insert_initial_mappings(staged_path)
 
-    # Step 3: Insert initial mappings
-    insert_initial_mappings()
+        publish(staged_path, DB_PATH, source_signature)
+    except BaseException:
+        discard(staged_path)
+        raise
 
     # Step 4: Verify
     verify_mappings()
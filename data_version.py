@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Data version marker for the production database.
+
+A single-row `data_version` table holds a counter that every pipeline step
+which changes served data (rebuild_production.py, migrations, distillery
+mapping scripts) bumps when it finishes. The API uses it as the cache key
+for ETags and pre-rendered payloads.
+
+Usage:
+    python3 data_version.py [path/to/whiskey_production.db]   # bump manually
+"""
+
+import sqlite3
+import sys
+from pathlib import Path
+
+from db_connections import connect_writer
+
+DB_PATH = Path(__file__).parent / "databases" / "whiskey_production.db"
+
+
+def create_data_version_table(conn):
+    """Create the single-row data_version table if it doesn't exist."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS data_version (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            version INTEGER NOT NULL,
+            updated_at TEXT NOT NULL DEFAULT (datetime('now'))
+        )
+    """)
+    conn.execute("""
+        INSERT OR IGNORE INTO data_version (id, version) VALUES (1, 1)
+    """)
+
+
+def bump_data_version(conn):
+    """
+    Increment the data version. Call after any change to served data.
+
+    Creates the table on first use, so scripts can call this against
+    databases that predate the marker.
+
+    Returns:
+        int: The new version
+    """
+    create_data_version_table(conn)
+    conn.execute("""
+        UPDATE data_version
+        SET version = version + 1, updated_at = datetime('now')
+        WHERE id = 1
+    """)
+    conn.commit()
+    return read_data_version(conn)
+
+
+def read_data_version(conn):
+    """
+    Read the current data version.
+
+    Returns:
+        int or None: Version number, or None if the table doesn't exist
+    """
+    try:
+        row = conn.execute("SELECT version FROM data_version WHERE id = 1").fetchone()
+    except sqlite3.OperationalError:
+        return None
+    return row[0] if row else None
+
+
+if __name__ == '__main__':
+    db_path = Path(sys.argv[1]) if len(sys.argv) > 1 else DB_PATH
+    conn = connect_writer(db_path, wal=False)
+    version = bump_data_version(conn)
+    conn.close()
+    print(f"✓ Data version is now {version}")
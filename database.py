@@ -9,6 +9,10 @@ from datetime import datetime, timedelta
 from typing import List
 from urllib.parse import urlparse, parse_qs, urlencode, urlunparse
 
+from db_connections import connect_writer
+from slugs import has_slug_column, unique_slug
+from utils import parse_age, parse_price, parse_proof
+
 # Database file location
 # Use project directory for portability
 PROJECT_ROOT = Path(__file__).parent
@@ -149,15 +153,213 @@ def get_current_timestamp():
     return datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')
 
 
+def whiskey_match_key(name, distillery=None):
+    """
+    Build the lookup key stored in whiskeys.match_key (migration 007).
+    
+    Args:
+        name (str): Whiskey name
+        distillery (str, optional): Distillery name
+        
+    Returns:
+        str or None: "normalized name|normalized distillery", or None if the
+        name is empty
+    """
+    normalized_name = normalize_string(name)
+    if not normalized_name:
+        return None
+    return f"{normalized_name}|{normalize_string(distillery) or ''}"
+
+
+# Typed columns parsed from the free-text age / proof / price (migration 008)
+NUMERIC_ATTRIBUTES = ('age_months', 'proof_numeric', 'price_usd')
+
+
+def numeric_attributes(data):
+    """
+    Parse (age_months, proof_numeric, price_usd) from a review or whiskey.
+    
+    Uses data['age_months'] when the scraper already computed it.
+    
+    Returns:
+        tuple: Three floats or None
+    """
+    age_months = data.get('age_months')
+    if age_months is None:
+        age_months = parse_age(data.get('age'))[1]
+    return (age_months, parse_proof(data.get('proof'))[1], parse_price(data.get('price'))[1])
+
+
 # ============================================================================
 # DATABASE OPERATION FUNCTIONS
 # ============================================================================
 
+def has_match_key_column(conn):
+    """Return True if whiskeys.match_key exists (migration 007)."""
+    cursor = conn.execute("PRAGMA table_info(whiskeys)")
+    return any(row[1] == 'match_key' for row in cursor.fetchall())
+
+
+def has_numeric_attribute_columns(conn):
+    """Return True if reviews/whiskeys have the typed columns (migration 008)."""
+    cursor = conn.execute("PRAGMA table_info(reviews)")
+    return any(row[1] == 'proof_numeric' for row in cursor.fetchall())
+
+
+def refresh_whiskey_numeric_attributes(conn, whiskey_ids=None):
+    """
+    Fill a whiskey's NULL typed columns from its most recent review that
+    has them. Doesn't commit.
+    
+    Args:
+        conn: Database connection
+        whiskey_ids (iterable, optional): Only these whiskeys (default: all)
+        
+    Returns:
+        int: Whiskeys updated
+    """
+    latest = """(
+                SELECT r.{column} FROM reviews r
+                WHERE r.whiskey_id = whiskeys.whiskey_id AND r.{column} IS NOT NULL
+                ORDER BY r.review_id DESC LIMIT 1)"""
+    assignments = ",\n".join(
+        f"{column} = COALESCE({column}, {latest.format(column=column)})"
+        for column in NUMERIC_ATTRIBUTES
+    )
+    # Only rows a review can actually fill, so rowcount is meaningful
+    fillable = " OR ".join(
+        f"({column} IS NULL AND {latest.format(column=column)} IS NOT NULL)"
+        for column in NUMERIC_ATTRIBUTES
+    )
+    sql = f"UPDATE whiskeys SET {assignments} WHERE ({fillable})"
+    
+    cursor = conn.cursor()
+    if whiskey_ids is None:
+        cursor.execute(sql)
+        return cursor.rowcount
+    updated = 0
+    for chunk in _chunks(set(whiskey_ids)):
+        placeholders = ','.join('?' * len(chunk))
+        cursor.execute(sql + f" AND whiskey_id IN ({placeholders})", chunk)
+        updated += cursor.rowcount
+    return updated
+
+
+def parse_numeric_attribute_rows(conn, table, first_id=None, last_id=None):
+    """
+    Parse age_months / proof_numeric / price_usd from the free-text columns
+    of one table where they are NULL. Doesn't commit.
+    
+    Args:
+        conn: Database connection
+        table (str): 'reviews' or 'whiskeys'
+        first_id, last_id (int, optional): Only rows with ids in this range
+        
+    Returns:
+        int: Rows updated (0 for tables without free-text attributes, like
+        the scraper's whiskeys)
+    """
+    key = {'reviews': 'review_id', 'whiskeys': 'whiskey_id'}[table]
+    cursor = conn.cursor()
+    columns = {row[1] for row in cursor.execute(f"PRAGMA table_info({table})")}
+    if not {'age', 'proof', 'price'} <= columns:
+        return 0
+    
+    id_range = ""
+    params = ()
+    if first_id is not None and last_id is not None:
+        id_range = f"{key} BETWEEN ? AND ? AND "
+        params = (first_id, last_id)
+    cursor.execute(f"""
+        SELECT {key}, age, proof, price, age_months, proof_numeric, price_usd
+        FROM {table}
+        WHERE {id_range}((age IS NOT NULL AND age_months IS NULL)
+               OR (proof IS NOT NULL AND proof_numeric IS NULL)
+               OR (price IS NOT NULL AND price_usd IS NULL))
+    """, params)
+    updates = []
+    for row_id, age, proof, price, *current in cursor.fetchall():
+        parsed = numeric_attributes({'age': age, 'proof': proof, 'price': price})
+        # Skip rows whose remaining text doesn't parse ("NAS", "N/A")
+        if any(old is None and new is not None for old, new in zip(current, parsed)):
+            updates.append(parsed + (row_id,))
+    cursor.executemany(f"""
+        UPDATE {table} SET
+            age_months = COALESCE(age_months, ?),
+            proof_numeric = COALESCE(proof_numeric, ?),
+            price_usd = COALESCE(price_usd, ?)
+        WHERE {key} = ?
+    """, updates)
+    return len(updates)
+
+
+def backfill_numeric_attributes(conn):
+    """
+    Parse age_months / proof_numeric / price_usd for rows where they are
+    NULL, with the same parsers the scraper uses at ingest, in one
+    transaction. (migrations/009_backfill_numeric_attributes.py does the
+    same in chunks for large databases.)
+    
+    Rows of tables that keep the free-text columns (reviews; whiskeys in the
+    production schema) are parsed directly; whiskeys then take any values
+    still missing from their reviews.
+    
+    Returns:
+        int or None: Rows updated, or None if the columns don't exist
+    """
+    if not has_numeric_attribute_columns(conn):
+        return None
+    
+    updated = (parse_numeric_attribute_rows(conn, 'reviews')
+               + parse_numeric_attribute_rows(conn, 'whiskeys'))
+    updated += refresh_whiskey_numeric_attributes(conn)
+    conn.commit()
+    return updated
+
+
+def backfill_match_keys(conn):
+    """
+    Fill whiskeys.match_key where it is NULL, in whiskey_id order.
+    
+    When several whiskeys share a key (duplicates from before the unique
+    index), the first one keeps it - the one find_whiskey() used to return -
+    and the rest stay NULL.
+    
+    Returns:
+        int or None: Keys written, or None if the column doesn't exist
+    """
+    if not has_match_key_column(conn):
+        return None
+    
+    cursor = conn.cursor()
+    cursor.execute("SELECT match_key FROM whiskeys WHERE match_key IS NOT NULL")
+    taken = {row[0] for row in cursor.fetchall()}
+    
+    cursor.execute("""
+        SELECT whiskey_id, name, distillery
+        FROM whiskeys
+        WHERE match_key IS NULL
+        ORDER BY whiskey_id
+    """)
+    updates = []
+    for whiskey_id, name, distillery in cursor.fetchall():
+        key = whiskey_match_key(name, distillery)
+        if key is not None and key not in taken:
+            taken.add(key)
+            updates.append((key, whiskey_id))
+    
+    cursor.executemany("UPDATE whiskeys SET match_key = ? WHERE whiskey_id = ?", updates)
+    conn.commit()
+    return len(updates)
+
+
 def find_whiskey(conn, name, distillery=None):
     """
     Find a whiskey in the database by name and distillery.
     
-    Uses normalized (lowercase, trimmed) matching for consistency.
+    Uses normalized (lowercase, trimmed) matching for consistency: one probe
+    of the unique whiskeys.match_key index, or a scan comparing LOWER()ed
+    columns on databases without migration 007.
     
     Args:
         conn: Database connection
@@ -176,12 +378,17 @@ def find_whiskey(conn, name, distillery=None):
     if not normalized_name:
         return None
     
-    # Query with normalized values
-    cursor.execute("""
-        SELECT whiskey_id 
-        FROM whiskeys 
-        WHERE LOWER(name) = ? AND LOWER(COALESCE(distillery, '')) = ?
-    """, (normalized_name, normalized_distillery or ''))
+    try:
+        cursor.execute("""
+            SELECT whiskey_id FROM whiskeys WHERE match_key = ?
+        """, (whiskey_match_key(name, distillery),))
+    except sqlite3.OperationalError:
+        # No match_key column: query with normalized values (full scan)
+        cursor.execute("""
+            SELECT whiskey_id 
+            FROM whiskeys 
+            WHERE LOWER(name) = ? AND LOWER(COALESCE(distillery, '')) = ?
+        """, (normalized_name, normalized_distillery or ''))
     
     result = cursor.fetchone()
     return result[0] if result else None
@@ -199,8 +406,6 @@ def insert_whiskey(conn, name, distillery=None):
     Returns:
         int: The whiskey_id of the newly inserted whiskey
     """
-    cursor = conn.cursor()
-    
     # Normalize inputs
     normalized_name = normalize_string(name)
     normalized_distillery = normalize_string(distillery)
@@ -208,19 +413,46 @@ def insert_whiskey(conn, name, distillery=None):
     if not normalized_name:
         raise ValueError("Whiskey name cannot be empty")
     
+    whiskey_id = _insert_whiskey_row(conn, normalized_name, normalized_distillery,
+                                     has_match_key_column(conn), has_slug_column(conn))
+    conn.commit()
+    
+    # Return the new whiskey_id
+    return whiskey_id
+
+
+def _insert_whiskey_row(conn, normalized_name, normalized_distillery, with_match_key, with_slug):
+    """
+    INSERT an already-normalized whiskey without committing; returns its id.
+    
+    with_match_key / with_slug: has_match_key_column() / has_slug_column(),
+    checked once by the caller rather than once per row.
+    """
+    cursor = conn.cursor()
+    
     # Get current timestamp
     first_seen = get_current_timestamp()
     
-    # Insert new whiskey
-    cursor.execute("""
-        INSERT INTO whiskeys (name, distillery, first_seen_date, needs_review)
-        VALUES (?, ?, ?, 0)
-    """, (normalized_name, normalized_distillery, first_seen))
+    # Insert new whiskey, with its lookup key where the column exists
+    if with_match_key:
+        cursor.execute("""
+            INSERT INTO whiskeys (name, distillery, first_seen_date, needs_review, match_key)
+            VALUES (?, ?, ?, 0, ?)
+        """, (normalized_name, normalized_distillery, first_seen,
+              whiskey_match_key(normalized_name, normalized_distillery)))
+    else:
+        cursor.execute("""
+            INSERT INTO whiskeys (name, distillery, first_seen_date, needs_review)
+            VALUES (?, ?, ?, 0)
+        """, (normalized_name, normalized_distillery, first_seen))
+    whiskey_id = cursor.lastrowid
     
-    conn.commit()
+    # Persist the URL slug on databases that have the column (migration 005)
+    if with_slug:
+        cursor.execute("UPDATE whiskeys SET slug = ? WHERE whiskey_id = ?",
+                       (unique_slug(conn, normalized_name), whiskey_id))
     
-    # Return the new whiskey_id
-    return cursor.lastrowid
+    return whiskey_id
 
 
 def check_duplicate_review(conn, source_site, normalized_url):
@@ -247,11 +479,216 @@ def check_duplicate_review(conn, source_site, normalized_url):
     return result is not None
 
 
+def load_review_urls(conn, source_site):
+    """
+    Normalized URLs of every stored review from one site, in one query.
+
+    Scrapers load this once per run and check each discovered URL against
+    it before fetching, instead of calling check_duplicate_review() per URL.
+
+    Returns:
+        set of str
+    """
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT normalized_url FROM reviews
+        WHERE source_site = ? AND normalized_url IS NOT NULL
+    """, (source_site,))
+    return {row[0] for row in cursor.fetchall()}
+
+
+# Largest IN (...) list per query (SQLite's default variable limit is 999 on
+# older builds)
+IN_CHUNK_SIZE = 500
+
+
+def _chunks(values, size=IN_CHUNK_SIZE):
+    values = list(values)
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def _whiskey_ids_for_keys(cursor, keys):
+    """
+    Map (normalized name, normalized distillery or '') -> whiskey_id for the
+    given keys, matching find_whiskey() (first match wins).
+    """
+    whiskey_ids = {}
+    by_match_key = {f"{name}|{distillery}": (name, distillery) for name, distillery in keys}
+    try:
+        # Index probes on whiskeys.match_key (migration 007)
+        for chunk in _chunks(by_match_key):
+            placeholders = ','.join('?' * len(chunk))
+            cursor.execute(f"""
+                SELECT match_key, whiskey_id FROM whiskeys
+                WHERE match_key IN ({placeholders})
+            """, chunk)
+            for match_key, whiskey_id in cursor.fetchall():
+                whiskey_ids[by_match_key[match_key]] = whiskey_id
+        return whiskey_ids
+    except sqlite3.OperationalError:
+        pass
+
+    # No match_key column: one scan per chunk of names
+    for chunk in _chunks({name for name, _ in keys}):
+        placeholders = ','.join('?' * len(chunk))
+        cursor.execute(f"""
+            SELECT whiskey_id, LOWER(name), LOWER(COALESCE(distillery, ''))
+            FROM whiskeys
+            WHERE LOWER(name) IN ({placeholders})
+            ORDER BY whiskey_id
+        """, chunk)
+        for whiskey_id, name, distillery in cursor.fetchall():
+            whiskey_ids.setdefault((name, distillery), whiskey_id)
+    return whiskey_ids
+
+
+# Columns insert_reviews_bulk() writes, in the order of its value tuples
+REVIEW_COLUMNS = (
+    'whiskey_id', 'source_site', 'source_url', 'normalized_url',
+    'review_date', 'date_scraped',
+    'classification', 'company', 'proof', 'age', 'mashbill', 'color', 'price',
+    'nose', 'palate', 'finish', 'rating', 'overall_notes', 'additional_data',
+)
+
+
+def insert_reviews_bulk(conn, reviews):
+    """
+    Insert many reviews in one transaction.
+
+    Whiskeys are resolved through an in-memory (name, distillery) -> id map
+    loaded with one query per batch. Each review is one
+    INSERT ... ON CONFLICT(source_site, normalized_url) DO NOTHING RETURNING
+    statement: the unique index detects duplicates (including ones written
+    by another process since the caller checked) and the new review_id
+    comes back from the same statement. On databases with migration 008 the
+    typed age_months / proof_numeric / price_usd columns are parsed and
+    stored too, and new whiskeys take theirs from the review. Nothing is
+    printed per row, and there is one commit (one fsync) for the whole batch.
+
+    Args:
+        conn: Database connection
+        reviews (iterable of dict): Review dicts as accepted by insert_review()
+
+    Returns:
+        list of dict, one per input review in order:
+            {"status": "inserted" | "duplicate" | "invalid",
+             "review_id": int or None, "whiskey_id": int or None,
+             "created_whiskey": bool, "error": str or None}
+        Reviews repeated within the batch count as duplicates after the first.
+    """
+    reviews = list(reviews)
+    cursor = conn.cursor()
+    date_scraped = get_current_timestamp()
+
+    # Validate and normalize (an error message stands in for invalid items)
+    prepared = []
+    for review_data in reviews:
+        name = review_data.get('name')
+        source_site = review_data.get('source_site')
+        source_url = review_data.get('source_url')
+        if not all([name, source_site, source_url]):
+            prepared.append("Missing required fields: name, source_site, source_url")
+            continue
+        normalized_name = normalize_string(name)
+        if not normalized_name:
+            prepared.append("Whiskey name cannot be empty")
+            continue
+        whiskey_key = (normalized_name, normalize_string(review_data.get('distillery')) or '')
+        prepared.append((review_data, whiskey_key, source_site, normalize_url(source_url)))
+
+    valid = [item for item in prepared if not isinstance(item, str)]
+    whiskey_ids = _whiskey_ids_for_keys(cursor, {key for _, key, _, _ in valid})
+    seen_urls = set()
+
+    # Optional columns (migrations 005, 007, 008), checked once per batch
+    with_match_key = has_match_key_column(conn)
+    with_slug = has_slug_column(conn)
+    with_numeric = has_numeric_attribute_columns(conn)
+    columns = REVIEW_COLUMNS + (NUMERIC_ATTRIBUTES if with_numeric else ())
+    insert_sql = f"""
+        INSERT INTO reviews ({', '.join(columns)})
+        VALUES ({', '.join('?' * len(columns))})
+        ON CONFLICT(source_site, normalized_url) DO NOTHING
+        RETURNING review_id
+    """
+
+    duplicate = {"status": "duplicate", "review_id": None, "whiskey_id": None,
+                 "created_whiskey": False, "error": None}
+    outcomes = []
+    with conn:
+        for item in prepared:
+            if isinstance(item, str):
+                outcomes.append({"status": "invalid", "review_id": None, "whiskey_id": None,
+                                 "created_whiskey": False, "error": item})
+                continue
+
+            review_data, whiskey_key, source_site, normalized_url = item
+            if (source_site, normalized_url) in seen_urls:
+                outcomes.append(dict(duplicate))
+                continue
+            seen_urls.add((source_site, normalized_url))
+
+            whiskey_id = whiskey_ids.get(whiskey_key)
+            created = whiskey_id is None
+            if created:
+                whiskey_id = _insert_whiskey_row(conn, whiskey_key[0], whiskey_key[1] or None,
+                                                 with_match_key, with_slug)
+                whiskey_ids[whiskey_key] = whiskey_id
+
+            review_date = review_data.get('review_date')
+            if review_date:
+                review_date = parse_date(review_date)
+
+            values = (
+                whiskey_id,
+                source_site,
+                review_data.get('source_url'),
+                normalized_url,
+                review_date,
+                date_scraped,
+                review_data.get('classification'),
+                review_data.get('company'),
+                review_data.get('proof'),
+                review_data.get('age'),
+                review_data.get('mashbill'),
+                review_data.get('color'),
+                review_data.get('price'),
+                review_data.get('nose'),
+                review_data.get('palate'),
+                review_data.get('finish'),
+                review_data.get('rating'),
+                review_data.get('overall_notes'),
+                review_data.get('additional_data')
+            )
+            if with_numeric:
+                values += numeric_attributes(review_data)
+            cursor.execute(insert_sql, values)
+            row = cursor.fetchone()
+
+            if row is None:
+                # Already stored; don't keep a whiskey created only for it
+                if created:
+                    cursor.execute("DELETE FROM whiskeys WHERE whiskey_id = ?", (whiskey_id,))
+                    del whiskey_ids[whiskey_key]
+                outcomes.append(dict(duplicate))
+                continue
+            outcomes.append({"status": "inserted", "review_id": row[0], "whiskey_id": whiskey_id,
+                             "created_whiskey": created, "error": None})
+
+        if with_numeric:
+            refresh_whiskey_numeric_attributes(
+                conn, [o["whiskey_id"] for o in outcomes if o["status"] == "inserted"])
+
+    return outcomes
+
+
 def insert_review(conn, review_data):
     """
     Insert a new review into the database.
     
     Handles whiskey matching/creation and duplicate detection automatically.
+    A one-item insert_reviews_bulk(); use that directly for many reviews.
     
     Args:
         conn: Database connection
@@ -268,75 +705,19 @@ def insert_review(conn, review_data):
     Returns:
         int or None: review_id if inserted, None if duplicate
     """
-    cursor = conn.cursor()
-    
-    # Extract required fields
-    name = review_data.get('name')
-    source_site = review_data.get('source_site')
-    source_url = review_data.get('source_url')
-    
-    if not all([name, source_site, source_url]):
-        raise ValueError("Missing required fields: name, source_site, source_url")
+    outcome = insert_reviews_bulk(conn, [review_data])[0]
     
-    # Normalize URL for duplicate detection
-    normalized_url = normalize_url(source_url)
+    if outcome["status"] == "invalid":
+        raise ValueError(outcome["error"])
     
-    # Check for duplicate review
-    if check_duplicate_review(conn, source_site, normalized_url):
-        print(f"  ⊘ Duplicate review skipped: {source_url}")
+    if outcome["status"] == "duplicate":
+        print(f"  ⊘ Duplicate review skipped: {review_data.get('source_url')}")
         return None
     
-    # Find or create whiskey
-    distillery = review_data.get('distillery')
-    whiskey_id = find_whiskey(conn, name, distillery)
-    
-    if whiskey_id is None:
-        # Whiskey doesn't exist, create it
-        whiskey_id = insert_whiskey(conn, name, distillery)
-        print(f"  + Created new whiskey: {name}")
-    
-    # Get current timestamp for date_scraped
-    date_scraped = get_current_timestamp()
-    
-    # Parse review_date if provided
-    review_date = review_data.get('review_date')
-    if review_date:
-        review_date = parse_date(review_date)
-    
-    # Insert review
-    cursor.execute("""
-        INSERT INTO reviews (
-            whiskey_id, source_site, source_url, normalized_url,
-            review_date, date_scraped,
-            classification, company, proof, age, mashbill, color, price,
-            nose, palate, finish, rating, overall_notes, additional_data
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    """, (
-        whiskey_id,
-        source_site,
-        source_url,
-        normalized_url,
-        review_date,
-        date_scraped,
-        review_data.get('classification'),
-        review_data.get('company'),
-        review_data.get('proof'),
-        review_data.get('age'),
-        review_data.get('mashbill'),
-        review_data.get('color'),
-        review_data.get('price'),
-        review_data.get('nose'),
-        review_data.get('palate'),
-        review_data.get('finish'),
-        review_data.get('rating'),
-        review_data.get('overall_notes'),
-        review_data.get('additional_data')
-    ))
-    
-    conn.commit()
-    
-    print(f"  ✓ Added review: {name} from {source_site}")
-    return cursor.lastrowid
+    if outcome["created_whiskey"]:
+        print(f"  + Created new whiskey: {review_data.get('name')}")
+    print(f"  ✓ Added review: {review_data.get('name')} from {review_data.get('source_site')}")
+    return outcome["review_id"]
 
 
 def log_scraper_run(conn, source_site, status, reviews_found=0, reviews_added=0, 
@@ -436,7 +817,7 @@ def get_connection():
     Create and return a connection to the SQLite database.
     Creates the database file if it doesn't exist.
     """
-    conn = sqlite3.connect(DB_PATH)
+    conn = connect_writer(DB_PATH)
     # Ensure UTF-8 encoding for text operations
     conn.execute("PRAGMA encoding = 'UTF-8'")
     return conn
@@ -454,10 +835,29 @@ def create_whiskeys_table(conn):
             name TEXT NOT NULL,
             distillery TEXT,
             first_seen_date TEXT NOT NULL,
-            needs_review INTEGER DEFAULT 0
+            needs_review INTEGER DEFAULT 0,
+            match_key TEXT,  -- whiskey_match_key(name, distillery)
+            
+            -- Typed attributes, filled from the whiskey's reviews
+            age_months REAL,
+            proof_numeric REAL,
+            price_usd REAL
         )
     """)
     
+    # Unique lookup key for find_whiskey(). Scraper databases created
+    # before it get the column and their keys here, in one transaction
+    # (migrations/007_add_whiskey_match_keys.sql does this for production).
+    if not has_match_key_column(conn):
+        cursor.execute("BEGIN")
+        cursor.execute("ALTER TABLE whiskeys ADD COLUMN match_key TEXT")
+        backfill_match_keys(conn)  # commits
+        print("✓ Added whiskeys.match_key")
+    cursor.execute("""
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_whiskeys_match_key 
+        ON whiskeys(match_key)
+    """)
+    
     # Create index on name for fast searching
     cursor.execute("""
         CREATE INDEX IF NOT EXISTS idx_whiskeys_name 
@@ -499,6 +899,11 @@ def create_reviews_table(conn):
             overall_notes TEXT,
             additional_data TEXT,
             
+            -- Parsed from age / proof / price at ingest
+            age_months REAL,
+            proof_numeric REAL,
+            price_usd REAL,
+            
             FOREIGN KEY (whiskey_id) REFERENCES whiskeys(whiskey_id)
         )
     """)
@@ -525,6 +930,27 @@ def create_reviews_table(conn):
         ON reviews(source_site, normalized_url)
     """)
     
+    # Typed age/proof/price. Scraper databases created before them get the
+    # columns and the parsed values here, in one transaction (migrations
+    # 008/009 do this for production).
+    if not has_numeric_attribute_columns(conn):
+        cursor.execute("BEGIN")
+        for table in ('reviews', 'whiskeys'):
+            existing = {row[1] for row in cursor.execute(f"PRAGMA table_info({table})")}
+            for column in NUMERIC_ATTRIBUTES:
+                if column not in existing:
+                    cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} REAL")
+        backfill_numeric_attributes(conn)  # commits
+        print("✓ Added age_months / proof_numeric / price_usd")
+    
+    # Range filters on the typed attributes
+    for table in ('reviews', 'whiskeys'):
+        for column in NUMERIC_ATTRIBUTES:
+            cursor.execute(f"""
+                CREATE INDEX IF NOT EXISTS idx_{table}_{column} 
+                ON {table}({column})
+            """)
+    
     conn.commit()
     print("✓ Created reviews table")
 
@@ -0,0 +1,256 @@
+"""
+SQLite connection factory for the whole project.
+
+Two roles:
+
+- connect_readonly(): readers. Used by the API (pooled per thread by
+  ReadOnlyConnectionPool) and by scripts that only report on a database.
+  Opened mode=ro + query_only and tuned for a read-heavy workload.
+- connect_writer(): scrapers, build/rebuild scripts and migrations. WAL
+  journal (readers keep reading while it writes), synchronous=NORMAL,
+  foreign keys on, and a checkpoint policy that keeps the WAL bounded.
+
+Both wait up to SQLITE_BUSY_TIMEOUT_MS for locks instead of failing with
+"database is locked".
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+# Tuning defaults (override with environment variables)
+MMAP_SIZE = int(os.getenv('SQLITE_MMAP_SIZE', 256 * 1024 * 1024))    # bytes
+CACHE_SIZE_KB = int(os.getenv('SQLITE_CACHE_SIZE_KB', 64 * 1024))     # 64MB page cache
+STATEMENT_CACHE_SIZE = int(os.getenv('SQLITE_STATEMENT_CACHE', 256))  # stdlib default is 128
+BUSY_TIMEOUT_MS = int(os.getenv('SQLITE_BUSY_TIMEOUT_MS', 5000))      # wait for locks this long
+
+# Writer page cache and WAL checkpoint policy
+WRITER_CACHE_SIZE_KB = int(os.getenv('SQLITE_WRITER_CACHE_SIZE_KB', 32 * 1024))
+# Checkpoint automatically once the WAL holds this many pages (~4MB)...
+WAL_AUTOCHECKPOINT_PAGES = int(os.getenv('SQLITE_WAL_AUTOCHECKPOINT', 1000))
+# ...and truncate it back to at most this size afterwards
+WAL_SIZE_LIMIT = int(os.getenv('SQLITE_WAL_SIZE_LIMIT', 64 * 1024 * 1024))  # bytes
+
+# Recycle policy
+MAX_CONNECTION_AGE = float(os.getenv('SQLITE_MAX_CONNECTION_AGE', 3600))  # seconds
+HEALTH_CHECK_INTERVAL = float(os.getenv('SQLITE_HEALTH_CHECK_INTERVAL', 30))  # seconds
+
+
+def connect_readonly(db_path, row_factory=sqlite3.Row, factory=sqlite3.Connection):
+    """
+    Open a read-only, query-only connection tuned for serving.
+
+    Args:
+        db_path: Path to the SQLite database file
+        row_factory: Row factory to install (default: sqlite3.Row)
+        factory: sqlite3.Connection subclass to instantiate
+
+    Returns:
+        sqlite3.Connection
+
+    Raises:
+        sqlite3.OperationalError: If the file doesn't exist (mode=ro never
+            creates an empty database the way a plain connect() does)
+    """
+    uri = Path(db_path).resolve().as_uri() + "?mode=ro"
+    conn = sqlite3.connect(
+        uri,
+        uri=True,
+        cached_statements=STATEMENT_CACHE_SIZE,
+        check_same_thread=False,
+        factory=factory,
+    )
+    conn.row_factory = row_factory
+
+    conn.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}")
+    conn.execute(f"PRAGMA mmap_size = {MMAP_SIZE}")
+    # Negative cache_size is in KiB rather than pages
+    conn.execute(f"PRAGMA cache_size = -{CACHE_SIZE_KB}")
+    conn.execute("PRAGMA temp_store = MEMORY")
+    conn.execute("PRAGMA query_only = ON")
+    return conn
+
+
+def connect_writer(db_path, wal=True, row_factory=None, factory=sqlite3.Connection):
+    """
+    Open a read-write connection (creating the file if needed).
+
+    With wal=True the database is switched to WAL, so readers are never
+    blocked by this writer and commits append to the log instead of
+    rewriting pages; synchronous=NORMAL is then crash-safe and skips most
+    fsyncs. SQLite checkpoints the log every WAL_AUTOCHECKPOINT_PAGES and
+    truncates it to WAL_SIZE_LIMIT; batch jobs should also call checkpoint()
+    when they finish so readers can't starve the automatic checkpoints.
+
+    Pass wal=False for the production database the API serves:
+    db_swap.publish() renames new files over that path, and a -wal/-shm
+    pair left next to it would be read as part of the new file. It keeps
+    the rollback journal with synchronous=FULL.
+
+    Args:
+        db_path: Path to the SQLite database file
+        wal: Use WAL (True) or the rollback journal (False)
+        row_factory: Row factory to install (default: plain tuples)
+        factory: sqlite3.Connection subclass to instantiate
+
+    Returns:
+        sqlite3.Connection
+    """
+    conn = sqlite3.connect(
+        db_path,
+        timeout=BUSY_TIMEOUT_MS / 1000,
+        cached_statements=STATEMENT_CACHE_SIZE,
+        factory=factory,
+    )
+    conn.row_factory = row_factory
+
+    conn.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}")
+    if wal:
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute(f"PRAGMA wal_autocheckpoint = {WAL_AUTOCHECKPOINT_PAGES}")
+        conn.execute(f"PRAGMA journal_size_limit = {WAL_SIZE_LIMIT}")
+    else:
+        conn.execute("PRAGMA journal_mode = DELETE")
+        conn.execute("PRAGMA synchronous = FULL")
+    conn.execute("PRAGMA foreign_keys = ON")
+    conn.execute(f"PRAGMA cache_size = -{WRITER_CACHE_SIZE_KB}")
+    conn.execute("PRAGMA temp_store = MEMORY")
+    return conn
+
+
+def checkpoint(conn, mode='TRUNCATE'):
+    """
+    Copy the WAL back into the database file and (TRUNCATE) empty it.
+
+    A no-op on rollback-journal databases.
+
+    Returns:
+        (busy, wal_frames, checkpointed_frames) as reported by SQLite;
+        busy=1 means a reader prevented a complete checkpoint
+    """
+    if mode not in ('PASSIVE', 'FULL', 'RESTART', 'TRUNCATE'):
+        raise ValueError(f"Unknown checkpoint mode: {mode}")
+    return tuple(conn.execute(f"PRAGMA wal_checkpoint({mode})").fetchone())
+
+
+def is_wal(db_path):
+    """True if the database file's header says it is in WAL mode."""
+    with open(db_path, 'rb') as f:
+        header = f.read(20)
+    return len(header) == 20 and header[18] == 2
+
+
+class _PooledConnection:
+    """A connection plus the bookkeeping needed to decide when to recycle it."""
+
+    __slots__ = ('conn', 'inode', 'opened_at', 'checked_at')
+
+    def __init__(self, conn, inode):
+        now = time.monotonic()
+        self.conn = conn
+        self.inode = inode
+        self.opened_at = now
+        self.checked_at = now
+
+
+def _inode(db_path):
+    """Inode currently at db_path, or None if nothing is there."""
+    try:
+        return os.stat(db_path).st_ino
+    except FileNotFoundError:
+        return None
+
+
+class ReadOnlyConnectionPool:
+    """
+    One read-only connection per thread, reused across requests.
+
+    Under gunicorn's sync workers that means one connection per worker;
+    with threaded workers each thread gets its own, so no connection is
+    ever shared between concurrent requests.
+
+    Connections are recycled when they:
+    - point at a file that has been replaced: an atomic rename of a new
+      database over db_path (see db_swap.py) leaves open connections on
+      the old inode, so every get() compares it with the path's current one
+    - are older than max_age seconds
+    - fail a periodic health check (SELECT 1)
+    - were closed by the caller
+    """
+
+    def __init__(self, db_path, max_age=MAX_CONNECTION_AGE,
+                 health_check_interval=HEALTH_CHECK_INTERVAL, connect=connect_readonly):
+        """
+        Args:
+            db_path: Path to the SQLite database file
+            max_age: Seconds before a connection is reopened
+            health_check_interval: Seconds between SELECT 1 probes
+            connect: Callable db_path -> connection (default: connect_readonly)
+        """
+        self.db_path = db_path
+        self.connect = connect
+        self.max_age = max_age
+        self.health_check_interval = health_check_interval
+        self._local = threading.local()
+        self._all = []
+        self._lock = threading.Lock()
+
+    def get(self):
+        """Return this thread's connection, opening or recycling it if needed."""
+        pooled = getattr(self._local, 'pooled', None)
+        if pooled is not None and self._is_usable(pooled):
+            return pooled.conn
+
+        if pooled is not None:
+            self._discard(pooled)
+
+        # Stat before connecting: if the file is swapped in between, the
+        # next get() sees a mismatch and reconnects rather than missing it
+        inode = _inode(self.db_path)
+        pooled = _PooledConnection(self.connect(self.db_path), inode)
+        self._local.pooled = pooled
+        with self._lock:
+            self._all.append(pooled)
+        return pooled.conn
+
+    def _is_usable(self, pooled):
+        """Cheap checks every call, a real query every health_check_interval."""
+        now = time.monotonic()
+        if now - pooled.opened_at > self.max_age:
+            return False
+        if _inode(self.db_path) != pooled.inode:
+            return False
+
+        try:
+            # Raises ProgrammingError if someone closed the connection
+            pooled.conn.total_changes
+            if now - pooled.checked_at > self.health_check_interval:
+                pooled.conn.execute("SELECT 1").fetchone()
+                pooled.checked_at = now
+        except sqlite3.Error:
+            return False
+        return True
+
+    def _discard(self, pooled):
+        with self._lock:
+            if pooled in self._all:
+                self._all.remove(pooled)
+        try:
+            pooled.conn.close()
+        except sqlite3.Error:
+            pass
+        self._local.pooled = None
+
+    def close_all(self):
+        """Close every connection in the pool (e.g. before fork or at shutdown)."""
+        with self._lock:
+            pooled_list, self._all = self._all, []
+        for pooled in pooled_list:
+            try:
+                pooled.conn.close()
+            except sqlite3.Error:
+                pass
+        self._local = threading.local()
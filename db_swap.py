@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Zero-downtime replacement of the production database file.
+
+Offline jobs such as rebuild_production.py don't modify the live file in
+place. Instead they:
+
+1. stage_copy() - copy the live database to a new versioned file next to
+   it (SQLite online backup, so the copy is consistent even while the API
+   is reading)
+2. write only to that copy
+3. publish() - fsync the copy and os.replace() it over the live path
+
+The rename is atomic. A process opening the path sees either the old file
+or the fully rebuilt one, never a half-cleared table, and the API's
+readers never wait on the writer's locks. Open connections keep a
+consistent view of the old file until they reconnect. The API notices the
+new inode between requests (ReadOnlyConnectionPool, SnapshotCache) and
+switches connections and caches.
+
+Usage:
+    python3 db_swap.py staged.db [path/to/whiskey_production.db]   # publish by hand
+"""
+
+import os
+import sys
+from pathlib import Path
+
+from data_version import read_data_version
+from db_connections import connect_readonly, connect_writer, is_wal
+from snapshots import file_signature
+
+DB_PATH = Path(__file__).parent / "databases" / "whiskey_production.db"
+
+
+def versioned_path(db_path, version):
+    """whiskey_production.db -> whiskey_production.v<version>.db (same directory)."""
+    db_path = Path(db_path)
+    return db_path.with_name(f"{db_path.stem}.v{version}{db_path.suffix}")
+
+
+def stage_copy(db_path=DB_PATH):
+    """
+    Copy the live database to a versioned working file.
+
+    Returns:
+        (staged_path, source_signature): Pass source_signature to publish()
+        so it can refuse to overwrite changes made to the live file meanwhile
+    """
+    db_path = Path(db_path)
+    source = connect_readonly(db_path, row_factory=None)
+    try:
+        signature = file_signature(db_path)
+        staged = versioned_path(db_path, (read_data_version(source) or 1) + 1)
+        if staged.exists():
+            staged.unlink()
+        target = connect_writer(staged, wal=False)
+        source.backup(target)
+        target.close()
+    finally:
+        source.close()
+    return staged, signature
+
+
+def _fsync(path):
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def publish(staged_path, db_path=DB_PATH, expected_signature=None):
+    """
+    Atomically replace db_path with staged_path.
+
+    Args:
+        staged_path: File produced by stage_copy() and then modified
+        db_path: Live database path
+        expected_signature: file_signature() of the live file when it was
+            staged; if it has changed since, publishing would discard those
+            writes, so nothing is replaced
+
+    Raises:
+        RuntimeError: If the live file changed since it was staged, or is
+            in WAL mode (its -wal file would be applied to the new file)
+    """
+    staged_path, db_path = Path(staged_path), Path(db_path)
+    if expected_signature is not None and file_signature(db_path) != expected_signature:
+        raise RuntimeError(f"{db_path} changed while {staged_path.name} was being built; "
+                           "not replacing it (rerun the job)")
+    if db_path.exists() and is_wal(db_path):
+        raise RuntimeError(f"{db_path} is in WAL mode; switch it back with "
+                           "PRAGMA journal_mode = DELETE before publishing over it")
+
+    # A self-contained file: no -wal/-journal sidecar may be left behind
+    connect_writer(staged_path, wal=False).close()
+
+    _fsync(staged_path)
+    os.replace(staged_path, db_path)
+    _fsync(db_path.parent)
+
+
+def discard(staged_path):
+    """Remove a staged copy after a failed job."""
+    Path(staged_path).unlink(missing_ok=True)
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+    target = Path(sys.argv[2]) if len(sys.argv) > 2 else DB_PATH
+    publish(Path(sys.argv[1]), target)
+    print(f"✓ Published {sys.argv[1]} as {target}")
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Offline descriptor similarity for "hard" quiz distractors.
+
+For each tasting section, scores every pair of descriptors by how often
+they're tagged on the same whiskey (cosine similarity over
+aggregated_whiskey_descriptors) plus a bonus for sharing a
+descriptor_vocabulary.category, and stores each descriptor's top
+neighbors in descriptor_neighbors (migrations/006) as a packed id array.
+The quiz corpus loads these lists so hard mode picks plausible wrong
+answers with a few list lookups per request.
+
+Run after descriptors are re-aggregated (rebuild_production.py does this).
+
+Usage:
+    python3 descriptor_similarity.py [path/to/whiskey_production.db]
+"""
+
+import math
+import sys
+from array import array
+from collections import Counter, defaultdict
+from itertools import combinations
+from pathlib import Path
+
+from db_connections import connect_writer
+
+DB_PATH = Path(__file__).parent / "databases" / "whiskey_production.db"
+
+# Neighbors kept per descriptor and section
+NEIGHBOR_COUNT = 24
+
+# Added to the co-occurrence cosine when two descriptors share a category
+CATEGORY_BONUS = 0.25
+
+
+def pack_ids(ids):
+    """Descriptor ids -> little-endian uint32 blob."""
+    packed = array('I', ids)
+    if sys.byteorder == 'big':
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def unpack_ids(blob):
+    """Inverse of pack_ids()."""
+    ids = array('I')
+    ids.frombytes(blob)
+    if sys.byteorder == 'big':
+        ids.byteswap()
+    return tuple(ids)
+
+
+def has_neighbors_table(conn):
+    """Return True if descriptor_neighbors exists in this database."""
+    row = conn.execute("""
+        SELECT 1 FROM sqlite_master
+        WHERE type = 'table' AND name = 'descriptor_neighbors'
+    """).fetchone()
+    return row is not None
+
+
+def compute_neighbors(conn, top_k=NEIGHBOR_COUNT, category_bonus=CATEGORY_BONUS):
+    """
+    Rank each descriptor's most similar descriptors per tasting section.
+
+    Returns:
+        dict: {section: {descriptor_id: [neighbor ids, most similar first]}}
+    """
+    cursor = conn.cursor()
+    cursor.execute("SELECT descriptor_id, category FROM descriptor_vocabulary")
+    categories = dict(cursor.fetchall())
+
+    cursor.execute("""
+        SELECT tasting_section, whiskey_id, descriptor_id
+        FROM aggregated_whiskey_descriptors
+    """)
+    tagged = defaultdict(lambda: defaultdict(set))  # section -> whiskey -> descriptors
+    for section, whiskey_id, descriptor_id in cursor.fetchall():
+        tagged[section][whiskey_id].add(descriptor_id)
+
+    neighbors = {}
+    for section, by_whiskey in tagged.items():
+        counts = Counter()   # descriptor -> whiskeys tagged with it
+        pairs = Counter()    # (a, b) with a < b -> whiskeys tagged with both
+        for descriptor_ids in by_whiskey.values():
+            counts.update(descriptor_ids)
+            pairs.update(combinations(sorted(descriptor_ids), 2))
+
+        scores = defaultdict(dict)
+        for (a, b), together in pairs.items():
+            score = together / math.sqrt(counts[a] * counts[b])
+            scores[a][b] = score
+            scores[b][a] = score
+
+        by_category = defaultdict(list)
+        for descriptor_id in counts:
+            by_category[categories.get(descriptor_id)].append(descriptor_id)
+        for category, members in by_category.items():
+            if category is None:
+                continue
+            for a, b in combinations(members, 2):
+                scores[a][b] = scores[a].get(b, 0.0) + category_bonus
+                scores[b][a] = scores[b].get(a, 0.0) + category_bonus
+
+        neighbors[section] = {
+            descriptor_id: [
+                other for other, _ in sorted(
+                    scores[descriptor_id].items(), key=lambda item: (-item[1], item[0])
+                )[:top_k]
+            ]
+            for descriptor_id in sorted(counts)
+        }
+
+    return neighbors
+
+
+def rebuild_descriptor_neighbors(conn, top_k=NEIGHBOR_COUNT):
+    """
+    Recompute and replace descriptor_neighbors.
+
+    Returns:
+        int or None: Rows written, or None if the table doesn't exist
+        (migration 006 not applied)
+    """
+    if not has_neighbors_table(conn):
+        return None
+
+    neighbors = compute_neighbors(conn, top_k)
+    rows = [
+        (section, descriptor_id, pack_ids(ids))
+        for section, by_descriptor in neighbors.items()
+        for descriptor_id, ids in by_descriptor.items()
+    ]
+
+    cursor = conn.cursor()
+    cursor.execute("DELETE FROM descriptor_neighbors")
+    cursor.executemany("""
+        INSERT INTO descriptor_neighbors (tasting_section, descriptor_id, neighbor_ids)
+        VALUES (?, ?, ?)
+    """, rows)
+    conn.commit()
+    return len(rows)
+
+
+def load_neighbors(conn):
+    """
+    Read descriptor_neighbors back.
+
+    Returns:
+        dict: {section: {descriptor_id: tuple of neighbor ids}}; empty if
+        the table doesn't exist
+    """
+    if not has_neighbors_table(conn):
+        return {}
+
+    neighbors = defaultdict(dict)
+    cursor = conn.execute("SELECT tasting_section, descriptor_id, neighbor_ids FROM descriptor_neighbors")
+    for section, descriptor_id, blob in cursor.fetchall():
+        neighbors[section][descriptor_id] = unpack_ids(blob)
+    return dict(neighbors)
+
+
+if __name__ == '__main__':
+    db_path = Path(sys.argv[1]) if len(sys.argv) > 1 else DB_PATH
+    conn = connect_writer(db_path, wal=False)
+    count = rebuild_descriptor_neighbors(conn)
+    conn.close()
+    if count is None:
+        print("✗ descriptor_neighbors table not found - apply migrations/006_add_descriptor_neighbors.sql first")
+        sys.exit(1)
+    print(f"✓ Stored neighbor lists for {count} descriptor/section pairs")
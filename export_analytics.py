@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+Columnar export of the review corpus for offline analytics.
+
+Streams whiskeys, reviews, review_bodies, review_descriptors and
+aggregated_whiskey_descriptors out of SQLite into compressed Parquet files
+(one directory per table, Hive-partitioned by a low-cardinality column),
+and queries them with DuckDB. Aggregates over the corpus then run
+columnar, in a separate process and file, instead of row by row against
+the database the API is serving.
+
+All tables are read in one read transaction, so the export is a consistent
+snapshot; manifest.json records its data version and row counts. Rows are
+fetched BATCH_ROWS at a time and written as Arrow record batches, so memory
+stays bounded whatever the table size.
+
+Needs pyarrow (export) and duckdb (query), which the API doesn't:
+    pip install pyarrow duckdb
+
+Usage:
+    python3 export_analytics.py export [--db path/to/db] [--out dir] [--compression zstd]
+    python3 export_analytics.py query "SELECT source_site, COUNT(*) FROM reviews GROUP BY 1"
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+from urllib.parse import quote
+
+from data_version import read_data_version
+from db_connections import connect_readonly
+from review_bodies import BODY_COLUMNS, unpack
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # optional dependency
+    pa = pq = None
+
+try:
+    import duckdb
+except ImportError:  # optional dependency
+    duckdb = None
+
+DB_PATH = Path(os.getenv('DB_PATH', Path(__file__).parent / "databases" / "whiskey_production.db"))
+EXPORT_DIR = Path(__file__).parent / "databases" / "analytics"
+
+# Table -> column its files are partitioned by (None: a single file)
+EXPORT_TABLES = {
+    'whiskeys': None,
+    'reviews': 'source_site',
+    'review_bodies': None,  # migration 010; absent tables are skipped
+    'review_descriptors': 'tasting_section',
+    'aggregated_whiskey_descriptors': 'tasting_section',
+}
+
+# Columns stored packed in SQLite and exported as plain text
+DECODED_COLUMNS = {
+    'review_bodies': BODY_COLUMNS,
+}
+
+# Rows fetched from SQLite and written per Arrow batch
+BATCH_ROWS = 50_000
+DEFAULT_COMPRESSION = 'zstd'
+
+# Hive's directory name for NULL partition values (DuckDB reads it as NULL)
+NULL_PARTITION = '__HIVE_DEFAULT_PARTITION__'
+
+
+def _require(module, package):
+    if module is None:
+        raise RuntimeError(f"{package} is not installed (pip install {package})")
+
+
+def arrow_type(declared_type):
+    """Arrow type for a SQLite column, following SQLite's type-affinity rules."""
+    declared = (declared_type or '').upper()
+    if 'INT' in declared:
+        return pa.int64()
+    if any(name in declared for name in ('CHAR', 'CLOB', 'TEXT')):
+        return pa.string()
+    if not declared or 'BLOB' in declared:
+        return pa.binary()
+    return pa.float64()  # REAL / NUMERIC affinity
+
+
+def table_schema(conn, table):
+    """Arrow schema for every column of a SQLite table, in table order."""
+    return pa.schema([
+        pa.field(name, arrow_type(declared))
+        for _, name, declared, *_ in conn.execute(f"PRAGMA table_info({table})")
+    ])
+
+
+def partition_dir(column, value):
+    """Hive-style directory name, e.g. source_site=Breaking Bourbon."""
+    if value is None:
+        return f"{column}={NULL_PARTITION}"
+    return f"{column}={quote(str(value), safe=' ')}"
+
+
+def export_table(conn, table, out_dir, partition_by=None,
+                 compression=DEFAULT_COMPRESSION, batch_rows=BATCH_ROWS, decode=()):
+    """
+    Write one table to <out_dir>/<table>/ as Parquet.
+
+    The partition column is stored in the directory names, not the files.
+    The table is written to a temporary directory first and renamed into
+    place, so readers never see a half-written table. Columns named in
+    decode are decompressed (review_bodies.unpack) on the way out.
+
+    Returns:
+        dict: Row count, file count and bytes written
+    """
+    schema = table_schema(conn, table)
+    if partition_by is not None and partition_by not in schema.names:
+        partition_by = None  # older schema; export unpartitioned
+    file_schema = schema.remove(schema.get_field_index(partition_by)) if partition_by else schema
+
+    final_dir = Path(out_dir) / table
+    work_dir = Path(out_dir) / f".{table}.tmp"
+    shutil.rmtree(work_dir, ignore_errors=True)
+    work_dir.mkdir(parents=True)
+
+    writers = {}
+
+    def writer_for(value):
+        if value not in writers:
+            directory = work_dir / partition_dir(partition_by, value) if partition_by else work_dir
+            directory.mkdir(exist_ok=True)
+            writers[value] = pq.ParquetWriter(directory / "part-0.parquet", file_schema,
+                                              compression=compression)
+        return writers[value]
+
+    key_index = schema.get_field_index(partition_by) if partition_by else None
+    decode_indexes = {index for index, name in enumerate(file_schema.names) if name in decode}
+    cursor = conn.execute(f"SELECT {', '.join(schema.names)} FROM {table} ORDER BY rowid")
+    rows_written = 0
+    try:
+        while True:
+            rows = cursor.fetchmany(batch_rows)
+            if not rows:
+                break
+            groups = defaultdict(list)
+            for row in rows:
+                groups[row[key_index] if key_index is not None else None].append(row)
+            for value, group in groups.items():
+                columns = list(zip(*group))
+                if key_index is not None:
+                    del columns[key_index]
+                for index in decode_indexes:
+                    columns[index] = [unpack(value) for value in columns[index]]
+                batch = pa.record_batch(
+                    [pa.array(column, type=field.type) for column, field in zip(columns, file_schema)],
+                    schema=file_schema,
+                )
+                writer_for(value).write_batch(batch)
+            rows_written += len(rows)
+        if not writers:
+            writer_for(None)  # empty table: one file, so the schema is still queryable
+    finally:
+        for writer in writers.values():
+            writer.close()
+
+    shutil.rmtree(final_dir, ignore_errors=True)
+    work_dir.rename(final_dir)
+    files = list(final_dir.rglob("*.parquet"))
+    return {
+        'rows': rows_written,
+        'partition_by': partition_by,
+        'files': len(files),
+        'bytes': sum(path.stat().st_size for path in files),
+    }
+
+
+def export_analytics(db_path=DB_PATH, out_dir=EXPORT_DIR, compression=DEFAULT_COMPRESSION,
+                     batch_rows=BATCH_ROWS, tables=EXPORT_TABLES):
+    """
+    Export the corpus tables to Parquet and write <out_dir>/manifest.json.
+
+    Returns:
+        dict: The manifest (data version, export time, per-table stats)
+    """
+    _require(pa, 'pyarrow')
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    started = time.perf_counter()
+    conn = connect_readonly(db_path, row_factory=None)
+    try:
+        conn.execute("BEGIN")  # one snapshot for every table
+        present = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        manifest = {
+            'source': str(db_path),
+            'data_version': read_data_version(conn),
+            'exported_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'compression': compression,
+            'tables': {
+                table: export_table(conn, table, out_dir, partition_by, compression, batch_rows,
+                                    DECODED_COLUMNS.get(table, ()))
+                for table, partition_by in tables.items() if table in present
+            },
+        }
+        conn.rollback()
+    finally:
+        conn.close()
+
+    manifest['seconds'] = round(time.perf_counter() - started, 3)
+    (out_dir / "manifest.json").write_text(json.dumps(manifest, indent=2) + "\n")
+    return manifest
+
+
+def connect_analytics(export_dir=EXPORT_DIR):
+    """
+    In-memory DuckDB connection with one view per exported table.
+
+    Views have the SQLite table names, so existing report SQL mostly runs
+    unchanged; partition columns come back from the directory names.
+    """
+    _require(duckdb, 'duckdb')
+    export_dir = Path(export_dir)
+    manifest_path = export_dir / "manifest.json"
+    if not manifest_path.exists():
+        raise FileNotFoundError(f"No export at {export_dir}; run: python3 export_analytics.py export")
+    manifest = json.loads(manifest_path.read_text())
+
+    conn = duckdb.connect()
+    for table, stats in manifest['tables'].items():
+        pattern = str(export_dir / table / ("**/*.parquet" if stats['partition_by'] else "*.parquet"))
+        conn.execute(f"""
+            CREATE VIEW {table} AS
+            SELECT * FROM read_parquet('{pattern.replace("'", "''")}',
+                                       hive_partitioning = {'true' if stats['partition_by'] else 'false'},
+                                       hive_types_autocast = false)
+        """)
+    return conn
+
+
+def query(sql, params=None, export_dir=EXPORT_DIR):
+    """
+    Run one query against the export.
+
+    Returns:
+        pyarrow.Table: The result, handed over by DuckDB as Arrow without
+        converting it to Python rows
+    """
+    conn = connect_analytics(export_dir)
+    try:
+        result = conn.execute(sql, params or []).arrow()
+        # duckdb >= 1.4 returns a RecordBatchReader here, older versions a Table
+        return result.read_all() if hasattr(result, 'read_all') else result
+    finally:
+        conn.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    export = commands.add_parser('export', help='write the Parquet export')
+    export.add_argument('--db', type=Path, default=DB_PATH)
+    export.add_argument('--out', type=Path, default=EXPORT_DIR)
+    export.add_argument('--compression', default=DEFAULT_COMPRESSION,
+                        choices=('zstd', 'snappy', 'gzip', 'none'))
+    export.add_argument('--batch-rows', type=int, default=BATCH_ROWS)
+
+    run = commands.add_parser('query', help='run SQL against the export with DuckDB')
+    run.add_argument('sql')
+    run.add_argument('--out', type=Path, default=EXPORT_DIR, help='export directory')
+
+    args = parser.parse_args(argv)
+    try:
+        if args.command == 'export':
+            manifest = export_analytics(args.db, args.out, args.compression, args.batch_rows)
+            print(f"✓ Exported {args.db} (data version {manifest['data_version']}) "
+                  f"to {args.out} in {manifest['seconds']}s")
+            for table, stats in manifest['tables'].items():
+                print(f"  {table}: {stats['rows']} rows, {stats['files']} file(s), "
+                      f"{stats['bytes'] / 1024:.1f} KiB")
+        else:
+            result = query(args.sql, export_dir=args.out)
+            print("\t".join(result.column_names))
+            for row in result.to_pylist():
+                print("\t".join("" if value is None else str(value) for value in row.values()))
+    except (RuntimeError, FileNotFoundError) as e:
+        print(f"✗ {e}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
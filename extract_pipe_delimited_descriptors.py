@@ -4,8 +4,8 @@ Auto-extract descriptors from pipe-delimited reviews
 Replaces manual tagging approach for Type A reviews
 """
 
-import sqlite3
 from pathlib import Path
+from db_connections import connect_readonly
 import re
 
 SOURCE_DB = Path("databases/whiskey_reviews.db")
@@ -51,7 +51,7 @@ def extract_descriptors_from_text(text):
 
 def analyze_extraction():
     """Analyze what descriptors we can extract"""
-    conn = sqlite3.connect(SOURCE_DB)
+    conn = connect_readonly(SOURCE_DB, row_factory=None)
     cursor = conn.cursor()
 
     # Get all pipe-delimited reviews
@@ -108,7 +108,7 @@ def analyze_extraction():
 
 def find_whiskeys_with_most_reviews():
     """Find whiskeys that have multiple pipe-delimited reviews"""
-    conn = sqlite3.connect(SOURCE_DB)
+    conn = connect_readonly(SOURCE_DB, row_factory=None)
     cursor = conn.cursor()
 
     cursor.execute("""
@@ -11,10 +11,12 @@ Strategy:
 - Confidence scoring for manual review flagging
 """
 
-import sqlite3
 import re
 from typing import List, Dict, Tuple
 
+from db_connections import connect_readonly, connect_writer
+from review_bodies import attach_review_texts
+
 
 class ProseDescriptorExtractor:
     """Extract descriptors from prose reviews conservatively."""
@@ -39,12 +41,13 @@ class ProseDescriptorExtractor:
 
     def __init__(self, db_path: str, vocab_db_path: str = None):
         """Initialize with database connection."""
-        self.db = sqlite3.connect(db_path)
+        self.db = connect_writer(db_path, wal=False)
         self.cursor = self.db.cursor()
+        attach_review_texts(self.db)
 
         # Use separate vocab database if provided
         if vocab_db_path:
-            self.vocab_db = sqlite3.connect(vocab_db_path)
+            self.vocab_db = connect_readonly(vocab_db_path, row_factory=None)
             self.vocab_cursor = self.vocab_db.cursor()
         else:
             self.vocab_db = self.db
@@ -281,7 +284,7 @@ class ProseDescriptorExtractor:
                 nose_text,
                 palate_text,
                 finish_text
-            FROM reviews
+            FROM review_texts
             WHERE nose_text NOT LIKE '%|%'
             AND nose_text IS NOT NULL
         """)
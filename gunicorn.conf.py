@@ -0,0 +1,33 @@
+"""
+Gunicorn configuration for the API (Procfile: gunicorn app:app -c gunicorn.conf.py)
+
+With preload_app the master imports app.py once, which loads the quiz
+corpus, autocomplete index and distilleries payload (warm_snapshots), then
+freezes them (app.prepare_for_fork) before forking. Workers share those
+pages copy-on-write instead of each building its own copy; compare with
+benchmarks/memory_report.py.
+
+Environment:
+    WEB_CONCURRENCY=2     # worker processes
+    PRELOAD_APP=1         # 0 = import the app separately in every worker
+"""
+
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+workers = int(os.getenv('WEB_CONCURRENCY', 2))
+preload_app = os.getenv('PRELOAD_APP', '1') != '0'
+
+
+def when_ready(server):
+    """Master is about to spawn the first workers."""
+    if preload_app:
+        import app
+        app.prepare_for_fork()
+
+
+def post_fork(server, worker):
+    """Runs in each new worker."""
+    if preload_app:
+        import app
+        app.reinit_after_fork()
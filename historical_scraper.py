@@ -30,10 +30,11 @@ from database import (
     get_connection,
     create_database,
     insert_review,
-    check_duplicate_review,
+    load_review_urls,
     log_scraper_run,
     normalize_url
 )
+from db_connections import checkpoint
 from scrapers.breaking_bourbon import BreakingBourbonScraper
 
 
@@ -357,14 +358,9 @@ def filter_new_urls(all_urls: List[str], logger: logging.Logger) -> List[str]:
     logger.info(f"Filtering {len(all_urls)} URLs against database...")
     
     conn = get_connection()
-    cursor = conn.cursor()
     
     # Get all existing normalized URLs in one query
-    cursor.execute("""
-        SELECT normalized_url FROM reviews 
-        WHERE source_site = 'Breaking Bourbon'
-    """)
-    existing_urls = {row[0] for row in cursor.fetchall() if row[0]}
+    existing_urls = load_review_urls(conn, 'Breaking Bourbon')
     
     logger.info(f"Found {len(existing_urls)} existing reviews in database")
     
@@ -406,6 +402,8 @@ def scrape_reviews(urls: List[str], config: Dict, logger: logging.Logger) -> Dic
     scraper = BreakingBourbonScraper()
     conn = get_connection()
     source_site = scraper.SOURCE_NAME
+    # One query for the run; each URL is then a set lookup before fetching
+    known_urls = load_review_urls(conn, source_site)
     
     # Load progress
     progress = load_progress()
@@ -441,7 +439,7 @@ def scrape_reviews(urls: List[str], config: Dict, logger: logging.Logger) -> Dic
             try:
                 # Check for duplicate before scraping
                 normalized_url = normalize_url(url)
-                if check_duplicate_review(conn, source_site, normalized_url):
+                if normalized_url in known_urls:
                     logger.info(f"  Duplicate - already in database")
                     successful_scrapes += 1
                     success = True
@@ -462,8 +460,9 @@ def scrape_reviews(urls: List[str], config: Dict, logger: logging.Logger) -> Dic
                         failed_urls.append(url)
                         break
                 
-                # Insert into database
+                # Insert into database (the insert itself also rejects duplicates)
                 review_id = insert_review(conn, review_data)
+                known_urls.add(normalized_url)
                 
                 if review_id:
                     successful_scrapes += 1
@@ -538,6 +537,8 @@ def scrape_reviews(urls: List[str], config: Dict, logger: logging.Logger) -> Dic
         if success:
             time.sleep(rate_limit)
     
+    # Fold the scrape's writes back into the database file so the WAL stays small
+    checkpoint(conn)
     conn.close()
     return {
         'status': 'success' if not failed_urls else 'partial',
@@ -4,8 +4,8 @@ Match extracted text against our 74-descriptor vocabulary
 Uses fuzzy matching to handle variations
 """
 
-import sqlite3
 from pathlib import Path
+from db_connections import connect_readonly
 from descriptor_vocabulary import DESCRIPTORS
 
 SOURCE_DB = Path("databases/whiskey_reviews.db")
@@ -47,7 +47,7 @@ def match_descriptors_in_text(text):
 
 def test_matching():
     """Test the matching logic on real examples"""
-    conn = sqlite3.connect(SOURCE_DB)
+    conn = connect_readonly(SOURCE_DB, row_factory=None)
     cursor = conn.cursor()
 
     cursor.execute("""
@@ -0,0 +1,226 @@
+"""
+In-process request and SQL metrics for the Flask API.
+
+Each worker keeps per-endpoint latency histograms, in-flight gauges,
+response counters and SQL statement counts/time, rendered in the
+Prometheus text format by /api/metrics. Recording a request costs a couple
+of perf_counter() calls and dict lookups, so it stays on in production.
+
+SQL statements are counted with sqlite3's trace callback on the pooled
+connections (see instrumented_connect); SQL time is the time spent inside
+cursor execute()/fetch calls on those connections.
+"""
+
+import sqlite3
+import threading
+import time
+from bisect import bisect_left
+
+from db_connections import connect_readonly
+
+# Request latency buckets (seconds)
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+# SQL statements per request buckets - a climbing tail means an N+1 query
+SQL_STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 10, 25, 50, 100)
+
+METRIC_PREFIX = "whiskey_api"
+
+
+class Histogram:
+    """Fixed-bucket histogram (counts stored per bucket, cumulated on render)."""
+
+    __slots__ = ('bounds', 'counts', 'total', 'count')
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # last slot is +Inf
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def cumulative(self):
+        """(upper bound label, cumulative count) pairs ending with +Inf."""
+        running = 0
+        for bound, count in zip(self.bounds + ('+Inf',), self.counts):
+            running += count
+            yield bound, running
+
+
+class EndpointMetrics:
+    """Everything recorded for one Flask endpoint."""
+
+    __slots__ = ('latency', 'sql_per_request', 'in_flight', 'responses',
+                 'sql_statements', 'sql_seconds')
+
+    def __init__(self):
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.sql_per_request = Histogram(SQL_STATEMENT_BUCKETS)
+        self.in_flight = 0
+        self.responses = {}  # status code -> count
+        self.sql_statements = 0
+        self.sql_seconds = 0.0
+
+
+class _SQLCounters(threading.local):
+    """Per-thread SQL usage for the request currently being served."""
+    statements = 0
+    seconds = 0.0
+
+
+sql_counters = _SQLCounters()
+
+
+def _count_statement(statement):
+    """
+    sqlite3 trace callback: one call per statement executed.
+
+    Sub-statements run on our behalf (triggers, FTS5 shadow-table reads) are
+    reported with a leading "--" and aren't counted.
+    """
+    if not statement.startswith('--'):
+        sql_counters.statements += 1
+
+
+class TimedCursor(sqlite3.Cursor):
+    """Cursor that adds the time spent stepping SQLite to sql_counters."""
+
+    def execute(self, *args):
+        start = time.perf_counter()
+        try:
+            return super().execute(*args)
+        finally:
+            sql_counters.seconds += time.perf_counter() - start
+
+    def executemany(self, *args):
+        start = time.perf_counter()
+        try:
+            return super().executemany(*args)
+        finally:
+            sql_counters.seconds += time.perf_counter() - start
+
+    def fetchone(self):
+        start = time.perf_counter()
+        try:
+            return super().fetchone()
+        finally:
+            sql_counters.seconds += time.perf_counter() - start
+
+    def fetchmany(self, *args):
+        start = time.perf_counter()
+        try:
+            return super().fetchmany(*args)
+        finally:
+            sql_counters.seconds += time.perf_counter() - start
+
+    def fetchall(self):
+        start = time.perf_counter()
+        try:
+            return super().fetchall()
+        finally:
+            sql_counters.seconds += time.perf_counter() - start
+
+
+class TimedConnection(sqlite3.Connection):
+    """Connection whose cursors (including conn.execute()) are TimedCursors."""
+
+    def cursor(self, factory=TimedCursor):
+        return super().cursor(factory)
+
+    def execute(self, *args):
+        return self.cursor().execute(*args)
+
+
+def instrumented_connect(db_path):
+    """connect_readonly() with statement tracing and SQL timing enabled."""
+    conn = connect_readonly(db_path, factory=TimedConnection)
+    conn.set_trace_callback(_count_statement)
+    return conn
+
+
+class MetricsRegistry:
+    """Per-worker store of EndpointMetrics, keyed by Flask endpoint name."""
+
+    def __init__(self):
+        self.endpoints = {}
+        self.started_at = time.time()
+        self._lock = threading.Lock()
+
+    def _endpoint(self, endpoint):
+        metrics = self.endpoints.get(endpoint)
+        if metrics is None:
+            with self._lock:
+                metrics = self.endpoints.setdefault(endpoint, EndpointMetrics())
+        return metrics
+
+    def request_started(self, endpoint):
+        """Mark a request in flight and reset this thread's SQL counters."""
+        sql_counters.statements = 0
+        sql_counters.seconds = 0.0
+        metrics = self._endpoint(endpoint)
+        with self._lock:
+            metrics.in_flight += 1
+
+    def request_finished(self, endpoint, status, seconds):
+        """Record a finished request (call exactly once per request_started)."""
+        metrics = self._endpoint(endpoint)
+        statements = sql_counters.statements
+        sql_seconds = sql_counters.seconds
+        with self._lock:
+            metrics.in_flight -= 1
+            metrics.latency.observe(seconds)
+            metrics.sql_per_request.observe(statements)
+            metrics.responses[status] = metrics.responses.get(status, 0) + 1
+            metrics.sql_statements += statements
+            metrics.sql_seconds += sql_seconds
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format (version 0.0.4)."""
+        with self._lock:
+            endpoints = sorted(self.endpoints.items())
+            lines = []
+
+            def family(name, kind, help_text):
+                lines.append(f"# HELP {METRIC_PREFIX}_{name} {help_text}")
+                lines.append(f"# TYPE {METRIC_PREFIX}_{name} {kind}")
+
+            def histogram(name, attribute):
+                for endpoint, metrics in endpoints:
+                    hist = getattr(metrics, attribute)
+                    for bound, count in hist.cumulative():
+                        lines.append(f'{METRIC_PREFIX}_{name}_bucket'
+                                     f'{{endpoint="{endpoint}",le="{bound}"}} {count}')
+                    lines.append(f'{METRIC_PREFIX}_{name}_sum{{endpoint="{endpoint}"}} {hist.total}')
+                    lines.append(f'{METRIC_PREFIX}_{name}_count{{endpoint="{endpoint}"}} {hist.count}')
+
+            family("request_duration_seconds", "histogram", "Request latency by endpoint")
+            histogram("request_duration_seconds", "latency")
+
+            family("requests_in_flight", "gauge", "Requests currently being served")
+            for endpoint, metrics in endpoints:
+                lines.append(f'{METRIC_PREFIX}_requests_in_flight{{endpoint="{endpoint}"}} {metrics.in_flight}')
+
+            family("responses_total", "counter", "Responses by endpoint and status code")
+            for endpoint, metrics in endpoints:
+                for status, count in sorted(metrics.responses.items()):
+                    lines.append(f'{METRIC_PREFIX}_responses_total'
+                                 f'{{endpoint="{endpoint}",status="{status}"}} {count}')
+
+            family("sql_statements_per_request", "histogram", "SQL statements executed per request")
+            histogram("sql_statements_per_request", "sql_per_request")
+
+            family("sql_statements_total", "counter", "SQL statements executed")
+            for endpoint, metrics in endpoints:
+                lines.append(f'{METRIC_PREFIX}_sql_statements_total{{endpoint="{endpoint}"}} {metrics.sql_statements}')
+
+            family("sql_duration_seconds_total", "counter", "Time spent executing SQL")
+            for endpoint, metrics in endpoints:
+                lines.append(f'{METRIC_PREFIX}_sql_duration_seconds_total{{endpoint="{endpoint}"}} {metrics.sql_seconds}')
+
+        family("process_start_time_seconds", "gauge", "Worker start time (unix seconds)")
+        lines.append(f"{METRIC_PREFIX}_process_start_time_seconds {self.started_at}")
+        return "\n".join(lines) + "\n"
@@ -2,13 +2,16 @@
 Script to add distillery_mappings to Railway production database
 Run this directly on Railway to update the production database
 """
-import sqlite3
 import os
 
+from create_distillery_mappings import refresh_canonical_distilleries
+from data_version import bump_data_version
+from db_connections import connect_writer
+
 DB_PATH = 'databases/whiskey_production.db'
 
 def main():
-    conn = sqlite3.connect(DB_PATH)
+    conn = connect_writer(DB_PATH, wal=False)
     cursor = conn.cursor()
     
     # Check if table already exists
@@ -138,9 +141,13 @@ def main():
     
     rows_inserted = cursor.rowcount
     conn.commit()
+    updated = refresh_canonical_distilleries(conn)
+    bump_data_version(conn)
     conn.close()
     
     print(f"✓ Inserted {rows_inserted} mappings")
+    if updated is not None:
+        print(f"✓ Refreshed canonical distillery on {updated} whiskeys")
     print("✓ Migration complete!")
 
 if __name__ == '__main__':
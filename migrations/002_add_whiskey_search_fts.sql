@@ -0,0 +1,114 @@
+-- Migration 002: Add FTS5 Search Index
+-- Date: 2026-10-17
+-- Target: databases/whiskey_production.db
+-- Purpose: Full-text (trigram) index over whiskey name + canonical distillery
+--          so /api/whiskeys/search no longer does LIKE '%q%' full scans.
+--          Triggers keep the index in sync with whiskeys and distillery_mappings.
+-- Requires: SQLite 3.34+ (trigram tokenizer)
+
+PRAGMA foreign_keys = ON;
+
+-- distillery_mappings is normally created by create_distillery_mappings.py;
+-- make sure it exists so the triggers below can reference it
+CREATE TABLE IF NOT EXISTS distillery_mappings (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    variant_name TEXT NOT NULL UNIQUE,
+    canonical_name TEXT NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    notes TEXT
+);
+
+-- ============================================================================
+-- PART 1: Create the search index
+-- ============================================================================
+
+-- rowid = whiskeys.whiskey_id
+-- distillery = COALESCE(distillery_mappings.canonical_name, whiskeys.distillery)
+CREATE VIRTUAL TABLE whiskey_search USING fts5(
+    name,
+    distillery,
+    tokenize = 'trigram'
+);
+
+INSERT INTO whiskey_search (rowid, name, distillery)
+SELECT w.whiskey_id, w.name, COALESCE(dm.canonical_name, w.distillery)
+FROM whiskeys w
+LEFT JOIN distillery_mappings dm ON w.distillery = dm.variant_name;
+
+-- ============================================================================
+-- PART 2: Keep it in sync with whiskeys
+-- ============================================================================
+
+CREATE TRIGGER whiskey_search_ai AFTER INSERT ON whiskeys
+BEGIN
+    INSERT INTO whiskey_search (rowid, name, distillery)
+    VALUES (
+        NEW.whiskey_id,
+        NEW.name,
+        COALESCE(
+            (SELECT canonical_name FROM distillery_mappings WHERE variant_name = NEW.distillery),
+            NEW.distillery
+        )
+    );
+END;
+
+CREATE TRIGGER whiskey_search_au AFTER UPDATE OF name, distillery ON whiskeys
+BEGIN
+    DELETE FROM whiskey_search WHERE rowid = OLD.whiskey_id;
+    INSERT INTO whiskey_search (rowid, name, distillery)
+    VALUES (
+        NEW.whiskey_id,
+        NEW.name,
+        COALESCE(
+            (SELECT canonical_name FROM distillery_mappings WHERE variant_name = NEW.distillery),
+            NEW.distillery
+        )
+    );
+END;
+
+CREATE TRIGGER whiskey_search_ad AFTER DELETE ON whiskeys
+BEGIN
+    DELETE FROM whiskey_search WHERE rowid = OLD.whiskey_id;
+END;
+
+-- ============================================================================
+-- PART 3: Keep it in sync with distillery_mappings
+-- ============================================================================
+
+CREATE TRIGGER whiskey_search_dm_ai AFTER INSERT ON distillery_mappings
+BEGIN
+    UPDATE whiskey_search SET distillery = NEW.canonical_name
+    WHERE rowid IN (SELECT whiskey_id FROM whiskeys WHERE distillery = NEW.variant_name);
+END;
+
+CREATE TRIGGER whiskey_search_dm_au AFTER UPDATE ON distillery_mappings
+BEGIN
+    UPDATE whiskey_search SET distillery = OLD.variant_name
+    WHERE rowid IN (SELECT whiskey_id FROM whiskeys WHERE distillery = OLD.variant_name);
+    UPDATE whiskey_search SET distillery = NEW.canonical_name
+    WHERE rowid IN (SELECT whiskey_id FROM whiskeys WHERE distillery = NEW.variant_name);
+END;
+
+CREATE TRIGGER whiskey_search_dm_ad AFTER DELETE ON distillery_mappings
+BEGIN
+    UPDATE whiskey_search SET distillery = OLD.variant_name
+    WHERE rowid IN (SELECT whiskey_id FROM whiskeys WHERE distillery = OLD.variant_name);
+END;
+
+-- ============================================================================
+-- PART 4: Record migration
+-- ============================================================================
+
+INSERT INTO migrations (migration_name, description)
+VALUES ('002_add_whiskey_search_fts', 'Add whiskey_search FTS5 trigram index with sync triggers');
+
+-- ============================================================================
+-- Verification Queries
+-- ============================================================================
+
+-- Row counts should match:
+-- SELECT (SELECT COUNT(*) FROM whiskeys), (SELECT COUNT(*) FROM whiskey_search);
+
+-- Sample search:
+-- SELECT rowid, name, distillery FROM whiskey_search
+-- WHERE whiskey_search MATCH '"garrison"' ORDER BY rank LIMIT 5;
@@ -0,0 +1,95 @@
+-- Migration 003: Materialize Canonical Distillery
+-- Date: 2026-10-17
+-- Target: databases/whiskey_production.db
+-- Purpose: Store COALESCE(distillery_mappings.canonical_name, whiskeys.distillery)
+--          on each whiskey so /api/distilleries can GROUP BY an indexed column
+--          instead of re-joining distillery_mappings on every request.
+--          Triggers keep the column current when whiskeys or mappings change.
+
+PRAGMA foreign_keys = ON;
+
+CREATE TABLE IF NOT EXISTS distillery_mappings (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    variant_name TEXT NOT NULL UNIQUE,
+    canonical_name TEXT NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    notes TEXT
+);
+
+-- ============================================================================
+-- PART 1: Add and backfill the column
+-- ============================================================================
+
+ALTER TABLE whiskeys ADD COLUMN canonical_distillery TEXT;
+
+UPDATE whiskeys
+SET canonical_distillery = COALESCE(
+    (SELECT canonical_name FROM distillery_mappings WHERE variant_name = whiskeys.distillery),
+    distillery
+);
+
+CREATE INDEX idx_whiskeys_canonical_distillery ON whiskeys(canonical_distillery);
+
+-- ============================================================================
+-- PART 2: Keep it in sync with whiskeys
+-- ============================================================================
+
+CREATE TRIGGER whiskeys_canonical_distillery_ai AFTER INSERT ON whiskeys
+BEGIN
+    UPDATE whiskeys
+    SET canonical_distillery = COALESCE(
+        (SELECT canonical_name FROM distillery_mappings WHERE variant_name = NEW.distillery),
+        NEW.distillery
+    )
+    WHERE whiskey_id = NEW.whiskey_id;
+END;
+
+CREATE TRIGGER whiskeys_canonical_distillery_au AFTER UPDATE OF distillery ON whiskeys
+BEGIN
+    UPDATE whiskeys
+    SET canonical_distillery = COALESCE(
+        (SELECT canonical_name FROM distillery_mappings WHERE variant_name = NEW.distillery),
+        NEW.distillery
+    )
+    WHERE whiskey_id = NEW.whiskey_id;
+END;
+
+-- ============================================================================
+-- PART 3: Keep it in sync with distillery_mappings
+-- ============================================================================
+
+CREATE TRIGGER distillery_mappings_canonical_ai AFTER INSERT ON distillery_mappings
+BEGIN
+    UPDATE whiskeys SET canonical_distillery = NEW.canonical_name
+    WHERE distillery = NEW.variant_name;
+END;
+
+CREATE TRIGGER distillery_mappings_canonical_au AFTER UPDATE ON distillery_mappings
+BEGIN
+    UPDATE whiskeys SET canonical_distillery = distillery
+    WHERE distillery = OLD.variant_name;
+    UPDATE whiskeys SET canonical_distillery = NEW.canonical_name
+    WHERE distillery = NEW.variant_name;
+END;
+
+CREATE TRIGGER distillery_mappings_canonical_ad AFTER DELETE ON distillery_mappings
+BEGIN
+    UPDATE whiskeys SET canonical_distillery = distillery
+    WHERE distillery = OLD.variant_name;
+END;
+
+-- ============================================================================
+-- PART 4: Record migration
+-- ============================================================================
+
+INSERT INTO migrations (migration_name, description)
+VALUES ('003_add_canonical_distillery', 'Add materialized whiskeys.canonical_distillery with index and sync triggers');
+
+-- ============================================================================
+-- Verification Queries
+-- ============================================================================
+
+-- Should return 0:
+-- SELECT COUNT(*) FROM whiskeys w
+-- LEFT JOIN distillery_mappings dm ON w.distillery = dm.variant_name
+-- WHERE w.canonical_distillery IS NOT COALESCE(dm.canonical_name, w.distillery);
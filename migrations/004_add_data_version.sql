@@ -0,0 +1,16 @@
+-- Migration 004: Add Data Version Marker
+-- Date: 2026-10-17
+-- Target: databases/whiskey_production.db
+-- Purpose: Single-row counter bumped whenever served data changes
+--          (see data_version.py). The API derives ETags from it.
+
+CREATE TABLE IF NOT EXISTS data_version (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    version INTEGER NOT NULL,
+    updated_at TEXT NOT NULL DEFAULT (datetime('now'))
+);
+
+INSERT OR IGNORE INTO data_version (id, version) VALUES (1, 1);
+
+INSERT INTO migrations (migration_name, description)
+VALUES ('004_add_data_version', 'Add data_version marker table for HTTP cache validation');
@@ -0,0 +1,16 @@
+-- Migration 005: Persisted Whiskey Slugs
+-- Date: 2026-10-17
+-- Target: databases/whiskey_production.db
+-- Purpose: Store each whiskey's URL slug so search responses don't re-run
+--          create_slug() per row and GET /api/whiskeys/<slug> resolves with
+--          one index lookup. Slugs need Python's regex rules and collision
+--          suffixing, so run_migration.py fills them in (slugs.backfill_slugs)
+--          right after this script; `python3 slugs.py` does the same by hand.
+
+ALTER TABLE whiskeys ADD COLUMN slug TEXT;
+
+-- NULLs don't collide, so the index can exist before the backfill runs
+CREATE UNIQUE INDEX IF NOT EXISTS idx_whiskeys_slug ON whiskeys(slug);
+
+INSERT INTO migrations (migration_name, description)
+VALUES ('005_add_whiskey_slugs', 'Add whiskeys.slug with unique index for slug lookups');
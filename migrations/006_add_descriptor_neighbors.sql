@@ -0,0 +1,17 @@
+-- Migration 006: Descriptor Neighbor Lists
+-- Date: 2026-10-17
+-- Target: databases/whiskey_production.db
+-- Purpose: Precomputed "most similar descriptors" per tasting section
+--          (co-occurrence on the same whiskey + same category), used for
+--          hard-mode quiz distractors. Filled by descriptor_similarity.py,
+--          which run_migration.py and rebuild_production.py call.
+
+CREATE TABLE IF NOT EXISTS descriptor_neighbors (
+    tasting_section TEXT NOT NULL,
+    descriptor_id INTEGER NOT NULL,
+    neighbor_ids BLOB NOT NULL,  -- little-endian uint32 descriptor ids, most similar first
+    PRIMARY KEY (tasting_section, descriptor_id)
+) WITHOUT ROWID;
+
+INSERT INTO migrations (migration_name, description)
+VALUES ('006_add_descriptor_neighbors', 'Add descriptor_neighbors for hard-mode quiz distractors');
@@ -0,0 +1,52 @@
+-- Migration 007: Indexed Whiskey Match Keys
+-- Date: 2026-10-17
+-- Target: databases/whiskey_production.db
+-- Purpose: Store database.whiskey_match_key(name, distillery) on each whiskey
+--          with a unique index, so find_whiskey() and insert_reviews_bulk()
+--          resolve whiskeys with an index probe instead of scanning
+--          LOWER(name) / LOWER(distillery) on every ingested review.
+--          run_migration.py fills them in (database.backfill_match_keys)
+--          right after this script. The triggers cover writers that don't
+--          set the key.
+
+ALTER TABLE whiskeys ADD COLUMN match_key TEXT;
+
+-- NULLs don't collide, so the index can exist before the backfill runs
+CREATE UNIQUE INDEX IF NOT EXISTS idx_whiskeys_match_key ON whiskeys(match_key);
+
+-- Key for rows inserted or renamed outside database.py, normalized like
+-- database.normalize_string(): tabs/newlines become spaces, then lowercase,
+-- trim, and collapse runs of spaces (each space gets a char(1) marker and a
+-- marker followed by a space is dropped, leaving one space per run). An
+-- empty name has no key. Only ASCII letters are lowercased, as SQLite's
+-- LOWER() does. OR IGNORE leaves duplicates NULL rather than failing the
+-- write.
+CREATE TRIGGER IF NOT EXISTS whiskeys_match_key_ai AFTER INSERT ON whiskeys
+WHEN NEW.match_key IS NULL
+BEGIN
+    UPDATE OR IGNORE whiskeys
+    SET match_key = NULLIF(REPLACE(REPLACE(REPLACE(LOWER(TRIM(
+                 REPLACE(REPLACE(REPLACE(NEW.name, char(9), ' '), char(10), ' '), char(13), ' ')
+             )), ' ', ' ' || char(1)), char(1) || ' ', ''), char(1), ''), '')
+        || '|' || REPLACE(REPLACE(REPLACE(LOWER(TRIM(
+                 REPLACE(REPLACE(REPLACE(COALESCE(NEW.distillery, ''), char(9), ' '), char(10), ' '), char(13), ' ')
+             )), ' ', ' ' || char(1)), char(1) || ' ', ''), char(1), '')
+    WHERE whiskey_id = NEW.whiskey_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS whiskeys_match_key_au AFTER UPDATE OF name, distillery ON whiskeys
+BEGIN
+    -- Drop the old key first so a rename never leaves it behind
+    UPDATE whiskeys SET match_key = NULL WHERE whiskey_id = NEW.whiskey_id;
+    UPDATE OR IGNORE whiskeys
+    SET match_key = NULLIF(REPLACE(REPLACE(REPLACE(LOWER(TRIM(
+                 REPLACE(REPLACE(REPLACE(NEW.name, char(9), ' '), char(10), ' '), char(13), ' ')
+             )), ' ', ' ' || char(1)), char(1) || ' ', ''), char(1), ''), '')
+        || '|' || REPLACE(REPLACE(REPLACE(LOWER(TRIM(
+                 REPLACE(REPLACE(REPLACE(COALESCE(NEW.distillery, ''), char(9), ' '), char(10), ' '), char(13), ' ')
+             )), ' ', ' ' || char(1)), char(1) || ' ', ''), char(1), '')
+    WHERE whiskey_id = NEW.whiskey_id;
+END;
+
+INSERT INTO migrations (migration_name, description)
+VALUES ('007_add_whiskey_match_keys', 'Add whiskeys.match_key with unique index for ingest lookups');
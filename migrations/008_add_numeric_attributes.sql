@@ -0,0 +1,30 @@
+-- Migration 008: Typed Age / Proof / Price Columns
+-- Date: 2026-10-17
+-- Target: databases/whiskey_production.db
+-- Purpose: Numeric age_months, proof_numeric and price_usd next to the
+--          free-text age, proof and price on whiskeys and reviews, indexed
+--          so /api/whiskeys/search can filter by range without parsing
+--          strings row by row. Values come from the scraper's parsers
+--          (utils.parse_age / parse_proof / parse_price), so they are filled
+--          in by the chunked Python migration that follows
+--          (009_backfill_numeric_attributes.py); new reviews get them at
+--          ingest.
+
+ALTER TABLE whiskeys ADD COLUMN age_months REAL;
+ALTER TABLE whiskeys ADD COLUMN proof_numeric REAL;
+ALTER TABLE whiskeys ADD COLUMN price_usd REAL;
+
+ALTER TABLE reviews ADD COLUMN age_months REAL;
+ALTER TABLE reviews ADD COLUMN proof_numeric REAL;
+ALTER TABLE reviews ADD COLUMN price_usd REAL;
+
+CREATE INDEX IF NOT EXISTS idx_whiskeys_age_months ON whiskeys(age_months);
+CREATE INDEX IF NOT EXISTS idx_whiskeys_proof_numeric ON whiskeys(proof_numeric);
+CREATE INDEX IF NOT EXISTS idx_whiskeys_price_usd ON whiskeys(price_usd);
+
+CREATE INDEX IF NOT EXISTS idx_reviews_age_months ON reviews(age_months);
+CREATE INDEX IF NOT EXISTS idx_reviews_proof_numeric ON reviews(proof_numeric);
+CREATE INDEX IF NOT EXISTS idx_reviews_price_usd ON reviews(price_usd);
+
+INSERT INTO migrations (migration_name, description)
+VALUES ('008_add_numeric_attributes', 'Add indexed age_months, proof_numeric and price_usd to whiskeys and reviews');
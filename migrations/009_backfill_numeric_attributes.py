@@ -0,0 +1,25 @@
+"""
+Migration 009: Backfill Typed Age / Proof / Price
+Date: 2026-10-17
+Target: databases/whiskey_production.db
+Purpose: Fill the age_months, proof_numeric and price_usd columns added by
+         008_add_numeric_attributes.sql for existing rows, with the
+         scraper's parsers (database.parse_numeric_attribute_rows), in
+         rowid chunks so writers are never locked out for the whole table.
+         Resumable; rows ingested meanwhile are filled at ingest.
+"""
+
+from database import parse_numeric_attribute_rows, refresh_whiskey_numeric_attributes
+from online_migrations import Backfill
+
+DESCRIPTION = 'Backfill whiskeys/reviews age_months, proof_numeric and price_usd in chunks'
+
+BACKFILLS = [
+    Backfill('parse_reviews', 'reviews',
+             lambda conn, first, last: parse_numeric_attribute_rows(conn, 'reviews', first, last)),
+    Backfill('parse_whiskeys', 'whiskeys',
+             lambda conn, first, last: parse_numeric_attribute_rows(conn, 'whiskeys', first, last)),
+    # Values still missing on a whiskey come from its latest review
+    Backfill('whiskeys_from_reviews', 'whiskeys',
+             lambda conn, first, last: refresh_whiskey_numeric_attributes(conn, range(first, last + 1))),
+]
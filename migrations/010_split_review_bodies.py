@@ -0,0 +1,43 @@
+"""
+Migration 010: Move Long Review Text To review_bodies
+Date: 2026-10-17
+Target: databases/whiskey_production.db
+Purpose: Keep reviews rows small for lookups and scans. Copies nose/palate/
+         finish, the *_text duplicates, overall_notes and additional_data
+         into review_bodies (zlib-compressed when that is smaller; see
+         review_bodies.py) in rowid chunks, then drops those columns from
+         reviews. Triggers keep rows edited during the copy from going
+         stale. Production only: the scraper database (whiskey_reviews.db)
+         still writes the text inline, so the migration refuses to run
+         there. Read the text through the review_texts view
+         (review_bodies.attach_review_texts). Run VACUUM afterwards to
+         return the freed pages to the filesystem.
+"""
+
+from online_migrations import Backfill
+from review_bodies import (copy_review_bodies, create_body_sync_triggers, create_review_bodies_table,
+                           drop_body_sync_triggers, drop_inline_body_columns)
+
+DESCRIPTION = 'Move long review text columns from reviews to review_bodies'
+
+
+def schema(conn):
+    # database.insert_reviews_bulk writes the inline columns
+    if conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'scraper_runs'").fetchone():
+        raise RuntimeError("010_split_review_bodies targets whiskey_production.db, not the scraper database")
+    create_review_bodies_table(conn)
+    create_body_sync_triggers(conn)
+
+
+BACKFILLS = [
+    Backfill('copy_bodies', 'reviews',
+             lambda conn, first, last: copy_review_bodies(conn, first, last)),
+]
+
+
+def finalize(conn):
+    # Reviews inserted, or edited after their chunk was copied, while the
+    # copy ran; then the contract step
+    copy_review_bodies(conn, missing_only=True)
+    drop_body_sync_triggers(conn)
+    drop_inline_body_columns(conn)
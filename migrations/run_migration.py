@@ -1,61 +1,68 @@
 #!/usr/bin/env python3
 """
 Migration Runner Script
-Safely applies database migrations with backup and rollback support.
+Safely applies database migrations with an online backup first.
+
+Works on a versioned copy of the database (db_swap.stage_copy) and swaps it
+in with an atomic rename once every migration has succeeded, like
+rebuild_production.py, so the API never reads a half-migrated file. A run
+that fails part-way removes the copy and leaves the live database untouched.
+
+SQL migrations run as scripts; Python migrations backfill in rowid chunks
+(see online_migrations.py).
+
+Usage:
+    python3 migrations/run_migration.py [path/to/db] [--yes] [--chunk-size 1000]
+                                        [--pause 0.05] [--skip-backup]
 """
 
-import sqlite3
+import argparse
 import os
-import shutil
-from datetime import datetime
 import sys
 
 # Add parent directory to path to import project modules
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-DB_PATH = '/Users/michaelangolia/whiskey-scraper/whiskey_reviews.db'
-MIGRATIONS_DIR = os.path.dirname(os.path.abspath(__file__))
-
-
-def backup_database(db_path):
-    """Create a timestamped backup of the database."""
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    backup_dir = os.path.join(os.path.dirname(db_path), 'backups')
-    os.makedirs(backup_dir, exist_ok=True)
-
-    backup_path = os.path.join(backup_dir, f'whiskey_reviews_{timestamp}.db')
-    shutil.copy2(db_path, backup_path)
-    print(f"✓ Database backed up to: {backup_path}")
-    return backup_path
-
-
-def get_applied_migrations(conn):
-    """Get list of already applied migrations."""
-    cursor = conn.cursor()
-
-    # Check if migrations table exists
-    cursor.execute("""
-        SELECT name FROM sqlite_master
-        WHERE type='table' AND name='migrations'
-    """)
-
-    if not cursor.fetchone():
-        return set()
+from data_version import bump_data_version
+from db_connections import connect_writer
+from db_swap import discard, publish, stage_copy
+from database import backfill_match_keys
+from descriptor_similarity import rebuild_descriptor_neighbors
+from online_migrations import (
+    DEFAULT_CHUNK_SIZE,
+    applied_migrations,
+    backup_database,
+    ensure_migrations_table,
+    pending_migrations,
+    run_python_migration,
+)
+from review_bodies import attach_review_texts
+from slugs import backfill_slugs
 
-    cursor.execute("SELECT migration_name FROM migrations")
-    return {row[0] for row in cursor.fetchall()}
+MIGRATIONS_DIR = os.path.dirname(os.path.abspath(__file__))
+# Migrations target the production database (see each file's header)
+DB_PATH = os.getenv(
+    'DB_PATH',
+    os.path.join(os.path.dirname(MIGRATIONS_DIR), 'databases', 'whiskey_production.db'),
+)
 
 
-def apply_migration(conn, migration_file):
+def apply_migration(conn, migration_file, chunk_size=DEFAULT_CHUNK_SIZE, pause=0.0):
     """Apply a single migration file."""
     migration_name = os.path.basename(migration_file)
 
     print(f"\n→ Applying migration: {migration_name}")
 
-    with open(migration_file, 'r') as f:
-        sql = f.read()
-
     try:
+        if migration_name.endswith('.py'):
+            # Chunked backfill; progress is committed as it goes
+            rows = run_python_migration(conn, migration_file, chunk_size, pause)
+            print(f"✓ Migration {migration_name} applied successfully ({rows} rows backfilled)")
+            return True
+
+        with open(migration_file, 'r') as f:
+            sql = f.read()
+
         # Execute the migration in a transaction
         cursor = conn.cursor()
         cursor.executescript(sql)
@@ -96,27 +103,12 @@ def verify_migration(conn):
     for col in sorted(found_cols):
         print(f"  - {col}")
 
-    # Check reviews table columns
-    cursor.execute("PRAGMA table_info(reviews)")
-    review_columns = {row[1] for row in cursor.fetchall()}
-    new_review_cols = {'nose_text', 'palate_text', 'finish_text'}
-    found_review_cols = new_review_cols & review_columns
-    print(f"\n✓ New reviews columns: {len(found_review_cols)}/{len(new_review_cols)}")
-    for col in sorted(found_review_cols):
-        print(f"  - {col}")
-
-    # Check data was copied
-    cursor.execute("SELECT COUNT(*) FROM reviews WHERE nose_text IS NOT NULL")
-    nose_count = cursor.fetchone()[0]
-    cursor.execute("SELECT COUNT(*) FROM reviews WHERE palate_text IS NOT NULL")
-    palate_count = cursor.fetchone()[0]
-    cursor.execute("SELECT COUNT(*) FROM reviews WHERE finish_text IS NOT NULL")
-    finish_count = cursor.fetchone()[0]
-
-    print(f"\n✓ Data copied to new columns:")
-    print(f"  - nose_text: {nose_count} reviews")
-    print(f"  - palate_text: {palate_count} reviews")
-    print(f"  - finish_text: {finish_count} reviews")
+    # Check review text (inline on reviews until migration 010, review_bodies after)
+    attach_review_texts(conn)
+    print(f"\n✓ Review text columns:")
+    for column in ('nose_text', 'palate_text', 'finish_text'):
+        cursor.execute(f"SELECT COUNT(*) FROM review_texts WHERE {column} IS NOT NULL")
+        print(f"  - {column}: {cursor.fetchone()[0]} reviews")
 
     # Check indexes
     cursor.execute("""
@@ -134,30 +126,48 @@ def verify_migration(conn):
     print("="*80 + "\n")
 
 
-def main():
+def main(argv=None):
     """Main migration runner."""
+    parser = argparse.ArgumentParser(description="Apply pending database migrations")
+    parser.add_argument('db_path', nargs='?', default=DB_PATH)
+    parser.add_argument('--yes', action='store_true', help="don't ask for confirmation")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                        help="rows per backfill transaction in Python migrations")
+    parser.add_argument('--pause', type=float, default=0.0,
+                        help="seconds to sleep between backfill chunks")
+    parser.add_argument('--skip-backup', action='store_true',
+                        help="the live file is only replaced on success; the backup is for "
+                             "rolling back a migration that succeeded")
+    args = parser.parse_args(argv)
+    db_path = args.db_path
+
     print("="*80)
     print("WHISKEY SCRAPER - DATABASE MIGRATION")
     print("="*80)
 
-    if not os.path.exists(DB_PATH):
-        print(f"✗ Database not found at: {DB_PATH}")
+    if not os.path.exists(db_path):
+        print(f"✗ Database not found at: {db_path}")
         return 1
 
-    # Create backup
-    print("\n1. Creating backup...")
-    backup_path = backup_database(DB_PATH)
+    # Create backup (online backup API - the database stays usable meanwhile)
+    backup_path = None
+    if not args.skip_backup:
+        print("\n1. Creating backup...")
+        backup_path = backup_database(db_path)
+        print(f"✓ Database backed up to: {backup_path}")
 
-    # Connect to database
-    print("\n2. Connecting to database...")
-    conn = sqlite3.connect(DB_PATH)
-    conn.execute("PRAGMA foreign_keys = ON")
-    print(f"✓ Connected to: {DB_PATH}")
+    # Work on a copy - the live file is only replaced in step 7
+    print("\n2. Staging a copy of the database...")
+    staged_path, source_signature = stage_copy(db_path)
+    conn = connect_writer(staged_path, wal=False)
+    print(f"✓ Copied to: {staged_path}")
+    published = False
 
     try:
         # Check what migrations have been applied
         print("\n3. Checking migration status...")
-        applied = get_applied_migrations(conn)
+        ensure_migrations_table(conn)
+        applied = applied_migrations(conn)
         if applied:
             print(f"✓ Previously applied migrations: {len(applied)}")
             for m in sorted(applied):
@@ -165,12 +175,9 @@ def main():
         else:
             print("  No previous migrations found")
 
-        # Find migration files to apply
-        migration_files = sorted([
-            os.path.join(MIGRATIONS_DIR, f)
-            for f in os.listdir(MIGRATIONS_DIR)
-            if f.endswith('.sql') and f not in applied
-        ])
+        # Find migration files to apply (recorded by name, without extension;
+        # interrupted Python migrations are listed again and resume)
+        migration_files = [str(path) for path in pending_migrations(MIGRATIONS_DIR, applied)]
 
         if not migration_files:
             print("\n✓ No new migrations to apply")
@@ -181,41 +188,65 @@ def main():
             print(f"  - {os.path.basename(f)}")
 
         # Ask for confirmation
-        response = input("\nProceed with migration? (yes/no): ").strip().lower()
-        if response != 'yes':
-            print("\n✗ Migration cancelled by user")
-            return 1
+        if not args.yes:
+            response = input("\nProceed with migration? (yes/no): ").strip().lower()
+            if response != 'yes':
+                print("\n✗ Migration cancelled by user")
+                return 1
 
         # Apply migrations
         print("\n5. Applying migrations...")
         success = True
         for migration_file in migration_files:
-            if not apply_migration(conn, migration_file):
+            if not apply_migration(conn, migration_file, args.chunk_size, args.pause):
                 success = False
                 break
 
         if not success:
-            print("\n✗ Migration failed! Rolling back...")
-            conn.rollback()
-            print(f"  Database restored from backup: {backup_path}")
+            print("\n✗ Migration failed!")
+            print(f"  {os.path.basename(db_path)} is unchanged; rerun after fixing the error.")
             return 1
 
+        # Python backfills for columns SQL can't compute (no-op when up to date)
+        slug_count = backfill_slugs(conn)
+        if slug_count:
+            print(f"✓ Backfilled {slug_count} whiskey slugs")
+        match_key_count = backfill_match_keys(conn)
+        if match_key_count:
+            print(f"✓ Backfilled {match_key_count} whiskey match keys")
+        if any(f.endswith('006_add_descriptor_neighbors.sql') for f in migration_files):
+            neighbor_rows = rebuild_descriptor_neighbors(conn)
+            print(f"✓ Built {neighbor_rows} descriptor neighbor lists")
+
+        # Schema/data changed - invalidate API caches
+        version = bump_data_version(conn)
+        print(f"✓ Data version bumped to {version}")
+
         # Verify migration
         print("\n6. Verifying migration...")
         verify_migration(conn)
 
+        # Swap the migrated copy in; readers pick it up on their next request
+        print("\n7. Publishing migrated database...")
+        conn.close()
+        publish(staged_path, db_path, source_signature)
+        published = True
+        print(f"✓ {staged_path.name} is now {os.path.basename(db_path)}")
+
         print("\n✓✓✓ Migration completed successfully! ✓✓✓")
-        print(f"\nBackup saved at: {backup_path}")
-        print("You can safely delete the backup after verifying everything works.\n")
+        if backup_path:
+            print(f"\nBackup saved at: {backup_path}")
+            print("You can safely delete the backup after verifying everything works.\n")
 
         return 0
 
     except Exception as e:
         print(f"\n✗ Unexpected error: {e}")
-        conn.rollback()
         return 1
     finally:
         conn.close()
+        if not published:
+            discard(staged_path)
 
 
 if __name__ == '__main__':
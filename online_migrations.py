@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Migration bookkeeping, Python migrations with chunked backfills, and
+online backups for migrations/run_migration.py.
+
+A migration is either
+
+- NNN_name.sql: applied with executescript() and recorded by its own
+  INSERT INTO migrations, or
+- NNN_name.py: a module with DESCRIPTION, an optional schema(conn) for the
+  fast DDL part, BACKFILLS - a list of Backfill steps that rewrite a
+  table in fixed-size rowid ranges - and an optional finalize(conn) for
+  the closing step (e.g. dropping the columns that were copied elsewhere).
+
+Each backfill chunk is its own short transaction, and the step's position
+is saved in the same transaction (migrations.checkpoint), so writers only
+wait for one chunk at a time and an interrupted run picks up at the first
+unfinished chunk. finalize() runs in one transaction with marking the
+migration 'applied', once every step is done.
+Rows added after a step started are outside its range; migrations pair the
+backfill with an ingest change that fills new rows itself.
+"""
+
+import importlib.util
+import json
+import re
+import time
+from collections import namedtuple
+from datetime import datetime
+from pathlib import Path
+
+from db_connections import connect_readonly, connect_writer
+
+# Rows per backfill transaction
+DEFAULT_CHUNK_SIZE = 1000
+
+# Online backup: pages copied per step, and pause between steps
+BACKUP_PAGES_PER_STEP = 1024
+BACKUP_STEP_SLEEP = 0.005  # seconds
+
+MIGRATION_FILE = re.compile(r'^\d{3}_\w+\.(sql|py)$')
+
+# name: unique within the migration (checkpoint key)
+# table: table whose rowid range is walked
+# apply(conn, first_rowid, last_rowid): rewrites that range; must not commit
+Backfill = namedtuple('Backfill', 'name table apply')
+
+
+def ensure_migrations_table(conn):
+    """
+    Create the migrations table, or add the status/checkpoint columns to one
+    created by migration 001 / schema_mvp_v2.sql.
+    """
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS migrations (
+            migration_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            migration_name TEXT UNIQUE NOT NULL,
+            applied_at TEXT NOT NULL DEFAULT (datetime('now')),
+            description TEXT
+        )
+    """)
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(migrations)")}
+    if 'status' not in columns:
+        # Rows written by SQL migrations are complete when they are inserted
+        conn.execute("ALTER TABLE migrations ADD COLUMN status TEXT NOT NULL DEFAULT 'applied'")
+    if 'checkpoint' not in columns:
+        conn.execute("ALTER TABLE migrations ADD COLUMN checkpoint TEXT")  # JSON {step: last rowid}
+    conn.commit()
+
+
+# Baseline schemas that already contain later migrations' changes
+INCLUDED_MIGRATIONS = {
+    '000_initial_schema': {'001_add_quiz_tables'},  # schema_mvp_v2.sql
+}
+
+
+def applied_migrations(conn):
+    """Names (file stems) of fully applied migrations."""
+    applied = {row[0] for row in conn.execute(
+        "SELECT migration_name FROM migrations WHERE status = 'applied'"
+    )}
+    for name in list(applied):
+        applied |= INCLUDED_MIGRATIONS.get(name, set())
+    return applied
+
+
+def pending_migrations(migrations_dir, applied):
+    """Migration files not yet applied, in filename order."""
+    return [
+        path for path in sorted(Path(migrations_dir).iterdir())
+        if MIGRATION_FILE.match(path.name) and path.stem not in applied
+    ]
+
+
+def load_python_migration(path):
+    """Import NNN_name.py as a module."""
+    spec = importlib.util.spec_from_file_location(f"migration_{Path(path).stem}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _checkpoint(conn, name):
+    """Saved step positions of an in-progress migration, or None if it hasn't started."""
+    row = conn.execute(
+        "SELECT checkpoint FROM migrations WHERE migration_name = ?", (name,)
+    ).fetchone()
+    if row is None:
+        return None
+    return json.loads(row[0] or '{}')
+
+
+def run_python_migration(conn, path, chunk_size=DEFAULT_CHUNK_SIZE, pause=0.0, log=print):
+    """
+    Apply (or resume) a Python migration.
+
+    Args:
+        conn: Read-write connection (ensure_migrations_table() already run)
+        path: Path to NNN_name.py
+        chunk_size: Rows per backfill transaction
+        pause: Seconds to sleep between chunks, to leave room for other writers
+        log: Progress output
+
+    Returns:
+        int: Rows passed to backfill steps in this run
+    """
+    path = Path(path)
+    name = path.stem
+    module = load_python_migration(path)
+
+    checkpoint = _checkpoint(conn, name)
+    if checkpoint is None:
+        # Schema change and the in-progress marker commit together
+        conn.execute("BEGIN")
+        try:
+            if hasattr(module, 'schema'):
+                module.schema(conn)
+            conn.execute("""
+                INSERT INTO migrations (migration_name, description, status, checkpoint)
+                VALUES (?, ?, 'in_progress', '{}')
+            """, (name, getattr(module, 'DESCRIPTION', None)))
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        checkpoint = {}
+    else:
+        log(f"  Resuming {name} from {checkpoint or 'the start'}")
+
+    processed = 0
+    for step in getattr(module, 'BACKFILLS', []):
+        last_rowid = conn.execute(f"SELECT MAX(rowid) FROM {step.table}").fetchone()[0] or 0
+        position = checkpoint.get(step.name, 0)
+        while position < last_rowid:
+            end = min(position + chunk_size, last_rowid)
+            with conn:
+                step.apply(conn, position + 1, end)
+                checkpoint[step.name] = end
+                conn.execute(
+                    "UPDATE migrations SET checkpoint = ? WHERE migration_name = ?",
+                    (json.dumps(checkpoint), name),
+                )
+            processed += end - position
+            position = end
+            log(f"  {step.name}: {position}/{last_rowid}")
+            if pause:
+                time.sleep(pause)
+
+    conn.execute("BEGIN")
+    try:
+        if hasattr(module, 'finalize'):
+            module.finalize(conn)
+        conn.execute("""
+            UPDATE migrations SET status = 'applied', applied_at = datetime('now')
+            WHERE migration_name = ?
+        """, (name,))
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return processed
+
+
+def backup_database(db_path, backup_dir=None):
+    """
+    Copy the database with SQLite's online backup API.
+
+    The copy is made BACKUP_PAGES_PER_STEP pages at a time, so other
+    connections can keep reading and writing between steps. Unlike copying
+    the file, the result is consistent even if the database is in use.
+
+    Returns:
+        Path: The backup file (in <db dir>/backups/ by default)
+    """
+    db_path = Path(db_path)
+    backup_dir = Path(backup_dir) if backup_dir else db_path.parent / 'backups'
+    backup_dir.mkdir(parents=True, exist_ok=True)
+    backup_path = backup_dir / f"{db_path.stem}_{datetime.now():%Y%m%d_%H%M%S}{db_path.suffix}"
+
+    source = connect_readonly(db_path, row_factory=None)
+    target = connect_writer(backup_path, wal=False)
+    try:
+        source.backup(target, pages=BACKUP_PAGES_PER_STEP, sleep=BACKUP_STEP_SLEEP)
+    finally:
+        target.close()
+        source.close()
+    return backup_path
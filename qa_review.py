@@ -4,15 +4,16 @@ QA Script: Compare extracted descriptors against original review URLs
 Outputs a report you can use to manually verify against the source websites
 """
 
-import sqlite3
 from pathlib import Path
 
+from db_connections import connect_readonly
+
 DB_PATH = Path("whiskey_mvp_v2.db")
 
 def generate_qa_report(output_file="QA_REPORT.md"):
     """Generate a QA report with all whiskeys, their URLs, and extracted descriptors"""
 
-    conn = sqlite3.connect(DB_PATH)
+    conn = connect_readonly(DB_PATH, row_factory=None)
     cursor = conn.cursor()
 
     # Get all whiskeys
@@ -100,7 +101,7 @@ def generate_qa_report(output_file="QA_REPORT.md"):
 def generate_simple_list(output_file="QA_SIMPLE.txt"):
     """Generate a simple text file for quick review"""
 
-    conn = sqlite3.connect(DB_PATH)
+    conn = connect_readonly(DB_PATH, row_factory=None)
     cursor = conn.cursor()
 
     cursor.execute("""
@@ -129,7 +130,7 @@ def generate_simple_list(output_file="QA_SIMPLE.txt"):
 def query_specific_whiskey(whiskey_name):
     """Query a specific whiskey and show all its data"""
 
-    conn = sqlite3.connect(DB_PATH)
+    conn = connect_readonly(DB_PATH, row_factory=None)
     cursor = conn.cursor()
 
     cursor.execute("""
@@ -0,0 +1,199 @@
+"""
+In-memory quiz corpus for the Flask API.
+
+Holds an immutable snapshot of aggregated_whiskey_descriptors so that quiz
+sections can be generated by sampling arrays instead of querying SQLite on
+every request. The snapshot is rebuilt when the database file changes.
+"""
+
+import random
+from typing import Dict, FrozenSet, NamedTuple, Tuple
+
+from descriptor_similarity import load_neighbors
+from snapshots import SnapshotCache
+
+SECTIONS = ('nose', 'palate', 'finish')
+
+# Distractor strategies:
+#   easy   - descriptors from categories none of the correct answers belong to
+#   medium - uniformly random (the original behaviour)
+#   hard   - nearest neighbors of the correct answers (descriptor_similarity.py)
+DIFFICULTIES = ('easy', 'medium', 'hard')
+DEFAULT_DIFFICULTY = 'medium'
+
+
+class SectionCorpus(NamedTuple):
+    """Quiz data for one tasting section (nose/palate/finish)."""
+    # whiskey_id -> descriptor ids, ordered by review_count DESC, descriptor_name
+    correct: Dict[int, Tuple[int, ...]]
+    # whiskey_id -> same ids as a set, for distractor exclusion
+    correct_sets: Dict[int, FrozenSet[int]]
+    # every descriptor id used by any whiskey in this section
+    pool: Tuple[int, ...]
+    # descriptor_id -> most similar descriptor ids (empty before migration 006)
+    neighbors: Dict[int, Tuple[int, ...]]
+
+
+class QuizCorpus:
+    """
+    Immutable snapshot of quiz-ready descriptor data.
+
+    Built once from the database and shared by all requests in a worker.
+    Nothing here should be mutated after load().
+    """
+
+    def __init__(self, sections: Dict[str, SectionCorpus], descriptor_names: Dict[int, str],
+                 descriptor_categories: Dict[int, str] = None):
+        self.sections = sections
+        self.descriptor_names = descriptor_names
+        self.descriptor_categories = descriptor_categories or {}
+
+    @classmethod
+    def load(cls, conn):
+        """
+        Build a snapshot from an open database connection.
+
+        Args:
+            conn: sqlite3 connection to the production database
+
+        Returns:
+            QuizCorpus
+        """
+        cursor = conn.cursor()
+
+        cursor.execute("SELECT descriptor_id, descriptor_name, category FROM descriptor_vocabulary")
+        descriptor_names = {}
+        descriptor_categories = {}
+        for descriptor_id, name, category in cursor.fetchall():
+            descriptor_names[descriptor_id] = name
+            descriptor_categories[descriptor_id] = category
+
+        # Same ordering the per-request query used, so the "top N correct"
+        # descriptors shown in a quiz are unchanged
+        cursor.execute("""
+            SELECT awd.tasting_section, awd.whiskey_id, awd.descriptor_id
+            FROM aggregated_whiskey_descriptors awd
+            JOIN descriptor_vocabulary dv ON awd.descriptor_id = dv.descriptor_id
+            ORDER BY awd.tasting_section, awd.whiskey_id,
+                     awd.review_count DESC, dv.descriptor_name
+        """)
+
+        correct = {section: {} for section in SECTIONS}
+        for section, whiskey_id, descriptor_id in cursor.fetchall():
+            if section not in correct:
+                continue
+            correct[section].setdefault(whiskey_id, []).append(descriptor_id)
+
+        neighbors = load_neighbors(conn)
+
+        sections = {}
+        for section, by_whiskey in correct.items():
+            frozen = {wid: tuple(ids) for wid, ids in by_whiskey.items()}
+            pool = sorted({d for ids in frozen.values() for d in ids})
+            sections[section] = SectionCorpus(
+                correct=frozen,
+                correct_sets={wid: frozenset(ids) for wid, ids in frozen.items()},
+                pool=tuple(pool),
+                neighbors=neighbors.get(section, {}),
+            )
+
+        return cls(sections, descriptor_names, descriptor_categories)
+
+    def correct_descriptors(self, section, whiskey_id) -> Tuple[int, ...]:
+        """Return correct descriptor ids for a whiskey/section (best first)."""
+        return self.sections[section].correct.get(whiskey_id, ())
+
+    def sample_distractors(self, section, whiskey_id, k, rng=random,
+                           difficulty=DEFAULT_DIFFICULTY, anchors=()) -> Tuple[int, ...]:
+        """
+        Pick up to k descriptor ids used by other whiskeys in this section
+        that are not correct for this whiskey.
+
+        Args:
+            difficulty: 'easy', 'medium' or 'hard' (see DIFFICULTIES)
+            anchors: Correct descriptor ids shown in the quiz; hard mode
+                picks among their neighbors
+
+        Easy and hard top up with random distractors when they can't find
+        k candidates of their own.
+        """
+        corpus = self.sections[section]
+        exclude = corpus.correct_sets.get(whiskey_id, frozenset())
+
+        if difficulty == 'hard':
+            picked = self._similar(corpus, exclude, k, rng, anchors)
+        elif difficulty == 'easy':
+            picked = self._dissimilar(corpus, exclude, k, rng)
+        else:
+            return tuple(self._random(corpus, exclude, k, rng))
+
+        if len(picked) < k:
+            taken = exclude | set(picked)
+            picked += self._random(corpus, taken, k - len(picked), rng)
+        return tuple(picked)
+
+    @staticmethod
+    def _random(corpus, exclude, k, rng):
+        """
+        Uniform sample. Draws k + len(exclude) ids from the pool, so at
+        least k survive the exclusion whenever the pool is large enough.
+        O(k) per call.
+        """
+        draw = min(len(corpus.pool), k + len(exclude))
+        picked = [d for d in rng.sample(corpus.pool, draw) if d not in exclude]
+        return picked[:k]
+
+    def _dissimilar(self, corpus, exclude, k, rng):
+        """
+        Random descriptors outside every category of the correct answers
+        (uncategorized descriptors always qualify). Samples 2 * (k + excluded)
+        ids first and only scans the rest of the pool if that falls short.
+        """
+        categories = self.descriptor_categories
+        avoid = {categories.get(d) for d in exclude} - {None}
+
+        def allowed(d):
+            return d not in exclude and categories.get(d) not in avoid
+
+        draw = min(len(corpus.pool), 2 * (k + len(exclude)))
+        sample = rng.sample(corpus.pool, draw)
+        picked = [d for d in sample if allowed(d)][:k]
+        if len(picked) < k and draw < len(corpus.pool):
+            drawn = set(sample)
+            rest = [d for d in corpus.pool if d not in drawn and allowed(d)]
+            picked += rng.sample(rest, min(k - len(picked), len(rest)))
+        return picked
+
+    @staticmethod
+    def _similar(corpus, exclude, k, rng, anchors):
+        """
+        Random pick among the nearest neighbors of the anchors.
+
+        Walks the anchors' neighbor lists round-robin, nearest first, until
+        2k candidates are collected, then samples k of them - so the quiz
+        varies between requests without straying far from the top of the
+        lists.
+        """
+        lists = [corpus.neighbors.get(d, ()) for d in anchors]
+        depth = max((len(ids) for ids in lists), default=0)
+        seen = set(exclude)
+        candidates = []
+        for rank in range(depth):
+            for ids in lists:
+                if rank < len(ids) and ids[rank] not in seen:
+                    seen.add(ids[rank])
+                    candidates.append(ids[rank])
+            if len(candidates) >= 2 * k:
+                break
+        return rng.sample(candidates, min(k, len(candidates)))
+
+    def name(self, descriptor_id) -> str:
+        """Look up a descriptor's display name."""
+        return self.descriptor_names[descriptor_id]
+
+
+class QuizCorpusCache(SnapshotCache):
+    """Per-worker holder for the current QuizCorpus (see snapshots.py)."""
+
+    def __init__(self, db_path, connect):
+        super().__init__(db_path, connect, QuizCorpus.load)
@@ -2,124 +2,166 @@
 """
 Rebuild production database descriptor extractions
 Run this after vocabulary changes
+
+Works on a versioned copy of the database (db_swap.stage_copy) and swaps it
+in with an atomic rename at the end, so the API keeps serving the old data
+until the rebuild is complete and never contends with this writer. A run
+that fails part-way leaves the live database untouched.
 """
 
-import sqlite3
 import json
+from pathlib import Path
 from match_descriptors_v2 import match_descriptors_in_text
 from extract_prose_descriptors import ProseDescriptorExtractor
+from data_version import bump_data_version
+from descriptor_similarity import rebuild_descriptor_neighbors
+from db_swap import discard, publish, stage_copy
+from db_connections import connect_writer
+from review_bodies import attach_review_texts
+
+DB_PATH = Path(__file__).parent / "databases" / "whiskey_production.db"
 
 print("=" * 80)
 print("REBUILDING PRODUCTION DATABASE EXTRACTIONS")
 print("=" * 80)
 
-# Step 1: Clear existing data
-print("\n1. Clearing existing extractions...")
-db = sqlite3.connect('databases/whiskey_production.db')
-cursor = db.cursor()
-
-cursor.execute("DELETE FROM aggregated_whiskey_descriptors")
-cursor.execute("DELETE FROM review_descriptors")
-db.commit()
-print("   ✓ Cleared")
-
-# Step 2: Extract pipe-delimited reviews
-print("\n2. Extracting pipe-delimited reviews...")
-
-# Load vocabulary
-cursor.execute("SELECT descriptor_id, descriptor_name FROM descriptor_vocabulary WHERE is_active = 1")
-vocab_map = {name.lower(): desc_id for desc_id, name in cursor.fetchall()}
-print(f"   Loaded {len(vocab_map)} descriptors")
-
-# Get pipe-delimited reviews
-cursor.execute("""
-    SELECT review_id, nose_text, palate_text, finish_text
-    FROM reviews
-    WHERE nose_text LIKE '%|%'
-    AND nose_text IS NOT NULL
-""")
-
-pipe_reviews = cursor.fetchall()
-print(f"   Found {len(pipe_reviews)} pipe-delimited reviews")
-
-pipe_count = 0
-for i, (review_id, nose_text, palate_text, finish_text) in enumerate(pipe_reviews, 1):
-    if i % 200 == 0:
-        print(f"   Processing {i}/{len(pipe_reviews)}...")
-
-    for section_name, section_text in [('nose', nose_text), ('palate', palate_text), ('finish', finish_text)]:
-        if not section_text:
-            continue
-
-        matched_descriptors = match_descriptors_in_text(section_text)
-
-        for descriptor_name in matched_descriptors:
-            if descriptor_name in vocab_map:
-                desc_id = vocab_map[descriptor_name]
-                cursor.execute("""
-                    INSERT INTO review_descriptors
-                    (review_id, descriptor_id, tasting_section, confidence_score, extraction_method)
-                    VALUES (?, ?, ?, 1.0, 'pipe_delimited')
-                """, (review_id, desc_id, section_name))
-                pipe_count += 1
-
-db.commit()
-print(f"   ✓ Extracted {pipe_count} descriptors")
-
-db.close()
-
-# Step 3: Extract prose reviews
-print("\n3. Extracting prose reviews...")
-extractor = ProseDescriptorExtractor('whiskey_production.db')
-stats = extractor.process_all_prose_reviews(dry_run=False)
-extractor.close()
-print(f"   ✓ Extracted {stats['descriptors_extracted']} descriptors")
-
-# Step 4: Aggregate
-print("\n4. Aggregating descriptors...")
-db = sqlite3.connect('whiskey_production.db')
-cursor = db.cursor()
-
-cursor.execute("""
-    SELECT
-        r.whiskey_id,
-        rd.descriptor_id,
-        rd.tasting_section,
-        GROUP_CONCAT(rd.review_id) as review_ids,
-        COUNT(*) as review_count
-    FROM review_descriptors rd
-    JOIN reviews r ON rd.review_id = r.review_id
-    GROUP BY r.whiskey_id, rd.descriptor_id, rd.tasting_section
-""")
-
-aggregations = cursor.fetchall()
-
-for whiskey_id, descriptor_id, section, review_ids_str, review_count in aggregations:
-    review_ids = [int(x) for x in review_ids_str.split(',')]
-    review_ids_json = json.dumps(review_ids)
-
+# Step 0: Work on a copy - the live file is only replaced in step 6
+print("\n0. Staging a copy of the production database...")
+staged_path, source_signature = stage_copy(DB_PATH)
+print(f"   ✓ Copied to {staged_path.name}")
+
+# Steps 1-6 write only to the staged copy; if any of them fails, remove it
+try:
+    # Step 1: Clear existing data
+    print("\n1. Clearing existing extractions...")
+    db = connect_writer(staged_path, wal=False)
+    cursor = db.cursor()
+
+    cursor.execute("DELETE FROM aggregated_whiskey_descriptors")
+    cursor.execute("DELETE FROM review_descriptors")
+    db.commit()
+    print("   ✓ Cleared")
+
+    # Step 2: Extract pipe-delimited reviews
+    print("\n2. Extracting pipe-delimited reviews...")
+
+    # Load vocabulary
+    cursor.execute("SELECT descriptor_id, descriptor_name FROM descriptor_vocabulary WHERE is_active = 1")
+    vocab_map = {name.lower(): desc_id for desc_id, name in cursor.fetchall()}
+    print(f"   Loaded {len(vocab_map)} descriptors")
+
+    # Get pipe-delimited reviews (text lives in review_bodies after migration 010)
+    attach_review_texts(db)
     cursor.execute("""
-        INSERT INTO aggregated_whiskey_descriptors
-        (whiskey_id, descriptor_id, tasting_section, source_review_ids, review_count)
-        VALUES (?, ?, ?, ?, ?)
-    """, (whiskey_id, descriptor_id, section, review_ids_json, review_count))
-
-db.commit()
-
-# Get stats
-cursor.execute("SELECT COUNT(*) FROM aggregated_whiskey_descriptors")
-total_agg = cursor.fetchone()[0]
+        SELECT review_id, nose_text, palate_text, finish_text
+        FROM review_texts
+        WHERE nose_text LIKE '%|%'
+        AND nose_text IS NOT NULL
+    """)
+
+    pipe_reviews = cursor.fetchall()
+    print(f"   Found {len(pipe_reviews)} pipe-delimited reviews")
+
+    pipe_count = 0
+    for i, (review_id, nose_text, palate_text, finish_text) in enumerate(pipe_reviews, 1):
+        if i % 200 == 0:
+            print(f"   Processing {i}/{len(pipe_reviews)}...")
+
+        for section_name, section_text in [('nose', nose_text), ('palate', palate_text), ('finish', finish_text)]:
+            if not section_text:
+                continue
+
+            matched_descriptors = match_descriptors_in_text(section_text)
+
+            for descriptor_name in matched_descriptors:
+                if descriptor_name in vocab_map:
+                    desc_id = vocab_map[descriptor_name]
+                    cursor.execute("""
+                        INSERT INTO review_descriptors
+                        (review_id, descriptor_id, tasting_section, confidence_score, extraction_method)
+                        VALUES (?, ?, ?, 1.0, 'pipe_delimited')
+                    """, (review_id, desc_id, section_name))
+                    pipe_count += 1
+
+    db.commit()
+    print(f"   ✓ Extracted {pipe_count} descriptors")
+
+    db.close()
+
+    # Step 3: Extract prose reviews
+    print("\n3. Extracting prose reviews...")
+    extractor = ProseDescriptorExtractor(str(staged_path))
+    stats = extractor.process_all_prose_reviews(dry_run=False)
+    extractor.close()
+    print(f"   ✓ Extracted {stats['descriptors_extracted']} descriptors")
+
+    # Step 4: Aggregate
+    print("\n4. Aggregating descriptors...")
+    db = connect_writer(staged_path, wal=False)
+    cursor = db.cursor()
 
-cursor.execute("SELECT COUNT(DISTINCT whiskey_id) FROM aggregated_whiskey_descriptors")
-quiz_ready = cursor.fetchone()[0]
-
-cursor.execute("SELECT COUNT(*) FROM whiskeys")
-total_whiskeys = cursor.fetchone()[0]
-
-db.close()
-
-print(f"   ✓ Created {total_agg} aggregated entries")
-print(f"   ✓ {quiz_ready}/{total_whiskeys} quiz-ready whiskeys ({quiz_ready/total_whiskeys*100:.1f}%)")
+    cursor.execute("""
+        SELECT
+            r.whiskey_id,
+            rd.descriptor_id,
+            rd.tasting_section,
+            GROUP_CONCAT(rd.review_id) as review_ids,
+            COUNT(*) as review_count
+        FROM review_descriptors rd
+        JOIN reviews r ON rd.review_id = r.review_id
+        GROUP BY r.whiskey_id, rd.descriptor_id, rd.tasting_section
+    """)
+
+    aggregations = cursor.fetchall()
+
+    for whiskey_id, descriptor_id, section, review_ids_str, review_count in aggregations:
+        review_ids = [int(x) for x in review_ids_str.split(',')]
+        review_ids_json = json.dumps(review_ids)
+
+        cursor.execute("""
+            INSERT INTO aggregated_whiskey_descriptors
+            (whiskey_id, descriptor_id, tasting_section, source_review_ids, review_count)
+            VALUES (?, ?, ?, ?, ?)
+        """, (whiskey_id, descriptor_id, section, review_ids_json, review_count))
+
+    db.commit()
+
+    # Get stats
+    cursor.execute("SELECT COUNT(*) FROM aggregated_whiskey_descriptors")
+    total_agg = cursor.fetchone()[0]
+
+    cursor.execute("SELECT COUNT(DISTINCT whiskey_id) FROM aggregated_whiskey_descriptors")
+    quiz_ready = cursor.fetchone()[0]
+
+    cursor.execute("SELECT COUNT(*) FROM whiskeys")
+    total_whiskeys = cursor.fetchone()[0]
+
+    db.close()
+
+    # Step 5: Recompute hard-mode neighbor lists and bump the data version
+    # (invalidates ETags and caches once the new file is live)
+    db = connect_writer(staged_path, wal=False)
+    neighbor_rows = rebuild_descriptor_neighbors(db)
+    data_version = bump_data_version(db)
+    db.close()
+
+    print(f"   ✓ Created {total_agg} aggregated entries")
+    print(f"   ✓ {quiz_ready}/{total_whiskeys} quiz-ready whiskeys ({quiz_ready/total_whiskeys*100:.1f}%)")
+    if neighbor_rows is None:
+        print("   ⚠ descriptor_neighbors missing (apply migration 006) - hard quizzes use random distractors")
+    else:
+        print(f"   ✓ Rebuilt {neighbor_rows} descriptor neighbor lists")
+    print(f"   ✓ Data version bumped to {data_version}")
+
+    # Step 6: Atomically swap the rebuilt file in; API workers pick it up on
+    # their next request
+    print("\n6. Publishing rebuilt database...")
+    publish(staged_path, DB_PATH, source_signature)
+    print(f"   ✓ {staged_path.name} is now {DB_PATH.name}")
+except BaseException:
+    discard(staged_path)
+    print(f"\n✗ Rebuild failed; removed {staged_path.name}, {DB_PATH.name} is unchanged")
+    raise
 
 print("\n" + "=" * 80)
 print("✅ REBUILD COMPLETE")
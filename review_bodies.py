@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Long review text kept out of the hot reviews rows.
+
+reviews used to carry the tasting notes twice (nose/palate/finish and the
+*_text copies) plus overall_notes and additional_data inline, so every
+scan or lookup on reviews - source URLs for quizzes, review counts,
+aggregation joins - paged that text through the cache. Migration
+010_split_review_bodies.py moves those columns to review_bodies (one row
+per review, keyed by review_id) and drops them from reviews.
+
+Values longer than COMPRESS_MIN_CHARS are stored as zlib BLOBs when that
+is smaller (REVIEW_BODY_COMPRESSION=none stores plain text); TEXT vs BLOB
+tells the two apart, so both can sit in the same column. Code that needs
+the text reads the review_texts temp view (attach_review_texts()), which
+has the same column names on either layout and only decompresses the
+columns a query actually selects.
+
+Usage:
+    python3 review_bodies.py [path/to/whiskey_production.db]   # storage summary
+"""
+
+import os
+import sys
+import zlib
+from pathlib import Path
+
+from db_connections import connect_readonly
+
+DB_PATH = Path(__file__).parent / "databases" / "whiskey_production.db"
+
+BODY_COLUMNS = ('nose', 'palate', 'finish', 'nose_text', 'palate_text', 'finish_text',
+                'overall_notes', 'additional_data')
+
+# 'zlib' or 'none'
+COMPRESSION = os.getenv('REVIEW_BODY_COMPRESSION', 'zlib')
+# Shorter values gain nothing from zlib's header and are stored as text
+COMPRESS_MIN_CHARS = 128
+ZLIB_LEVEL = 6
+
+
+def pack(text, compression=None):
+    """Stored form of a body value: the text itself or zlib-compressed UTF-8."""
+    if text is None or (compression or COMPRESSION) != 'zlib' or len(text) < COMPRESS_MIN_CHARS:
+        return text
+    raw = text.encode('utf-8')
+    packed = zlib.compress(raw, ZLIB_LEVEL)
+    return packed if len(packed) < len(raw) else text
+
+
+def unpack(value):
+    """Inverse of pack()."""
+    if isinstance(value, bytes):
+        return zlib.decompress(value).decode('utf-8')
+    return value
+
+
+def has_review_bodies(conn):
+    """Return True if the review_bodies table exists in this database."""
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'review_bodies'"
+    ).fetchone() is not None
+
+
+def inline_body_columns(conn):
+    """Body columns still stored on reviews, in BODY_COLUMNS order."""
+    present = {row[1] for row in conn.execute("PRAGMA table_info(reviews)")}
+    return [column for column in BODY_COLUMNS if column in present]
+
+
+def create_review_bodies_table(conn):
+    """Create review_bodies (columns are TEXT, holding text or zlib BLOBs)."""
+    columns = ",\n            ".join(f"{column} TEXT" for column in BODY_COLUMNS)
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS review_bodies (
+            review_id INTEGER PRIMARY KEY,
+            {columns},
+            FOREIGN KEY (review_id) REFERENCES reviews(review_id) ON DELETE CASCADE
+        )
+    """)
+
+
+def copy_review_bodies(conn, first_id=None, last_id=None, missing_only=False):
+    """
+    Copy inline body columns of reviews into review_bodies, packed.
+
+    Args:
+        conn: Read-write connection
+        first_id, last_id: Optional inclusive review_id range
+        missing_only: Only reviews without a review_bodies row yet
+
+    Returns:
+        int: Rows written. Reviews with no text at all get no row. Doesn't commit.
+    """
+    columns = inline_body_columns(conn)
+    if not columns:
+        return 0
+
+    conditions, params = [], []
+    if first_id is not None:
+        conditions.append("review_id >= ?")
+        params.append(first_id)
+    if last_id is not None:
+        conditions.append("review_id <= ?")
+        params.append(last_id)
+    if missing_only:
+        conditions.append("review_id NOT IN (SELECT review_id FROM review_bodies)")
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+    rows = [
+        (review_id, *(pack(value) for value in values))
+        for review_id, *values in conn.execute(
+            f"SELECT review_id, {', '.join(columns)} FROM reviews {where}", params
+        )
+        if any(value is not None for value in values)
+    ]
+    conn.executemany(f"""
+        INSERT OR REPLACE INTO review_bodies (review_id, {', '.join(columns)})
+        VALUES ({', '.join('?' * (len(columns) + 1))})
+    """, rows)
+    return len(rows)
+
+
+def create_body_sync_triggers(conn):
+    """
+    While the copy runs, an update to a review's text (or deleting the
+    review) drops its review_bodies row, so copy_review_bodies(...,
+    missing_only=True) copies it again with the current values. Plain SQL,
+    so they fire for every connection writing the database.
+    """
+    columns = ', '.join(inline_body_columns(conn))
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS review_bodies_stale_on_update
+        AFTER UPDATE OF {columns} ON reviews
+        BEGIN
+            DELETE FROM review_bodies WHERE review_id = OLD.review_id;
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS review_bodies_stale_on_delete
+        AFTER DELETE ON reviews
+        BEGIN
+            DELETE FROM review_bodies WHERE review_id = OLD.review_id;
+        END
+    """)
+
+
+def drop_body_sync_triggers(conn):
+    """Remove the create_body_sync_triggers() triggers."""
+    conn.execute("DROP TRIGGER IF EXISTS review_bodies_stale_on_update")
+    conn.execute("DROP TRIGGER IF EXISTS review_bodies_stale_on_delete")
+
+
+def drop_inline_body_columns(conn):
+    """
+    Drop the body columns from reviews (each DROP COLUMN rewrites the table).
+
+    This connection's review_texts view is dropped too (SQLite refuses to
+    drop columns a view uses); call attach_review_texts() again to read
+    text afterwards. Doesn't commit.
+    """
+    conn.execute("DROP VIEW IF EXISTS temp.review_texts")
+    for column in inline_body_columns(conn):
+        conn.execute(f"ALTER TABLE reviews DROP COLUMN {column}")
+
+
+def attach_review_texts(conn):
+    """
+    Create the temp view review_texts(review_id, whiskey_id, nose, ..., additional_data)
+    on this connection.
+
+    Columns come from reviews while they are still inline (unmigrated, or
+    mid-migration) and from review_bodies after the split; unpack_body()
+    is registered for the decompression. SQLite flattens the view into the
+    query using it, so unselected columns are never read or decompressed.
+    Works on connect_readonly() connections too.
+    """
+    conn.create_function('unpack_body', 1, unpack, deterministic=True)
+    inline = set(inline_body_columns(conn))
+    split = has_review_bodies(conn) and len(inline) < len(BODY_COLUMNS)
+
+    selects = []
+    for column in BODY_COLUMNS:
+        if column in inline:
+            selects.append(f"r.{column} AS {column}")
+        elif split:
+            selects.append(f"unpack_body(b.{column}) AS {column}")
+        else:
+            selects.append(f"NULL AS {column}")
+    join = "LEFT JOIN review_bodies b ON b.review_id = r.review_id" if split else ""
+
+    # query_only also refuses temp objects; the file stays read-only either way
+    query_only = conn.execute("PRAGMA query_only").fetchone()[0]
+    conn.execute("PRAGMA query_only = OFF")
+    try:
+        conn.execute("DROP VIEW IF EXISTS temp.review_texts")
+        conn.execute(f"""
+            CREATE TEMP VIEW review_texts AS
+            SELECT r.review_id, r.whiskey_id, {', '.join(selects)}
+            FROM reviews r {join}
+        """)
+    finally:
+        conn.execute(f"PRAGMA query_only = {'ON' if query_only else 'OFF'}")
+
+
+def storage_summary(conn):
+    """Row count, compressed values and stored vs text bytes of review_bodies."""
+    totals = {'rows': 0, 'compressed_values': 0, 'stored_bytes': 0, 'text_bytes': 0}
+    for row in conn.execute(f"SELECT {', '.join(BODY_COLUMNS)} FROM review_bodies"):
+        totals['rows'] += 1
+        for value in row:
+            if value is None:
+                continue
+            if isinstance(value, bytes):
+                totals['compressed_values'] += 1
+                totals['stored_bytes'] += len(value)
+                totals['text_bytes'] += len(unpack(value).encode('utf-8'))
+            else:
+                size = len(value.encode('utf-8'))
+                totals['stored_bytes'] += size
+                totals['text_bytes'] += size
+    return totals
+
+
+if __name__ == '__main__':
+    db_path = Path(sys.argv[1]) if len(sys.argv) > 1 else DB_PATH
+    conn = connect_readonly(db_path, row_factory=None)
+    if not has_review_bodies(conn):
+        print(f"✗ {db_path} has no review_bodies table (run migrations/run_migration.py)")
+        sys.exit(1)
+    totals = storage_summary(conn)
+    conn.close()
+
+    print(f"✓ review_bodies in {db_path}")
+    print(f"  rows: {totals['rows']}")
+    print(f"  compressed values: {totals['compressed_values']}")
+    ratio = totals['stored_bytes'] / totals['text_bytes'] if totals['text_bytes'] else 1
+    print(f"  stored: {totals['stored_bytes'] / 1024:.1f} KiB of {totals['text_bytes'] / 1024:.1f} KiB text "
+          f"({ratio:.0%})")
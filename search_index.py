@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Whiskey search backed by the whiskey_search FTS5 table.
+
+The table is created by migrations/002_add_whiskey_search_fts.sql and kept
+in sync by triggers on whiskeys and distillery_mappings. Databases that
+haven't been migrated yet (or queries shorter than one trigram) fall back
+to the original LIKE scan so the endpoint keeps working either way.
+
+Results can be narrowed by ranges over the typed whiskeys.age_months /
+proof_numeric / price_usd columns (migration 008), with or without a text
+query.
+
+Usage:
+    python3 search_index.py [path/to/whiskey_production.db]   # full rebuild
+"""
+
+import sys
+from pathlib import Path
+
+from db_connections import connect_writer
+
+DB_PATH = Path(__file__).parent / "databases" / "whiskey_production.db"
+
+# The trigram tokenizer can only match terms of 3+ characters
+MIN_FTS_QUERY_LENGTH = 3
+
+# bm25 column weights: (name, distillery) - a name hit outranks a distillery hit
+BM25_WEIGHTS = (10.0, 1.0)
+
+# Indexed columns that accept range filters (migration 008)
+RANGE_COLUMNS = ('age_months', 'proof_numeric', 'price_usd')
+
+
+def fts_phrase(query):
+    """
+    Quote a sanitized search query as a single FTS5 phrase.
+
+    With the trigram tokenizer a quoted phrase is a case-insensitive
+    substring match, the same semantics as LIKE '%query%'.
+    """
+    return '"' + query.replace('"', '""') + '"'
+
+
+def has_search_index(conn):
+    """Return True if the whiskey_search table exists in this database."""
+    row = conn.execute("""
+        SELECT 1 FROM sqlite_master
+        WHERE type = 'table' AND name = 'whiskey_search'
+    """).fetchone()
+    return row is not None
+
+
+def has_range_columns(conn):
+    """Return True if whiskeys has the typed range-filter columns (migration 008)."""
+    cursor = conn.execute("PRAGMA table_info(whiskeys)")
+    return any(row[1] == 'proof_numeric' for row in cursor.fetchall())
+
+
+def range_conditions(ranges):
+    """
+    SQL for range filters on the typed whiskeys columns.
+
+    Args:
+        ranges (dict): {column: (low, high)}; either bound may be None
+
+    Returns:
+        (sql, params): " AND ..." fragment (empty without filters) and its
+        parameters
+    """
+    sql = []
+    params = []
+    for column, (low, high) in sorted((ranges or {}).items()):
+        if column not in RANGE_COLUMNS:
+            raise ValueError(f"Not a range-filter column: {column}")
+        if low is not None:
+            sql.append(f" AND w.{column} >= ?")
+            params.append(low)
+        if high is not None:
+            sql.append(f" AND w.{column} <= ?")
+            params.append(high)
+    return "".join(sql), params
+
+
+def slug_expression(with_slugs):
+    """Select-list expression for the stored slug (NULL on unmigrated DBs)."""
+    return "w.slug" if with_slugs else "NULL"
+
+
+def search_fts(conn, query, limit, with_slugs=False, ranges=None):
+    """
+    bm25-ranked substring search over whiskey name and canonical distillery.
+
+    Returns:
+        list of (whiskey_id, name, distillery, slug) rows, best match first
+    """
+    filters, params = range_conditions(ranges)
+    cursor = conn.execute(f"""
+        SELECT s.rowid AS whiskey_id, s.name, s.distillery, {slug_expression(with_slugs)} AS slug
+        FROM whiskey_search s
+        JOIN whiskeys w ON w.whiskey_id = s.rowid
+        WHERE whiskey_search MATCH ?{filters}
+        ORDER BY bm25(whiskey_search, {BM25_WEIGHTS[0]}, {BM25_WEIGHTS[1]}), s.name
+        LIMIT ?
+    """, (fts_phrase(query), *params, limit))
+    return cursor.fetchall()
+
+
+def search_like(conn, query, limit, with_slugs=False, ranges=None):
+    """
+    Original LIKE-based search (full scan). Used for short queries and
+    databases without the FTS index.
+    """
+    filters, params = range_conditions(ranges)
+    cursor = conn.execute(f"""
+        SELECT
+            w.whiskey_id,
+            w.name,
+            COALESCE(dm.canonical_name, w.distillery) as distillery,
+            {slug_expression(with_slugs)} AS slug
+        FROM whiskeys w
+        LEFT JOIN distillery_mappings dm ON w.distillery = dm.variant_name
+        WHERE (w.name LIKE ?
+               OR COALESCE(dm.canonical_name, w.distillery) LIKE ?){filters}
+        ORDER BY w.name
+        LIMIT ?
+    """, (f"%{query}%", f"%{query}%", *params, limit))
+    return cursor.fetchall()
+
+
+def search_ranges(conn, ranges, limit, with_slugs=False):
+    """
+    Whiskeys within the given attribute ranges, by name (no text query).
+    Walks the index of one filtered column instead of parsing any text.
+    """
+    filters, params = range_conditions(ranges)
+    cursor = conn.execute(f"""
+        SELECT
+            w.whiskey_id,
+            w.name,
+            COALESCE(dm.canonical_name, w.distillery) as distillery,
+            {slug_expression(with_slugs)} AS slug
+        FROM whiskeys w
+        LEFT JOIN distillery_mappings dm ON w.distillery = dm.variant_name
+        WHERE 1{filters}
+        ORDER BY w.name
+        LIMIT ?
+    """, (*params, limit))
+    return cursor.fetchall()
+
+
+def search_whiskeys(conn, query, limit, use_fts=True, with_slugs=False, ranges=None):
+    """
+    Search whiskeys by name or canonical distillery.
+
+    Args:
+        conn: Database connection
+        query (str): Sanitized search query
+        limit (int): Max results
+        use_fts (bool): Whether the database has the whiskey_search table
+        with_slugs (bool): Whether the database has whiskeys.slug (migration 005)
+        ranges (dict, optional): {column: (low, high)} filters on
+            RANGE_COLUMNS (migration 008); with no query, only these apply
+
+    Returns:
+        list of (whiskey_id, name, distillery, slug) rows; slug is None
+        when with_slugs is False
+    """
+    if not query:
+        return search_ranges(conn, ranges, limit, with_slugs)
+    if use_fts and len(query) >= MIN_FTS_QUERY_LENGTH:
+        return search_fts(conn, query, limit, with_slugs, ranges)
+    return search_like(conn, query, limit, with_slugs, ranges)
+
+
+def rebuild_search_index(conn):
+    """
+    Repopulate whiskey_search from whiskeys + distillery_mappings.
+
+    The triggers keep the index current for normal writes; this is for bulk
+    loads that bypass them or to repair drift.
+
+    Returns:
+        int: Number of indexed whiskeys
+    """
+    cursor = conn.cursor()
+    cursor.execute("DELETE FROM whiskey_search")
+    cursor.execute("""
+        INSERT INTO whiskey_search (rowid, name, distillery)
+        SELECT w.whiskey_id, w.name, COALESCE(dm.canonical_name, w.distillery)
+        FROM whiskeys w
+        LEFT JOIN distillery_mappings dm ON w.distillery = dm.variant_name
+    """)
+    # Merge b-tree segments so queries touch as few pages as possible
+    cursor.execute("INSERT INTO whiskey_search (whiskey_search) VALUES ('optimize')")
+    conn.commit()
+
+    cursor.execute("SELECT COUNT(*) FROM whiskey_search")
+    return cursor.fetchone()[0]
+
+
+if __name__ == '__main__':
+    db_path = Path(sys.argv[1]) if len(sys.argv) > 1 else DB_PATH
+    conn = connect_writer(db_path, wal=False)
+    if not has_search_index(conn):
+        print("✗ whiskey_search table not found - apply migrations/002_add_whiskey_search_fts.sql first")
+        sys.exit(1)
+    count = rebuild_search_index(conn)
+    conn.close()
+    print(f"✓ Rebuilt search index: {count} whiskeys")
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Persisted URL slugs for whiskeys.
+
+Slugs are stored in whiskeys.slug (unique index, added by
+migrations/005_add_whiskey_slugs.sql) so the API can return them without
+recomputing and resolve /api/whiskeys/<slug> with one index probe.
+Whiskeys whose names slugify identically get -2, -3, ... suffixes in
+whiskey_id order, so existing URLs never change when a new bottle arrives.
+
+Usage:
+    python3 slugs.py [path/to/whiskey_production.db]   # backfill missing slugs
+"""
+
+import re
+import sys
+from pathlib import Path
+
+from db_connections import connect_writer
+
+DB_PATH = Path(__file__).parent / "databases" / "whiskey_production.db"
+
+_UNSAFE_CHARS = re.compile(r'[^a-z0-9\s-]')
+_SEPARATORS = re.compile(r'[-\s]+')
+
+# Used when a name has no slug-safe characters at all
+FALLBACK_SLUG = "whiskey"
+
+# Fixed routes under /api/whiskeys/ that a whiskey slug would be shadowed by
+RESERVED_SLUGS = frozenset({"search", "autocomplete"})
+
+
+def create_slug(name):
+    """
+    Create URL-safe slug from whiskey name
+
+    Examples:
+        "Jack Daniel's Old No. 7" -> "jack-daniels-old-no-7"
+        "Maker's Mark 46" -> "makers-mark-46"
+        "Old Forester 1920 (Prohibition Style)" -> "old-forester-1920-prohibition-style"
+    """
+    if not name:
+        return ""
+
+    # Lowercase, drop everything but letters/digits/spaces/hyphens,
+    # collapse runs of spaces/hyphens, trim
+    slug = _UNSAFE_CHARS.sub('', name.lower())
+    slug = _SEPARATORS.sub('-', slug)
+    return slug.strip('-')
+
+
+def has_slug_column(conn):
+    """Return True if whiskeys.slug exists in this database."""
+    return 'slug' in {row[1] for row in conn.execute("PRAGMA table_info(whiskeys)")}
+
+
+def next_free_slug(base, taken):
+    """
+    First of base, base-2, base-3, ... not in `taken` or RESERVED_SLUGS.
+
+    Args:
+        base (str): Slug from create_slug() (may be empty)
+        taken: Container of slugs already in use
+    """
+    base = base or FALLBACK_SLUG
+    slug = base
+    suffix = 2
+    while slug in taken or slug in RESERVED_SLUGS:
+        slug = f"{base}-{suffix}"
+        suffix += 1
+    return slug
+
+
+def unique_slug(conn, name):
+    """
+    Slug for a new whiskey, suffixed if another whiskey already has it.
+
+    Args:
+        conn: Database connection (with the slug column)
+        name (str): Whiskey name
+
+    Returns:
+        str: Slug not yet present in whiskeys.slug
+    """
+    base = create_slug(name) or FALLBACK_SLUG
+    # base and every "base-..." slug, as index range scans ('.' sorts right after '-')
+    cursor = conn.execute("""
+        SELECT slug FROM whiskeys
+        WHERE slug = ? OR (slug >= ? AND slug < ?)
+    """, (base, base + '-', base + '.'))
+    return next_free_slug(base, {row[0] for row in cursor.fetchall()})
+
+
+def backfill_slugs(conn):
+    """
+    Assign slugs to every whiskey that doesn't have one yet.
+
+    Whiskeys are processed in whiskey_id order so the oldest entry keeps the
+    unsuffixed slug. Existing slugs are never changed.
+
+    Returns:
+        int or None: Number of slugs assigned, or None if the database has
+        no slug column (migration 005 not applied)
+    """
+    if not has_slug_column(conn):
+        return None
+
+    cursor = conn.cursor()
+    cursor.execute("SELECT slug FROM whiskeys WHERE slug IS NOT NULL")
+    taken = {row[0] for row in cursor.fetchall()}
+
+    cursor.execute("SELECT whiskey_id, name FROM whiskeys WHERE slug IS NULL ORDER BY whiskey_id")
+    updates = []
+    for whiskey_id, name in cursor.fetchall():
+        slug = next_free_slug(create_slug(name), taken)
+        taken.add(slug)
+        updates.append((slug, whiskey_id))
+
+    cursor.executemany("UPDATE whiskeys SET slug = ? WHERE whiskey_id = ?", updates)
+    conn.commit()
+    return len(updates)
+
+
+if __name__ == '__main__':
+    db_path = Path(sys.argv[1]) if len(sys.argv) > 1 else DB_PATH
+    conn = connect_writer(db_path, wal=False)
+    count = backfill_slugs(conn)
+    conn.close()
+    if count is None:
+        print("✗ whiskeys.slug column not found - apply migrations/005_add_whiskey_slugs.sql first")
+        sys.exit(1)
+    print(f"✓ Assigned {count} slugs")
@@ -0,0 +1,160 @@
+"""
+Per-worker in-memory snapshots of the production database.
+
+The API keeps a few read-only structures in memory (quiz corpus,
+autocomplete index, ...). Each one is built from the database once and
+rebuilt only when the database file changes.
+"""
+
+import gzip
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import NamedTuple, Optional, Tuple
+
+
+def file_signature(db_path) -> Optional[Tuple[int, int, int]]:
+    """
+    Cheap change detector for a database file: (inode, mtime_ns, size).
+
+    Returns None if the file doesn't exist.
+    """
+    try:
+        st = os.stat(db_path)
+    except FileNotFoundError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+class SnapshotCache:
+    """
+    Holds one immutable snapshot built from the database.
+
+    get() stats the database file and rebuilds the snapshot if it changed.
+    Readers always see a complete snapshot; the swap is a single reference
+    assignment, so no lock is taken on the fast path.
+    """
+
+    def __init__(self, db_path, connect, build):
+        """
+        Args:
+            db_path: Path to the SQLite database file
+            connect: Zero-argument callable returning a new sqlite3 connection
+                (closed after each build)
+            build: Callable taking a connection and returning the snapshot
+        """
+        self.db_path = db_path
+        self.connect = connect
+        self.build = build
+        self._state = None  # (signature, snapshot, built_at) once built
+        self._lock = threading.Lock()
+
+    @property
+    def signature(self):
+        """File signature the current snapshot was built from."""
+        state = self._state
+        return state[0] if state is not None else None
+
+    @property
+    def loaded(self):
+        """True once a snapshot has been built."""
+        return self._state is not None
+
+    def status(self):
+        """
+        Load state for health checks, without triggering a rebuild.
+
+        Returns:
+            dict: loaded (bool), age_seconds (since last build, or None),
+            current (built from the file as it is now)
+        """
+        state = self._state
+        if state is None:
+            return {"loaded": False, "age_seconds": None, "current": False}
+        return {
+            "loaded": True,
+            "age_seconds": round(time.monotonic() - state[2], 1),
+            "current": state[0] == file_signature(self.db_path),
+        }
+
+    def get(self):
+        """Return the current snapshot, reloading if the file changed."""
+        signature = file_signature(self.db_path)
+        state = self._state
+        if state is not None and state[0] == signature:
+            return state[1]
+
+        with self._lock:
+            # Another thread may have reloaded while we waited
+            state = self._state
+            if state is not None and state[0] == signature:
+                return state[1]
+
+            conn = self.connect()
+            try:
+                snapshot = self.build(conn)
+            finally:
+                conn.close()
+
+            self._state = (signature, snapshot, time.monotonic())
+            return snapshot
+
+
+class LRUCache:
+    """
+    Small thread-safe least-recently-used cache.
+
+    For per-worker caches of derived responses whose keys include the data
+    version, so entries for old data simply age out.
+    """
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """Return the cached value (marking it recently used), or None."""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        """Store a value, evicting the least recently used entry if full."""
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+
+class PreparedPayload(NamedTuple):
+    """A response body serialized once, plus its gzip-compressed form."""
+    body: bytes
+    gzipped: bytes
+
+
+def prepare_payload(body) -> PreparedPayload:
+    """
+    Serialize-once helper for responses that only change with the data.
+
+    Args:
+        body (str or bytes): Fully rendered response body
+
+    Returns:
+        PreparedPayload
+    """
+    if isinstance(body, str):
+        body = body.encode('utf-8')
+    return PreparedPayload(body, gzip.compress(body, compresslevel=9, mtime=0))
@@ -0,0 +1,169 @@
+"""
+Asynchronous, sampled, structured logging for the Flask API.
+
+Request threads only put LogRecords on an in-memory queue (QueueHandler);
+a QueueListener thread formats them as JSON lines and writes to stderr.
+Message arguments are formatted in the listener, so callers should use
+%-style arguments (logger.info("... %s", value)) - a level that is
+disabled then costs one isEnabledFor() check.
+
+Success logs (below WARNING) emitted during a request can be sampled per
+Flask endpoint; warnings and errors are always kept.
+
+Environment:
+    LOG_LEVEL=INFO                   # root level
+    LOG_FORMAT=json|text             # default json
+    LOG_SAMPLE_RATE=1.0              # default rate for request success logs
+    LOG_SAMPLE_RATES="search_whiskeys=0.05,get_quiz=0.2"   # per endpoint
+"""
+
+import atexit
+import json
+import logging
+import os
+import queue
+import random
+import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+from flask import has_request_context, request
+
+# LogRecord attributes that aren't user-supplied `extra` fields
+_STANDARD_ATTRS = frozenset(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {
+    'message', 'asctime', 'route'
+}
+
+
+def parse_sample_rates(spec):
+    """
+    Parse "endpoint=rate,endpoint=rate" into a dict.
+
+    Raises:
+        ValueError: On malformed entries or rates outside [0, 1]
+    """
+    rates = {}
+    for item in filter(None, (part.strip() for part in (spec or '').split(','))):
+        endpoint, _, rate = item.partition('=')
+        value = float(rate)
+        if not endpoint or not 0.0 <= value <= 1.0:
+            raise ValueError(f"Invalid log sample rate: {item!r}")
+        rates[endpoint.strip()] = value
+    return rates
+
+
+class RequestSamplingFilter(logging.Filter):
+    """
+    Tag records with the Flask endpoint and drop a share of success logs.
+
+    Runs in the request thread (attached to the QueueHandler), so the
+    request context is still available and dropped records never reach
+    the queue.
+    """
+
+    def __init__(self, sample_rates=None, default_rate=1.0, rng=random.random):
+        super().__init__()
+        self.sample_rates = sample_rates or {}
+        self.default_rate = default_rate
+        self.rng = rng
+
+    def filter(self, record):
+        if not has_request_context():
+            return True
+        route = request.endpoint or 'unmatched'
+        record.route = route
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self.sample_rates.get(route, self.default_rate)
+        return rate >= 1.0 or self.rng() < rate
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: ts, level, logger, message, route, extras, exc."""
+
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        route = getattr(record, 'route', None)
+        if route:
+            entry["route"] = route
+        for key, value in vars(record).items():
+            if key not in _STANDARD_ATTRS:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class DeferredQueueHandler(QueueHandler):
+    """
+    QueueHandler that leaves formatting to the listener thread.
+
+    The stdlib prepare() renders the message in the calling thread; here the
+    record goes on the queue untouched (the queue never leaves the process).
+    """
+
+    def prepare(self, record):
+        return record
+
+
+_listener = None
+
+
+def configure_logging(level=None, json_format=None, sample_rates=None, default_sample_rate=None):
+    """
+    Route all logging through a queue to a background writer thread.
+
+    Arguments default to the LOG_* environment variables. Safe to call
+    more than once (e.g. again in a forked worker): the previous listener
+    is stopped and replaced.
+
+    Returns:
+        QueueListener: The running listener
+    """
+    global _listener
+
+    level = level or os.getenv('LOG_LEVEL', 'INFO')
+    if json_format is None:
+        json_format = os.getenv('LOG_FORMAT', 'json') == 'json'
+    if sample_rates is None:
+        sample_rates = parse_sample_rates(os.getenv('LOG_SAMPLE_RATES', ''))
+    if default_sample_rate is None:
+        default_sample_rate = float(os.getenv('LOG_SAMPLE_RATE', 1.0))
+
+    stream = logging.StreamHandler(sys.stderr)
+    if json_format:
+        stream.setFormatter(JsonFormatter())
+    else:
+        stream.setFormatter(logging.Formatter('%(asctime)s [%(levelname)s] %(name)s: %(message)s'))
+
+    log_queue = queue.SimpleQueue()
+    handler = DeferredQueueHandler(log_queue)
+    handler.addFilter(RequestSamplingFilter(sample_rates, default_sample_rate))
+
+    root = logging.getLogger()
+    if _listener is not None:
+        _listener.stop()
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(level)
+
+    _listener = QueueListener(log_queue, stream, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+
+def stop_logging():
+    """Flush queued records and stop the writer thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(stop_logging)
@@ -8,9 +8,14 @@ import sqlite3
 from pathlib import Path
 import json
 
+import pytest
+
 # Import the app
 from app import app, get_db_connection
 
+# Runs against the synthetic catalog from conftest.py
+pytestmark = pytest.mark.usefixtures("production_db")
+
 def test_health():
     """Test health check endpoint"""
     print("\n" + "=" * 80)
@@ -106,6 +111,38 @@ def test_quiz_invalid():
         assert 'error' in data
         print("✅ Error handling works!")
 
+def test_quiz_batch():
+    """Test batch quiz endpoint with a mix of valid and invalid IDs"""
+    print("\n" + "=" * 80)
+    print("TEST 5: Batch Quiz Endpoint")
+    print("=" * 80)
+
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute("SELECT DISTINCT whiskey_id FROM aggregated_whiskey_descriptors LIMIT 2")
+    whiskey_ids = [row['whiskey_id'] for row in cursor.fetchall()]
+
+    with app.test_client() as client:
+        response = client.post('/api/quiz/batch', json={"whiskey_ids": whiskey_ids + [99999]})
+        data = response.get_json()
+
+        print(f"Status Code: {response.status_code}")
+        print(f"Quizzes: {data['count']}, Errors: {data['errors']}")
+
+        assert response.status_code == 200
+        assert sorted(data['quizzes']) == sorted(str(w) for w in whiskey_ids)
+        assert data['errors'] == {"99999": "Whiskey not found"}
+        for whiskey_id in whiskey_ids:
+            quiz = data['quizzes'][str(whiskey_id)]
+            assert quiz['whiskey']['id'] == whiskey_id
+            assert all(len(quiz['quiz'][s]['options']) <= 9 for s in ['nose', 'palate', 'finish'])
+
+        bad = client.post('/api/quiz/batch', json={"whiskey_ids": ["4"]})
+        assert bad.status_code == 400
+        too_many = client.post('/api/quiz/batch', json={"whiskey_ids": list(range(1, 1000))})
+        assert too_many.status_code == 400
+        print("✅ Batch quiz passed!")
+
 if __name__ == '__main__':
     print("=" * 80)
     print("FLASK API TEST SUITE")
@@ -116,6 +153,7 @@ if __name__ == '__main__':
         test_search()
         test_quiz()
         test_quiz_invalid()
+        test_quiz_batch()
 
         print("\n" + "=" * 80)
         print("ALL TESTS PASSED! ✅")
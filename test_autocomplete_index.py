@@ -0,0 +1,97 @@
+"""
+Tests for the in-memory autocomplete prefix index (autocomplete_index.py)
+"""
+
+import time
+
+from autocomplete_index import AutocompleteIndex, normalize_for_index
+
+TABLES = """
+    CREATE TABLE whiskeys (whiskey_id INTEGER PRIMARY KEY, name TEXT, distillery TEXT);
+    CREATE TABLE reviews (review_id INTEGER PRIMARY KEY, whiskey_id INTEGER);
+    CREATE TABLE distillery_mappings (variant_name TEXT UNIQUE, canonical_name TEXT);
+"""
+
+
+def add_catalog(conn):
+    """Four whiskeys with 3, 5, 1 and 0 reviews; buffalo trace has a canonical name"""
+    conn.execute("INSERT INTO distillery_mappings VALUES ('buffalo trace', 'Buffalo Trace Distillery')")
+    whiskeys = [
+        (1, "eagle rare 10 year", "buffalo trace", 3),
+        (2, "buffalo trace kentucky straight bourbon", "buffalo trace", 5),
+        (3, "maker's mark 46", "maker's mark", 1),
+        (4, "rare perfection 15 year", "rare perfection", 0),
+    ]
+    review_id = 0
+    for whiskey_id, name, distillery, review_count in whiskeys:
+        conn.execute("INSERT INTO whiskeys VALUES (?, ?, ?)", (whiskey_id, name, distillery))
+        for _ in range(review_count):
+            review_id += 1
+            conn.execute("INSERT INTO reviews VALUES (?, ?)", (review_id, whiskey_id))
+
+
+def test_normalize_for_index():
+    assert normalize_for_index("Maker's Mark 46") == "makers mark 46"
+    assert normalize_for_index("Old Forester 1920 (Prohibition Style)") == \
+        "old forester 1920 prohibition style"
+    assert normalize_for_index("   ") == ""
+
+
+def test_prefix_matches_any_word_ranked_by_popularity(make_test_db):
+    """'rare' hits words in the middle of names; more reviews rank first"""
+    index = AutocompleteIndex.load(make_test_db(TABLES, add_catalog))
+
+    names = [(s["type"], s["name"]) for s in index.suggest("rare")]
+    assert names == [
+        ("whiskey", "eagle rare 10 year"),
+        ("distillery", "rare perfection"),
+        ("whiskey", "rare perfection 15 year"),
+    ]
+
+    # Short prefixes come from the precomputed table with the same ordering
+    short = [(s["type"], s["name"]) for s in index.suggest("ra")]
+    assert short == names
+
+    assert [s["name"] for s in index.suggest("eagle ra")] == ["eagle rare 10 year"]
+    assert [s.get("whiskey_id") for s in index.suggest("makers")] == [None, 3]
+    assert index.suggest("zzz") == []
+    assert index.suggest("") == []
+
+
+def test_distilleries_are_suggested_with_counts(make_test_db):
+    """Canonical distilleries are indexed; popularity = their whiskeys' reviews"""
+    index = AutocompleteIndex.load(make_test_db(TABLES, add_catalog), slugify=lambda name: name.replace(" ", "-"))
+
+    top = index.suggest("buff", limit=2)
+    assert top[0] == {"type": "distillery", "name": "Buffalo Trace Distillery", "whiskey_count": 2}
+    assert top[1]["slug"] == "buffalo-trace-kentucky-straight-bourbon"
+    assert len(index.suggest("b", limit=1)) == 1
+
+
+def test_stored_slugs_are_not_recomputed(make_test_db):
+    """With the slug column, a whiskey without a stored slug gets None, not slugify()"""
+    conn = make_test_db(TABLES, add_catalog, """
+        ALTER TABLE whiskeys ADD COLUMN slug TEXT;
+        UPDATE whiskeys SET slug = 'eagle-rare-10-year' WHERE whiskey_id = 1;
+    """)
+    index = AutocompleteIndex.load(conn, slugify=lambda name: name.replace(" ", "-"))
+
+    slugs = {s["name"]: s["slug"] for s in index.suggest("rare") if s["type"] == "whiskey"}
+    assert slugs == {"eagle rare 10 year": "eagle-rare-10-year", "rare perfection 15 year": None}
+
+
+def test_lookup_is_fast_on_a_large_catalog(make_test_db):
+    """Lookups stay well under a millisecond with tens of thousands of names"""
+    conn = make_test_db(TABLES)
+    conn.executemany(
+        "INSERT INTO whiskeys (name, distillery) VALUES (?, ?)",
+        [(f"bourbon batch {i} cask {i % 97}", f"distillery {i % 500}") for i in range(20000)]
+    )
+    index = AutocompleteIndex.load(conn)
+
+    start = time.perf_counter()
+    for _ in range(200):
+        index.suggest("bourbon batch 1")
+        index.suggest("cask 4")
+    per_lookup = (time.perf_counter() - start) / 400
+    assert per_lookup < 0.005
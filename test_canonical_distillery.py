@@ -0,0 +1,81 @@
+"""
+Tests for the materialized canonical distillery column (migration 003)
+and the cached /api/distilleries payload
+"""
+
+import gzip
+import json
+import sqlite3
+
+from app import load_distilleries
+from create_distillery_mappings import refresh_canonical_distilleries
+
+MIGRATION = "003_add_canonical_distillery.sql"
+
+WHISKEYS = """
+    INSERT INTO distillery_mappings (variant_name, canonical_name) VALUES
+        ('buffalo trace', 'Buffalo Trace Distillery'),
+        ('buffalo trace distillery', 'Buffalo Trace Distillery');
+    INSERT INTO whiskeys (name, distillery) VALUES
+        ('eagle rare 10 year', 'buffalo trace'),
+        ('stagg jr', 'buffalo trace distillery'),
+        ('wild turkey 101', 'wild turkey'),
+        ('mystery bottle', ''),
+        ('no distillery', NULL);
+"""
+
+
+# Same rows before and after migration 003; load_distilleries() reads sqlite3.Row
+UNMIGRATED = dict(schema=True, mappings=True, row_factory=sqlite3.Row)
+MIGRATED = dict(UNMIGRATED, migrations=[MIGRATION])
+
+
+def as_tuples(distilleries):
+    return [(d["name"], d["whiskey_count"]) for d in distilleries]
+
+
+def test_materialized_column_matches_join(make_test_db):
+    """Both query paths produce the same list"""
+    expected = [("Buffalo Trace Distillery", 2), ("wild turkey", 1)]
+    assert as_tuples(load_distilleries(make_test_db(WHISKEYS, **UNMIGRATED))) == expected
+    assert as_tuples(load_distilleries(make_test_db(WHISKEYS, **MIGRATED))) == expected
+
+
+def test_triggers_maintain_column(make_test_db):
+    """New whiskeys, edits and mapping changes update canonical_distillery"""
+    conn = make_test_db(WHISKEYS, **MIGRATED)
+    conn.execute("INSERT INTO whiskeys (name, distillery) VALUES ('blanton''s', 'buffalo trace')")
+    conn.execute("INSERT INTO distillery_mappings (variant_name, canonical_name) "
+                 "VALUES ('wild turkey', 'Wild Turkey Distillery')")
+    assert as_tuples(load_distilleries(conn)) == [
+        ("Buffalo Trace Distillery", 3), ("Wild Turkey Distillery", 1)
+    ]
+
+    conn.execute("UPDATE whiskeys SET distillery = 'heaven hill' WHERE name = 'stagg jr'")
+    conn.execute("DELETE FROM distillery_mappings WHERE variant_name = 'wild turkey'")
+    assert as_tuples(load_distilleries(conn)) == [
+        ("Buffalo Trace Distillery", 2), ("heaven hill", 1), ("wild turkey", 1)
+    ]
+
+
+def test_refresh_repairs_drift(make_test_db):
+    """refresh_canonical_distilleries() resyncs, and skips unmigrated DBs"""
+    conn = make_test_db(WHISKEYS, **MIGRATED)
+    conn.execute("UPDATE whiskeys SET canonical_distillery = 'wrong'")
+    assert refresh_canonical_distilleries(conn) == 5
+    assert refresh_canonical_distilleries(conn) == 0
+    assert refresh_canonical_distilleries(make_test_db(WHISKEYS, **UNMIGRATED)) is None
+
+
+def test_distilleries_endpoint_serves_gzip(production_db):
+    """The cached payload decompresses to the same JSON as the plain body"""
+    from app import app
+
+    with app.test_client() as client:
+        plain = client.get('/api/distilleries')
+        assert plain.status_code == 200
+        zipped = client.get('/api/distilleries', headers={'Accept-Encoding': 'gzip'})
+
+    assert zipped.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in zipped.headers['Vary']
+    assert json.loads(gzip.decompress(zipped.data)) == plain.get_json()
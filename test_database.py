@@ -3,14 +3,20 @@ Test script for database.py
 Tests all utility functions and database operations
 """
 
-import sqlite3
+from pathlib import Path
+
+import pytest
+
+import database
 from database import (
     normalize_url, normalize_string, parse_date, get_current_timestamp,
     get_connection, insert_whiskey, find_whiskey, 
-    check_duplicate_review, insert_review,
-    DB_PATH
+    check_duplicate_review, insert_review, insert_reviews_bulk, load_review_urls,
+    create_whiskeys_table, create_reviews_table, backfill_match_keys, whiskey_match_key
 )
 
+MATCH_KEY_MIGRATION = Path(__file__).parent / "migrations" / "007_add_whiskey_match_keys.sql"
+
 def test_utility_functions():
     """Test all utility functions"""
     print("\n" + "="*60)
@@ -76,12 +82,14 @@ def test_utility_functions():
     print(f"  Format looks correct: {'✓' if len(timestamp) == 19 else '✗'}")
 
 
-def test_database_operations():
+def test_database_operations(tmp_path, monkeypatch):
     """Test all database operation functions"""
     print("\n" + "="*60)
     print("TESTING DATABASE OPERATIONS")
     print("="*60)
     
+    monkeypatch.setattr(database, "DB_PATH", tmp_path / "whiskey_reviews.db")
+    database.create_database()
     conn = get_connection()
     
     # Test 1: Insert first whiskey
@@ -172,10 +180,249 @@ def test_database_operations():
     print("\n" + "="*60)
     print("TESTING COMPLETE")
     print("="*60)
-    print(f"\nDatabase location: {DB_PATH}")
+    print(f"\nDatabase location: {database.DB_PATH}")
     print("Next step: Open database in DB Browser for SQLite to verify data")
 
 
+# whiskey_reviews.db as created before match keys and typed attributes
+BASELINE_SCRAPER_SCHEMA = """
+    CREATE TABLE whiskeys (
+        whiskey_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL,
+        distillery TEXT,
+        first_seen_date TEXT NOT NULL,
+        needs_review INTEGER DEFAULT 0
+    );
+    CREATE INDEX idx_whiskeys_name ON whiskeys(name);
+    CREATE TABLE reviews (
+        review_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        whiskey_id INTEGER NOT NULL,
+        source_site TEXT NOT NULL,
+        source_url TEXT NOT NULL,
+        normalized_url TEXT,
+        review_date TEXT,
+        date_scraped TEXT NOT NULL,
+        classification TEXT, company TEXT, proof TEXT, age TEXT, mashbill TEXT,
+        color TEXT, price TEXT, nose TEXT, palate TEXT, finish TEXT, rating TEXT,
+        overall_notes TEXT, additional_data TEXT,
+        FOREIGN KEY (whiskey_id) REFERENCES whiskeys(whiskey_id)
+    );
+    CREATE UNIQUE INDEX idx_reviews_unique ON reviews(source_site, normalized_url);
+"""
+
+
+BASELINE_SCRAPER_ROWS = """
+    INSERT INTO whiskeys (name, distillery, first_seen_date)
+    VALUES ('eagle rare', 'buffalo trace', '2026-01-01 00:00:00');
+    INSERT INTO whiskeys (name, first_seen_date) VALUES ('blanton''s', '2026-01-01 00:00:00');
+    INSERT INTO reviews (whiskey_id, source_site, source_url, normalized_url, date_scraped,
+                         proof, age, price)
+    VALUES (1, 'Breaking Bourbon', 'https://x.com/eagle-rare', 'https://x.com/eagle-rare',
+            '2026-01-01 00:00:00', '90 Proof', '10 Years', '$40');
+"""
+
+
+def test_create_database_upgrades_existing_scraper_db(make_test_db, tmp_path, monkeypatch):
+    """Startup adds and backfills match_key on an existing whiskey_reviews.db"""
+    db_path = tmp_path / "whiskey_reviews.db"
+    make_test_db(BASELINE_SCRAPER_SCHEMA, BASELINE_SCRAPER_ROWS, path=db_path).close()
+    monkeypatch.setattr(database, "DB_PATH", db_path)
+
+    database.create_database()
+    database.create_database()  # idempotent
+
+    conn = get_connection()
+    keys = dict(conn.execute("SELECT whiskey_id, match_key FROM whiskeys").fetchall())
+    assert keys == {1: "eagle rare|buffalo trace", 2: "blanton's|"}
+    plan = conn.execute("EXPLAIN QUERY PLAN SELECT whiskey_id FROM whiskeys WHERE match_key = ?",
+                        ("x",)).fetchall()
+    assert "idx_whiskeys_match_key" in plan[0][3]
+    assert find_whiskey(conn, "Eagle Rare", "Buffalo Trace") == 1
+    conn.close()
+
+
+def test_create_database_adds_typed_attributes_to_existing_scraper_db(make_test_db, tmp_path, monkeypatch):
+    """Startup adds the typed columns, parses stored reviews, and ingest fills them"""
+    db_path = tmp_path / "whiskey_reviews.db"
+    make_test_db(BASELINE_SCRAPER_SCHEMA, BASELINE_SCRAPER_ROWS, path=db_path).close()
+    monkeypatch.setattr(database, "DB_PATH", db_path)
+
+    database.create_database()
+    database.create_database()
+
+    conn = get_connection()
+    assert conn.execute("SELECT age_months, proof_numeric, price_usd FROM reviews").fetchone() == (120.0, 90.0, 40.0)
+    assert conn.execute("SELECT proof_numeric FROM whiskeys WHERE whiskey_id = 1").fetchone() == (90.0,)
+
+    insert_review(conn, {'name': "Blanton's", 'source_site': 'Breaking Bourbon',
+                         'source_url': 'https://x.com/blantons', 'proof': '93', 'price': '$65'})
+    assert conn.execute("SELECT proof_numeric, price_usd FROM whiskeys WHERE whiskey_id = 2").fetchone() == (93.0, 65.0)
+    conn.close()
+
+
+# Setup steps for a database with the current scraper schema
+SCRAPER_SCHEMA = (create_whiskeys_table, create_reviews_table)
+
+
+def test_insert_reviews_bulk_outcomes(make_test_db):
+    """Per-item outcomes; whiskeys resolved/created once; duplicates skipped"""
+    conn = make_test_db(*SCRAPER_SCHEMA)
+    existing_id = insert_whiskey(conn, "Eagle Rare", "Buffalo Trace Distillery")
+    assert insert_review(conn, {
+        'name': 'Eagle Rare', 'distillery': 'Buffalo Trace Distillery',
+        'source_site': 'Breaking Bourbon',
+        'source_url': 'https://www.breakingbourbon.com/review/eagle-rare',
+    }) is not None
+
+    outcomes = insert_reviews_bulk(conn, [
+        # already stored (URL differs only by case and tracking params)
+        {'name': 'Eagle Rare', 'source_site': 'Breaking Bourbon',
+         'source_url': 'https://www.BreakingBourbon.com/review/eagle-rare?utm_source=x'},
+        {'name': 'EAGLE RARE ', 'distillery': 'buffalo trace distillery',
+         'source_site': 'Bourbon Culture', 'source_url': 'https://thebourbonculture.com/eagle-rare'},
+        {'name': "Blanton's", 'source_site': 'Bourbon Banter',
+         'source_url': 'https://www.bourbonbanter.com/blantons', 'rating': '8/10'},
+        {'name': "blanton's", 'source_site': 'Whiskey Consensus',
+         'source_url': 'https://whiskeyconsensus.com/blantons'},
+        # repeated within the batch
+        {'name': "Blanton's", 'source_site': 'Bourbon Banter',
+         'source_url': 'https://www.bourbonbanter.com/blantons/'},
+        {'name': 'No URL', 'source_site': 'Bourbon Banter'},
+    ])
+
+    assert [o['status'] for o in outcomes] == [
+        'duplicate', 'inserted', 'inserted', 'inserted', 'duplicate', 'invalid'
+    ]
+    assert outcomes[1]['whiskey_id'] == existing_id
+    assert not outcomes[1]['created_whiskey']
+    assert outcomes[2]['created_whiskey'] and not outcomes[3]['created_whiskey']
+    assert outcomes[2]['whiskey_id'] == outcomes[3]['whiskey_id']
+    assert outcomes[5]['error'].startswith('Missing required fields')
+
+    review_ids = [o['review_id'] for o in outcomes if o['status'] == 'inserted']
+    stored = dict(conn.execute("SELECT review_id, source_site FROM reviews").fetchall())
+    assert [stored[review_id] for review_id in review_ids] == [
+        'Bourbon Culture', 'Bourbon Banter', 'Whiskey Consensus'
+    ]
+    assert conn.execute("SELECT COUNT(*) FROM whiskeys").fetchone()[0] == 2
+    assert not conn.in_transaction
+    conn.close()
+
+
+def test_conflicting_url_is_duplicate_without_orphan_whiskey(make_test_db):
+    """The unique (site, URL) index decides; a whiskey created for a duplicate is dropped"""
+    conn = make_test_db(*SCRAPER_SCHEMA)
+    url = 'https://www.breakingbourbon.com/review/eagle-rare'
+    insert_review(conn, {'name': 'Eagle Rare', 'source_site': 'Breaking Bourbon', 'source_url': url})
+
+    outcomes = insert_reviews_bulk(conn, [
+        {'name': 'Eagle Rare 10 Year', 'source_site': 'Breaking Bourbon', 'source_url': url + '/'},
+    ])
+    assert outcomes[0]['status'] == 'duplicate'
+    assert conn.execute("SELECT COUNT(*) FROM whiskeys").fetchone()[0] == 1
+    assert load_review_urls(conn, 'Breaking Bourbon') == {normalize_url(url)}
+    assert load_review_urls(conn, 'Bourbon Culture') == set()
+    conn.close()
+
+
+def test_ingest_stores_typed_attributes(make_test_db):
+    """age_months (from the scraper), proof and price are parsed at ingest"""
+    conn = make_test_db(*SCRAPER_SCHEMA)
+    outcomes = insert_reviews_bulk(conn, [
+        {'name': 'Eagle Rare', 'source_site': 'Breaking Bourbon',
+         'source_url': 'https://www.breakingbourbon.com/review/eagle-rare',
+         'proof': '90', 'age': '10 Years', 'age_months': 120.0, 'price': '$40'},
+        {'name': 'Eagle Rare', 'source_site': 'Bourbon Culture',
+         'source_url': 'https://thebourbonculture.com/eagle-rare',
+         'proof': 'Varies', 'age': '10 years, 2 months', 'price': '$45 (750ml)'},
+    ])
+    stored = conn.execute("""
+        SELECT age_months, proof_numeric, price_usd FROM reviews ORDER BY review_id
+    """).fetchall()
+    assert stored == [(120.0, 90.0, 40.0), (122.0, None, 45.0)]
+
+    whiskey = conn.execute("""
+        SELECT age_months, proof_numeric, price_usd FROM whiskeys WHERE whiskey_id = ?
+    """, (outcomes[0]['whiskey_id'],)).fetchone()
+    assert whiskey == (122.0, 90.0, 45.0)  # latest review that has each value
+    conn.close()
+
+
+def test_insert_review_wrapper_keeps_contract(make_test_db):
+    """insert_review() still returns an id / None and raises on bad input"""
+    conn = make_test_db(*SCRAPER_SCHEMA)
+    review = {'name': 'Eagle Rare', 'source_site': 'Breaking Bourbon',
+              'source_url': 'https://www.breakingbourbon.com/review/eagle-rare'}
+    review_id = insert_review(conn, review)
+    assert isinstance(review_id, int)
+    assert insert_review(conn, review) is None
+    with pytest.raises(ValueError):
+        insert_review(conn, {'name': 'Eagle Rare'})
+    conn.close()
+
+
+def test_match_key_migration_backfill_and_lookup(make_test_db):
+    """Legacy tables fall back to a scan; after 007 lookups probe the index"""
+    conn = make_test_db("""
+        CREATE TABLE migrations (migration_name TEXT, description TEXT);
+        CREATE TABLE whiskeys (
+            whiskey_id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL,
+            distillery TEXT, first_seen_date TEXT, needs_review INTEGER DEFAULT 0
+        );
+        INSERT INTO whiskeys (name, distillery) VALUES ('eagle rare', 'buffalo trace');
+        INSERT INTO whiskeys (name, distillery) VALUES ('Eagle  Rare', 'Buffalo Trace');
+        INSERT INTO whiskeys (name) VALUES ('blanton''s');
+    """)
+    assert find_whiskey(conn, "Eagle Rare", "Buffalo Trace") == 1
+    assert backfill_match_keys(conn) is None
+
+    conn.executescript(MATCH_KEY_MIGRATION.read_text())
+    assert backfill_match_keys(conn) == 2   # the duplicate stays NULL
+    keys = dict(conn.execute("SELECT whiskey_id, match_key FROM whiskeys").fetchall())
+    assert keys == {1: "eagle rare|buffalo trace", 2: None, 3: "blanton's|"}
+
+    plan = conn.execute("EXPLAIN QUERY PLAN SELECT whiskey_id FROM whiskeys WHERE match_key = ?",
+                        ("x",)).fetchall()
+    assert "idx_whiskeys_match_key" in plan[0][3]
+    assert find_whiskey(conn, " EAGLE RARE ", "buffalo trace") == 1
+    assert find_whiskey(conn, "Blanton's") == 3
+
+    # insert_whiskey() sets the key; the triggers cover other writers
+    new_id = insert_whiskey(conn, "Weller  12", "Buffalo Trace")
+    assert find_whiskey(conn, "weller 12", "buffalo trace") == new_id
+    conn.execute("INSERT INTO whiskeys (name, distillery) VALUES ('Stagg Jr', 'Buffalo Trace')")
+    assert find_whiskey(conn, "stagg jr", "buffalo trace") is not None
+    conn.execute("UPDATE whiskeys SET name = 'Stagg' WHERE name = 'Stagg Jr'")
+    assert find_whiskey(conn, "stagg jr", "buffalo trace") is None
+    assert find_whiskey(conn, "stagg", "buffalo trace") is not None
+    conn.close()
+
+
+def test_match_key_triggers_normalize_like_python(make_test_db):
+    """Keys set by the 007 triggers equal whiskey_match_key(), whitespace included"""
+    conn = make_test_db("""
+        CREATE TABLE migrations (migration_name TEXT, description TEXT);
+        CREATE TABLE whiskeys (
+            whiskey_id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL,
+            distillery TEXT, first_seen_date TEXT, needs_review INTEGER DEFAULT 0
+        );
+    """, migrations=[MATCH_KEY_MIGRATION.name])
+    names = [("Eagle  Rare", "Buffalo Trace"),
+             (" Old\tForester  1920 ", "Brown-Forman   Distillery"),
+             ("Weller\n\n  12", None),
+             ("   ", "Buffalo Trace")]
+    conn.executemany("INSERT INTO whiskeys (name, distillery) VALUES (?, ?)", names)
+    keys = [key for (key,) in conn.execute("SELECT match_key FROM whiskeys ORDER BY whiskey_id")]
+    assert keys == [whiskey_match_key(name, distillery) for name, distillery in names]
+    assert keys[:3] == ["eagle rare|buffalo trace", "old forester 1920|brown-forman distillery",
+                        "weller 12|"]
+    assert find_whiskey(conn, "Eagle Rare", "Buffalo Trace") == 1
+
+    conn.execute("UPDATE whiskeys SET name = 'Eagle   Rare  10' WHERE whiskey_id = 1")
+    assert find_whiskey(conn, "eagle rare 10", "buffalo trace") == 1
+    conn.close()
+
+
 if __name__ == "__main__":
     print("WHISKEY DATABASE TEST SUITE")
     print("=" * 60)
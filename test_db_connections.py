@@ -0,0 +1,137 @@
+"""
+Tests for the connection factory and read-only connection pool
+(db_connections.py)
+"""
+
+import sqlite3
+import threading
+
+import pytest
+
+from db_connections import (
+    WAL_AUTOCHECKPOINT_PAGES,
+    ReadOnlyConnectionPool,
+    checkpoint,
+    connect_readonly,
+    connect_writer,
+    is_wal,
+)
+
+
+WHISKEYS = """
+    CREATE TABLE whiskeys (whiskey_id INTEGER PRIMARY KEY, name TEXT);
+    INSERT INTO whiskeys (name) VALUES ('eagle rare');
+"""
+
+
+def test_readonly_connection_rejects_writes(make_test_db, tmp_path):
+    """Connections are opened mode=ro + query_only"""
+    db_path = tmp_path / "prod.db"
+    make_test_db(WHISKEYS, path=db_path).close()
+
+    conn = connect_readonly(db_path)
+    assert conn.execute("SELECT name FROM whiskeys").fetchone()['name'] == 'eagle rare'
+    assert conn.execute("PRAGMA query_only").fetchone()[0] == 1
+    assert conn.execute("PRAGMA temp_store").fetchone()[0] == 2  # MEMORY
+    with pytest.raises(sqlite3.OperationalError):
+        conn.execute("INSERT INTO whiskeys (name) VALUES ('nope')")
+    conn.close()
+
+
+def test_readonly_connection_does_not_create_missing_db(tmp_path):
+    """Unlike sqlite3.connect(), a missing file is an error, not a new empty DB"""
+    db_path = tmp_path / "missing.db"
+    with pytest.raises(sqlite3.OperationalError):
+        connect_readonly(db_path)
+    assert not db_path.exists()
+
+
+def test_pool_reuses_connection_per_thread(make_test_db, tmp_path):
+    """Same thread gets the same connection; other threads get their own"""
+    db_path = tmp_path / "prod.db"
+    make_test_db(WHISKEYS, path=db_path).close()
+    pool = ReadOnlyConnectionPool(db_path)
+
+    main_conn = pool.get()
+    assert pool.get() is main_conn
+
+    other = []
+    thread = threading.Thread(target=lambda: other.append(pool.get()))
+    thread.start()
+    thread.join()
+    assert other[0] is not main_conn
+
+    pool.close_all()
+
+
+def test_pool_recycles_closed_and_expired_connections(make_test_db, tmp_path):
+    """A connection closed by the caller or past max_age is replaced"""
+    db_path = tmp_path / "prod.db"
+    make_test_db(WHISKEYS, path=db_path).close()
+    pool = ReadOnlyConnectionPool(db_path)
+
+    first = pool.get()
+    first.close()
+    second = pool.get()
+    assert second is not first
+    assert second.execute("SELECT COUNT(*) FROM whiskeys").fetchone()[0] == 1
+
+    pool.max_age = 0
+    assert pool.get() is not second
+    pool.close_all()
+
+
+def test_writer_connection_uses_wal(tmp_path):
+    """Writers get WAL, synchronous=NORMAL, foreign keys and a bounded WAL"""
+    db_path = tmp_path / "scraper.db"
+    conn = connect_writer(db_path)
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+    assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+    assert conn.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+    assert conn.execute("PRAGMA busy_timeout").fetchone()[0] > 0
+    assert conn.execute("PRAGMA wal_autocheckpoint").fetchone()[0] == WAL_AUTOCHECKPOINT_PAGES
+    assert conn.execute("PRAGMA journal_size_limit").fetchone()[0] > 0
+    conn.close()
+    assert is_wal(db_path)
+
+
+def test_writer_connection_without_wal_keeps_rollback_journal(make_test_db, tmp_path):
+    """wal=False (the served production DB) stays a self-contained file"""
+    db_path = tmp_path / "prod.db"
+    make_test_db(WHISKEYS, path=db_path).close()
+    conn = connect_writer(db_path, wal=False)
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == 'delete'
+    assert conn.execute("PRAGMA synchronous").fetchone()[0] == 2  # FULL
+    conn.close()
+    assert not is_wal(db_path)
+
+
+def test_reader_sees_committed_rows_while_writer_is_open(tmp_path):
+    """In WAL mode a reader isn't blocked by an open write transaction"""
+    db_path = tmp_path / "scraper.db"
+    writer = connect_writer(db_path)
+    writer.execute("CREATE TABLE whiskeys (whiskey_id INTEGER PRIMARY KEY, name TEXT)")
+    writer.execute("INSERT INTO whiskeys (name) VALUES ('eagle rare')")
+    writer.commit()
+
+    writer.execute("INSERT INTO whiskeys (name) VALUES ('not yet')")  # left uncommitted
+    reader = connect_readonly(db_path)
+    assert [row['name'] for row in reader.execute("SELECT name FROM whiskeys")] == ['eagle rare']
+    reader.close()
+    writer.rollback()
+    writer.close()
+
+
+def test_checkpoint_truncates_wal(tmp_path):
+    db_path = tmp_path / "scraper.db"
+    conn = connect_writer(db_path)
+    conn.execute("CREATE TABLE reviews (review_id INTEGER PRIMARY KEY, body TEXT)")
+    with conn:
+        conn.executemany("INSERT INTO reviews (body) VALUES (?)", [("x" * 500,)] * 200)
+    wal_path = tmp_path / "scraper.db-wal"
+    assert wal_path.stat().st_size > 0
+
+    busy, _, _ = checkpoint(conn)
+    assert busy == 0
+    assert wal_path.stat().st_size == 0
+    conn.close()
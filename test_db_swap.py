@@ -0,0 +1,92 @@
+"""
+Tests for atomic database replacement (db_swap.py) and readers switching
+to the new file (ReadOnlyConnectionPool, SnapshotCache)
+"""
+
+import sqlite3
+
+import pytest
+
+from data_version import bump_data_version, read_data_version
+from db_connections import ReadOnlyConnectionPool, connect_readonly, connect_writer
+from db_swap import publish, stage_copy, versioned_path
+from snapshots import SnapshotCache
+
+
+# Live file at data version 2
+LIVE = """
+    CREATE TABLE whiskeys (whiskey_id INTEGER PRIMARY KEY, name TEXT);
+    INSERT INTO whiskeys (name) VALUES ('eagle rare');
+"""
+
+
+def rename_whiskey(path, name):
+    conn = sqlite3.connect(path)
+    conn.execute("UPDATE whiskeys SET name = ?", (name,))
+    bump_data_version(conn)
+    conn.close()
+
+
+def test_stage_copy_is_versioned_and_leaves_live_file_alone(make_test_db, tmp_path):
+    live = tmp_path / "whiskey_production.db"
+    make_test_db(LIVE, bump_data_version, path=live).close()
+
+    staged, _ = stage_copy(live)
+    assert staged == versioned_path(live, 3) == tmp_path / "whiskey_production.v3.db"
+
+    rename_whiskey(staged, "blanton's")
+    conn = sqlite3.connect(live)
+    assert conn.execute("SELECT name FROM whiskeys").fetchone()[0] == "eagle rare"
+    conn.close()
+
+
+def test_readers_switch_to_published_file(make_test_db, tmp_path):
+    live = tmp_path / "whiskey_production.db"
+    make_test_db(LIVE, bump_data_version, path=live).close()
+    pool = ReadOnlyConnectionPool(live)
+    names = SnapshotCache(live, lambda: connect_readonly(live),
+                          lambda conn: conn.execute("SELECT name FROM whiskeys").fetchone()[0])
+
+    old_conn = pool.get()
+    assert names.get() == "eagle rare"
+
+    staged, signature = stage_copy(live)
+    rename_whiskey(staged, "blanton's")
+    # Readers are unaffected until the swap
+    assert pool.get() is old_conn
+    assert pool.get().execute("SELECT name FROM whiskeys").fetchone()[0] == "eagle rare"
+
+    publish(staged, live, signature)
+    assert not staged.exists()
+
+    new_conn = pool.get()
+    assert new_conn is not old_conn
+    assert new_conn.execute("SELECT name FROM whiskeys").fetchone()[0] == "blanton's"
+    assert read_data_version(new_conn) == 3
+    assert names.get() == "blanton's"
+    pool.close_all()
+
+
+def test_publish_refuses_if_live_file_changed(make_test_db, tmp_path):
+    live = tmp_path / "whiskey_production.db"
+    make_test_db(LIVE, bump_data_version, path=live).close()
+
+    staged, signature = stage_copy(live)
+    rename_whiskey(live, "written meanwhile")
+    with pytest.raises(RuntimeError):
+        publish(staged, live, signature)
+
+    conn = sqlite3.connect(live)
+    assert conn.execute("SELECT name FROM whiskeys").fetchone()[0] == "written meanwhile"
+    conn.close()
+
+
+def test_publish_refuses_wal_live_file(make_test_db, tmp_path):
+    """A -wal file left next to the live path would be applied to the new file"""
+    live = tmp_path / "whiskey_production.db"
+    make_test_db(LIVE, bump_data_version, path=live).close()
+    staged, _ = stage_copy(live)
+    connect_writer(live).close()  # switches the live file to WAL
+
+    with pytest.raises(RuntimeError):
+        publish(staged, live)
@@ -0,0 +1,109 @@
+"""
+Tests for descriptor neighbor lists (descriptor_similarity.py, migration 006)
+and difficulty-based distractors in the quiz corpus
+"""
+
+import random
+
+from descriptor_similarity import (
+    compute_neighbors, load_neighbors, pack_ids, rebuild_descriptor_neighbors, unpack_ids
+)
+from quiz_corpus import QuizCorpus, SectionCorpus
+
+MIGRATION = "006_add_descriptor_neighbors.sql"
+
+DESCRIPTORS = {
+    1: ("vanilla", "sweet"), 2: ("caramel", "sweet"), 3: ("toffee", "sweet"),
+    4: ("oak", "woody"), 5: ("cedar", "woody"),
+    6: ("pepper", "spicy"), 7: ("cinnamon", "spicy"), 8: ("cherry", "fruity"),
+}
+TAGS = {1: (1, 2, 4), 2: (1, 2, 6), 3: (3, 4, 5), 4: (6, 7, 8), 5: (2, 3, 8)}
+
+
+def load_tags(conn):
+    for descriptor_id, (name, category) in DESCRIPTORS.items():
+        conn.execute(
+            "INSERT INTO descriptor_vocabulary (descriptor_id, descriptor_name, category, applicable_sections) "
+            "VALUES (?, ?, ?, '[\"nose\"]')", (descriptor_id, name, category)
+        )
+    for whiskey_id, descriptor_ids in TAGS.items():
+        conn.execute("INSERT INTO whiskeys (whiskey_id, name) VALUES (?, ?)", (whiskey_id, f"w{whiskey_id}"))
+        for descriptor_id in descriptor_ids:
+            conn.execute("""
+                INSERT INTO aggregated_whiskey_descriptors
+                (whiskey_id, descriptor_id, tasting_section, source_review_ids, review_count)
+                VALUES (?, ?, 'nose', '[]', 1)
+            """, (whiskey_id, descriptor_id))
+
+
+def corpus_db(make_test_db, migrate=True):
+    """Tagged corpus; migrated databases also get their neighbor lists"""
+    if not migrate:
+        return make_test_db(load_tags, schema=True)
+    conn = make_test_db(load_tags, schema=True, migrations=[MIGRATION])
+    rebuild_descriptor_neighbors(conn)
+    return conn
+
+
+def test_pack_round_trip():
+    assert unpack_ids(pack_ids([3, 70000, 1])) == (3, 70000, 1)
+    assert len(pack_ids([1, 2, 3])) == 12
+
+
+def test_neighbors_rank_cooccurrence_plus_category(make_test_db):
+    # vanilla: caramel (co-occurs twice + same category), then oak/pepper
+    # (co-occur once), then toffee (same category only)
+    assert compute_neighbors(corpus_db(make_test_db, migrate=False))["nose"][1] == [2, 4, 6, 3]
+
+
+def test_neighbors_stored_and_loaded(make_test_db):
+    conn = corpus_db(make_test_db)
+    stored = load_neighbors(conn)["nose"]
+    assert set(stored) == set(DESCRIPTORS)
+    assert stored[1] == (2, 4, 6, 3)
+    assert load_neighbors(corpus_db(make_test_db, migrate=False)) == {}
+    assert rebuild_descriptor_neighbors(corpus_db(make_test_db, migrate=False)) is None
+
+
+def test_hard_distractors_come_from_neighbors(make_test_db):
+    corpus = QuizCorpus.load(corpus_db(make_test_db))
+    neighbors = corpus.sections["nose"].neighbors
+    near = {d for anchor in (3, 4, 5) for d in neighbors[anchor]} - {3, 4, 5}
+    rng = random.Random(3)
+    for _ in range(20):
+        picked = corpus.sample_distractors("nose", 3, 2, rng, difficulty="hard", anchors=(3, 4, 5))
+        assert len(set(picked)) == 2
+        assert set(picked) <= near
+
+
+def test_easy_distractors_avoid_correct_categories(make_test_db):
+    corpus = QuizCorpus.load(corpus_db(make_test_db))
+    picked = corpus.sample_distractors("nose", 1, 3, random.Random(1), difficulty="easy")
+    assert set(picked) == {6, 7, 8}
+
+
+def test_easy_distractors_keep_uncategorized_descriptors(make_test_db):
+    # No category known for vanilla (a correct answer), cinnamon or cherry
+    corpus = QuizCorpus.load(corpus_db(make_test_db))
+    for descriptor_id in (1, 7, 8):
+        del corpus.descriptor_categories[descriptor_id]
+    picked = corpus._dissimilar(corpus.sections["nose"], frozenset({1, 2, 4}), 3, random.Random(1))
+    assert set(picked) == {6, 7, 8}
+
+
+def test_easy_distractors_top_up_past_the_first_sample():
+    # One correct answer among 60 "sweet" descriptors, and only 3 from another category
+    categories = {d: "sweet" for d in range(1, 61)}
+    categories.update({61: "spicy", 62: "spicy", 63: "spicy"})
+    section = SectionCorpus(correct={1: (1,)}, correct_sets={1: frozenset({1})}, pool=tuple(categories),
+                            neighbors={})
+    corpus = QuizCorpus({"nose": section}, {}, categories)
+    for seed in range(20):
+        assert sorted(corpus.sample_distractors("nose", 1, 3, random.Random(seed), difficulty="easy")) == [61, 62, 63]
+
+
+def test_hard_mode_without_neighbor_lists_falls_back_to_random(make_test_db):
+    corpus = QuizCorpus.load(corpus_db(make_test_db, migrate=False))
+    picked = corpus.sample_distractors("nose", 3, 4, random.Random(2), difficulty="hard", anchors=(3, 4, 5))
+    assert len(set(picked)) == 4
+    assert not set(picked) & {3, 4, 5}
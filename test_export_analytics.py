@@ -0,0 +1,105 @@
+"""
+Tests for the Parquet export and DuckDB query helper (export_analytics.py)
+"""
+
+import json
+
+import pytest
+
+pq = pytest.importorskip("pyarrow.parquet")
+
+from data_version import bump_data_version
+from export_analytics import export_analytics, query
+from review_bodies import create_review_bodies_table, pack
+
+
+CORPUS = """
+    CREATE TABLE whiskeys (whiskey_id INTEGER PRIMARY KEY, name TEXT, proof_numeric REAL);
+    CREATE TABLE reviews (review_id INTEGER PRIMARY KEY, whiskey_id INTEGER,
+                          source_site TEXT, overall_notes TEXT);
+    CREATE TABLE review_descriptors (review_descriptor_id INTEGER PRIMARY KEY, review_id INTEGER,
+                                     descriptor_id INTEGER, tasting_section TEXT);
+    CREATE TABLE aggregated_whiskey_descriptors (aggregated_descriptor_id INTEGER PRIMARY KEY,
+                                                 whiskey_id INTEGER, descriptor_id INTEGER,
+                                                 tasting_section TEXT, review_count INTEGER);
+    INSERT INTO whiskeys (name, proof_numeric) VALUES ('eagle rare', 90.0), ('blanton''s', NULL);
+    INSERT INTO reviews (whiskey_id, source_site, overall_notes) VALUES
+        (1, 'Breaking Bourbon', 'cherry'), (1, 'Whiskey/Jug', 'oak'),
+        (2, 'Breaking Bourbon', NULL), (2, NULL, 'vanilla');
+"""
+
+
+def tag_reviews(conn):
+    """Descriptors 7 and 8 on the nose and finish of reviews 1-3"""
+    conn.executemany(
+        "INSERT INTO review_descriptors (review_id, descriptor_id, tasting_section) VALUES (?, ?, ?)",
+        [(review_id, descriptor_id, section)
+         for review_id in (1, 2, 3) for descriptor_id in (7, 8) for section in ("nose", "finish")],
+    )
+
+
+def test_export_is_partitioned_and_queryable(make_test_db, tmp_path):
+    db_path = tmp_path / "test.db"
+    make_test_db(CORPUS, tag_reviews, bump_data_version, path=db_path)
+    out = tmp_path / "analytics"
+
+    manifest = export_analytics(db_path, out, batch_rows=3)
+
+    assert manifest["data_version"] == 2
+    assert json.loads((out / "manifest.json").read_text())["tables"] == manifest["tables"]
+    assert manifest["tables"]["reviews"]["rows"] == 4
+    assert manifest["tables"]["reviews"]["files"] == 3  # two sites plus NULL
+    assert manifest["tables"]["aggregated_whiskey_descriptors"]["rows"] == 0
+    # The partition column lives in the directory name only
+    assert "source_site" not in pq.read_schema(
+        out / "reviews" / "source_site=Breaking Bourbon" / "part-0.parquet").names
+
+    pytest.importorskip("duckdb")
+    sites = query("SELECT source_site, COUNT(*) AS n FROM reviews GROUP BY 1 ORDER BY 1 NULLS LAST",
+                  export_dir=out).to_pylist()
+    assert sites == [{"source_site": "Breaking Bourbon", "n": 2},
+                     {"source_site": "Whiskey/Jug", "n": 1},
+                     {"source_site": None, "n": 1}]
+
+    usage = query("""
+        SELECT w.name, COUNT(*) AS tags FROM review_descriptors rd
+        JOIN reviews r USING (review_id) JOIN whiskeys w USING (whiskey_id)
+        WHERE rd.tasting_section = ? GROUP BY 1 ORDER BY 1
+    """, ["nose"], export_dir=out).to_pylist()
+    assert usage == [{"name": "blanton's", "tags": 2}, {"name": "eagle rare", "tags": 4}]
+    assert query("SELECT COUNT(*) AS n FROM aggregated_whiskey_descriptors",
+                 export_dir=out).to_pylist() == [{"n": 0}]
+
+
+def test_reexport_replaces_previous_files(make_test_db, tmp_path):
+    db_path = tmp_path / "test.db"
+    conn = make_test_db(CORPUS, tag_reviews, bump_data_version, path=db_path)
+    out = tmp_path / "analytics"
+    export_analytics(db_path, out)
+
+    conn.execute("DELETE FROM reviews WHERE source_site = 'Whiskey/Jug'")
+    conn.commit()
+    manifest = export_analytics(db_path, out)
+
+    assert manifest["tables"]["reviews"]["rows"] == 3
+    assert sorted(path.name for path in (out / "reviews").iterdir()) == [
+        "source_site=Breaking Bourbon", "source_site=__HIVE_DEFAULT_PARTITION__"]
+    assert not list(out.glob(".*.tmp"))
+
+
+def test_review_bodies_are_exported_as_text(make_test_db, tmp_path):
+    db_path = tmp_path / "test.db"
+    notes = "Cherry cola and oak, then baking spice. " * 20
+
+    def add_body(conn):
+        create_review_bodies_table(conn)
+        conn.execute("INSERT INTO review_bodies (review_id, nose, overall_notes) VALUES (1, 'oak', ?)",
+                     (pack(notes),))
+
+    make_test_db(CORPUS, tag_reviews, add_body, bump_data_version, path=db_path)
+
+    out = tmp_path / "analytics"
+    assert export_analytics(db_path, out)["tables"]["review_bodies"]["rows"] == 1
+    table = pq.read_table(out / "review_bodies" / "part-0.parquet")
+    assert table.column("overall_notes").to_pylist() == [notes]
+    assert table.column("nose").to_pylist() == ["oak"]
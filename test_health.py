@@ -0,0 +1,53 @@
+"""
+Tests for the liveness/readiness probes and snapshot status
+"""
+
+import sqlite3
+
+from snapshots import SnapshotCache
+
+
+def test_snapshot_status_does_not_build(tmp_path):
+    db_path = tmp_path / "prod.db"
+    sqlite3.connect(db_path).close()
+    builds = []
+    cache = SnapshotCache(db_path, lambda: sqlite3.connect(db_path), builds.append)
+
+    assert cache.status() == {"loaded": False, "age_seconds": None, "current": False}
+    assert builds == []
+
+    cache.get()
+    status = cache.status()
+    assert status["loaded"] and status["current"]
+    assert status["age_seconds"] >= 0
+
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("CREATE TABLE t (x)")
+    assert cache.status()["current"] is False
+    assert len(builds) == 1
+
+
+def test_live_probe_needs_no_database():
+    from app import app
+
+    with app.test_client() as client:
+        response = client.get('/api/health/live')
+    assert response.status_code == 200
+    assert response.get_json()["status"] == "ok"
+
+
+def test_ready_probe_uses_cached_counters(production_db):
+    import app as api
+
+    with api.app.test_client() as client:
+        first = client.get('/api/health/ready')
+        assert first.status_code == 200
+        assert set(first.get_json()["snapshots"]) == {"quiz_corpus", "autocomplete_index", "distilleries"}
+
+        # Same data version -> served from the cache, no COUNT(*) queries
+        api._catalog_state["counts"] = dict(api._catalog_state["counts"], whiskeys=-1)
+        assert client.get('/api/health/ready').get_json()["whiskeys"] == -1
+        assert client.get('/api/health').get_json()["whiskeys"] == -1
+
+        api._catalog_state["version"] = None
+        assert client.get('/api/health/ready').get_json()["whiskeys"] == first.get_json()["whiskeys"]
@@ -0,0 +1,131 @@
+"""
+Tests for the data_version marker and ETag / 304 handling in app.py
+"""
+
+import sqlite3
+
+import pytest
+
+from data_version import bump_data_version, read_data_version
+
+
+def test_bump_creates_and_increments_version():
+    """bump_data_version() works on databases without the table"""
+    conn = sqlite3.connect(":memory:")
+    assert read_data_version(conn) is None
+    assert bump_data_version(conn) == 2
+    assert bump_data_version(conn) == 3
+    assert read_data_version(conn) == 3
+
+
+@pytest.fixture
+def client(production_db):
+    from app import app
+
+    with app.test_client() as client:
+        yield client
+
+
+def test_etag_and_304(client):
+    """Cacheable endpoints carry an ETag and honour If-None-Match"""
+    first = client.get('/api/whiskeys/search?q=bourbon')
+    etag = first.headers['ETag']
+    assert first.headers['Cache-Control'].startswith('public')
+
+    again = client.get('/api/whiskeys/search?q=bourbon', headers={'If-None-Match': etag})
+    assert again.status_code == 304
+    assert again.data == b''
+    assert again.headers['ETag'] == etag
+
+    other = client.get('/api/whiskeys/search?q=rye', headers={'If-None-Match': etag})
+    assert other.status_code == 200
+    assert other.headers['ETag'] != etag
+
+
+def test_gzip_and_identity_have_different_etags(client):
+    """Strong ETags differ per content encoding"""
+    plain = client.get('/api/distilleries')
+    zipped = client.get('/api/distilleries', headers={'Accept-Encoding': 'gzip'})
+    assert plain.headers['ETag'] != zipped.headers['ETag']
+
+
+def test_errors_and_quiz_are_not_cached(client):
+    """Only successful responses of configured endpoints get validators"""
+    bad = client.get('/api/whiskeys/search?q=')
+    assert bad.status_code == 400
+    assert 'ETag' not in bad.headers
+
+    quiz = client.get('/api/quiz/99999')
+    assert 'ETag' not in quiz.headers
+
+
+def test_lru_cache_evicts_least_recently_used():
+    from snapshots import LRUCache
+
+    cache = LRUCache(2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1   # 'b' is now least recently used
+    cache.put('c', 3)
+    assert cache.get('b') is None
+    assert (cache.get('a'), cache.get('c')) == (1, 3)
+    assert len(cache) == 2
+
+
+def quiz_whiskey_id():
+    from app import get_db_connection
+
+    conn = get_db_connection()
+    try:
+        row = conn.execute("""
+            SELECT whiskey_id FROM aggregated_whiskey_descriptors
+            GROUP BY whiskey_id
+            HAVING COUNT(DISTINCT tasting_section) = 3
+            ORDER BY whiskey_id LIMIT 1
+        """).fetchone()
+    finally:
+        conn.close()
+    if row is None:
+        pytest.skip("No whiskey with a complete quiz")
+    return row[0]
+
+
+def test_seeded_quiz_is_deterministic_and_cacheable(client):
+    """Same seed -> same body with an immutable ETag; unseeded stays uncached"""
+    whiskey_id = quiz_whiskey_id()
+    url = f'/api/quiz/{whiskey_id}?seed=42&difficulty=hard'
+
+    first = client.get(url)
+    assert first.status_code == 200
+    assert first.get_json()['seed'] == 42
+    assert 'immutable' in first.headers['Cache-Control']
+
+    from app import seeded_quizzes
+    seeded_quizzes._entries.clear()  # regenerate rather than hit the LRU
+    again = client.get(url)
+    assert again.data == first.data
+    assert again.headers['ETag'] == first.headers['ETag']
+
+    assert client.get(url, headers={'If-None-Match': first.headers['ETag']}).status_code == 304
+
+    other_seeds = {client.get(f'/api/quiz/{whiskey_id}?seed={seed}&difficulty=hard').data
+                   for seed in range(1, 6)}
+    assert len(other_seeds | {first.data}) > 1
+
+    unseeded = client.get(f'/api/quiz/{whiskey_id}')
+    assert 'ETag' not in unseeded.headers
+    assert 'seed' not in unseeded.get_json()
+
+
+def test_seeded_batch_matches_single_quiz(client):
+    whiskey_id = quiz_whiskey_id()
+    single = client.get(f'/api/quiz/{whiskey_id}?seed=7').get_json()
+    batch = client.post('/api/quiz/batch', json={'whiskey_ids': [whiskey_id], 'seed': 7}).get_json()
+    assert batch['quizzes'][str(whiskey_id)] == single
+
+
+@pytest.mark.parametrize('seed', ['-1', 'abc', '2147483648', '1.5'])
+def test_invalid_seed_rejected(client, seed):
+    response = client.get(f'/api/quiz/1?seed={seed}')
+    assert response.status_code == 400
+    assert 'ETag' not in response.headers
@@ -0,0 +1,49 @@
+"""
+Tests for the synthetic catalog builder and load-test statistics in benchmarks/
+"""
+
+import sqlite3
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / "benchmarks"))
+
+from load_test import percentile, request_paths, summarize
+from quiz_corpus import QuizCorpus
+from synthetic_catalog import build_catalog
+
+
+def test_percentile_nearest_rank():
+    values = list(range(1, 101))
+    assert percentile(values, 50) == 50
+    assert percentile(values, 99) == 99
+    assert percentile(values, 100) == 100
+    assert percentile([7], 95) == 7
+    assert percentile([], 50) is None
+
+
+def test_summarize_reports_milliseconds():
+    row = summarize("test_client", "search", [0.002, 0.001, 0.003], errors=1, seconds=0.5)
+    assert row["requests"] == 3
+    assert row["rps"] == 6.0
+    assert row["p50_ms"] == 2.0
+    assert row["p99_ms"] == 3.0
+
+
+def test_build_catalog_matches_production_schema(tmp_path):
+    db_path = tmp_path / "catalog.db"
+    counts = build_catalog(db_path, scale=0.05, reviews_per_whiskey=2)
+    assert counts["whiskeys"] == 30
+    assert counts["reviews"] == 60
+
+    conn = sqlite3.connect(db_path)
+    assert conn.execute("SELECT COUNT(*) FROM whiskeys WHERE slug IS NULL").fetchone()[0] == 0
+    assert conn.execute("SELECT COUNT(*) FROM descriptor_neighbors").fetchone()[0] > 0
+    assert conn.execute("SELECT COUNT(*) FROM whiskey_search").fetchone()[0] == 30
+    corpus = QuizCorpus.load(conn)
+    assert len(corpus.sections["nose"].correct) == 30
+    conn.close()
+
+    quiz_paths = request_paths(db_path, "quiz", 5)
+    assert quiz_paths == request_paths(db_path, "quiz", 5)
+    assert all(path.startswith("/api/quiz/") for path in quiz_paths)
@@ -0,0 +1,64 @@
+"""
+Tests for request/SQL metrics (metrics.py) and /api/metrics
+"""
+
+from db_connections import ReadOnlyConnectionPool
+from metrics import Histogram, MetricsRegistry, instrumented_connect, sql_counters
+
+
+def test_histogram_buckets_are_inclusive_and_cumulative():
+    hist = Histogram((0.01, 0.1))
+    for value in (0.005, 0.01, 0.05, 3.0):
+        hist.observe(value)
+    assert list(hist.cumulative()) == [(0.01, 2), (0.1, 3), ('+Inf', 4)]
+    assert hist.count == 4
+
+
+def test_registry_tracks_in_flight_and_renders_prometheus_text():
+    registry = MetricsRegistry()
+    registry.request_started("search_whiskeys")
+    assert registry.endpoints["search_whiskeys"].in_flight == 1
+
+    sql_counters.statements = 3
+    registry.request_finished("search_whiskeys", 200, 0.004)
+    text = registry.render()
+
+    assert 'whiskey_api_requests_in_flight{endpoint="search_whiskeys"} 0' in text
+    assert 'whiskey_api_request_duration_seconds_bucket{endpoint="search_whiskeys",le="0.005"} 1' in text
+    assert 'whiskey_api_request_duration_seconds_count{endpoint="search_whiskeys"} 1' in text
+    assert 'whiskey_api_responses_total{endpoint="search_whiskeys",status="200"} 1' in text
+    assert 'whiskey_api_sql_statements_total{endpoint="search_whiskeys"} 3' in text
+    assert "# TYPE whiskey_api_request_duration_seconds histogram" in text
+
+
+def test_pooled_connections_count_and_time_sql(make_test_db, tmp_path):
+    db_path = tmp_path / "prod.db"
+    make_test_db("CREATE TABLE whiskeys (whiskey_id INTEGER PRIMARY KEY, name TEXT)", path=db_path).close()
+
+    pool = ReadOnlyConnectionPool(db_path, connect=instrumented_connect)
+    conn = pool.get()
+    sql_counters.statements = 0
+    sql_counters.seconds = 0.0
+
+    conn.execute("SELECT * FROM whiskeys").fetchall()
+    cursor = conn.cursor()
+    cursor.execute("SELECT COUNT(*) FROM whiskeys")
+    assert cursor.fetchone()[0] == 0
+
+    assert sql_counters.statements == 2
+    assert sql_counters.seconds > 0
+    pool.close_all()
+
+
+def test_metrics_endpoint(production_db):
+    from app import app
+
+    with app.test_client() as client:
+        assert client.get('/api/distilleries').status_code == 200
+        client.get('/api/does-not-exist')
+        response = client.get('/api/metrics')
+
+    assert response.mimetype == 'text/plain'
+    text = response.get_data(as_text=True)
+    assert 'whiskey_api_responses_total{endpoint="get_distilleries",status="200"}' in text
+    assert 'whiskey_api_responses_total{endpoint="unmatched",status="404"}' in text
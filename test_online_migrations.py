@@ -0,0 +1,125 @@
+"""
+Tests for the migration runner's bookkeeping, resumable chunked Python
+migrations and online backups (online_migrations.py)
+"""
+
+import json
+import sqlite3
+
+import pytest
+
+from online_migrations import (
+    applied_migrations,
+    backup_database,
+    ensure_migrations_table,
+    pending_migrations,
+    run_python_migration,
+)
+
+MIGRATION = '''
+from online_migrations import Backfill
+
+DESCRIPTION = 'Double every value'
+FAIL_AFTER = None  # set by the test to simulate an interruption
+calls = []
+
+
+def schema(conn):
+    conn.execute("ALTER TABLE items ADD COLUMN doubled INTEGER")
+
+
+def double(conn, first, last):
+    if FAIL_AFTER is not None and len(calls) >= FAIL_AFTER:
+        raise KeyboardInterrupt
+    calls.append((first, last))
+    conn.execute("UPDATE items SET doubled = value * 2 WHERE rowid BETWEEN ? AND ?", (first, last))
+
+
+BACKFILLS = [Backfill('double', 'items', double)]
+'''
+
+
+def items(rows=25):
+    """Setup step: items with values 0..rows-1, and the migrations table"""
+    def setup(conn):
+        conn.execute("CREATE TABLE items (item_id INTEGER PRIMARY KEY, value INTEGER)")
+        conn.executemany("INSERT INTO items (value) VALUES (?)", [(n,) for n in range(rows)])
+        ensure_migrations_table(conn)
+    return setup
+
+
+def migration_row(conn, name):
+    status, checkpoint = conn.execute(
+        "SELECT status, checkpoint FROM migrations WHERE migration_name = ?", (name,)
+    ).fetchone()
+    return status, json.loads(checkpoint)
+
+
+def test_interrupted_backfill_resumes_from_checkpoint(make_test_db, tmp_path):
+    conn = make_test_db(items())
+    path = tmp_path / "010_double_values.py"
+    path.write_text(MIGRATION.replace("FAIL_AFTER = None", "FAIL_AFTER = 2"))
+
+    with pytest.raises(KeyboardInterrupt):
+        run_python_migration(conn, path, chunk_size=10, log=lambda message: None)
+
+    # Two chunks committed, the third rolled back; not marked applied
+    assert migration_row(conn, "010_double_values") == ("in_progress", {"double": 20})
+    assert conn.execute("SELECT COUNT(*) FROM items WHERE doubled IS NOT NULL").fetchone()[0] == 20
+    assert "010_double_values" not in applied_migrations(conn)
+
+    path.write_text(MIGRATION)
+    processed = run_python_migration(conn, path, chunk_size=10, log=lambda message: None)
+
+    # Only the remaining rows are processed, and schema() isn't rerun
+    assert processed == 5
+    assert migration_row(conn, "010_double_values") == ("applied", {"double": 25})
+    assert conn.execute("SELECT COUNT(*) FROM items WHERE doubled = value * 2").fetchone()[0] == 25
+    assert "010_double_values" in applied_migrations(conn)
+
+
+def test_pending_migrations_compare_by_stem(make_test_db, tmp_path):
+    conn = make_test_db(items())
+    conn.execute("INSERT INTO migrations (migration_name) VALUES ('000_initial_schema')")
+    conn.execute("INSERT INTO migrations (migration_name) VALUES ('002_add_search')")
+    for name in ("001_add_quiz_tables.sql", "002_add_search.sql", "003_backfill.py",
+                 "run_migration.py", "README.md"):
+        (tmp_path / name).write_text("")
+
+    pending = pending_migrations(tmp_path, applied_migrations(conn))
+
+    # 001 is part of the baseline schema; 002 was recorded without its suffix
+    assert [path.name for path in pending] == ["003_backfill.py"]
+
+
+def test_ensure_migrations_table_upgrades_old_table(make_test_db):
+    conn = make_test_db("""
+        CREATE TABLE migrations (
+            migration_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            migration_name TEXT UNIQUE NOT NULL,
+            applied_at TEXT NOT NULL DEFAULT (datetime('now')),
+            description TEXT
+        );
+        INSERT INTO migrations (migration_name) VALUES ('001_add_quiz_tables');
+    """)
+
+    ensure_migrations_table(conn)
+    ensure_migrations_table(conn)
+
+    assert applied_migrations(conn) == {"001_add_quiz_tables"}
+
+
+def test_backup_database_copies_while_connection_is_open(make_test_db, tmp_path):
+    db_path = tmp_path / "whiskey_production.db"
+    conn = make_test_db(items(rows=500), path=db_path)
+    conn.execute("BEGIN")
+    conn.execute("UPDATE items SET value = -1")  # uncommitted; not in the backup
+
+    backup = backup_database(db_path)
+    conn.rollback()
+
+    assert backup.parent == tmp_path / "backups"
+    copy = sqlite3.connect(backup)
+    assert copy.execute("PRAGMA integrity_check").fetchone()[0] == "ok"
+    assert copy.execute("SELECT COUNT(*), MIN(value) FROM items").fetchone() == (500, 0)
+    copy.close()
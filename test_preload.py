@@ -0,0 +1,48 @@
+"""
+Tests for gunicorn preload mode (gunicorn.conf.py and the fork hooks in app.py)
+"""
+
+import gc
+import importlib.util
+import logging
+from pathlib import Path
+
+import app
+
+CONF_PATH = Path(__file__).parent / "gunicorn.conf.py"
+
+
+def load_conf(monkeypatch, **env):
+    for key, value in env.items():
+        monkeypatch.setenv(key, value)
+    spec = importlib.util.spec_from_file_location("gunicorn_conf", CONF_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_preload_is_default_and_can_be_disabled(monkeypatch):
+    assert load_conf(monkeypatch, PORT="8123").preload_app is True
+    assert load_conf(monkeypatch).bind == "0.0.0.0:8123"
+
+    conf = load_conf(monkeypatch, PRELOAD_APP="0", WEB_CONCURRENCY="3")
+    assert conf.preload_app is False
+    assert conf.workers == 3
+
+
+def test_prepare_for_fork_closes_connections_and_freezes(production_db):
+    app.db_pool.get()
+    assert app.db_pool._all
+    try:
+        app.prepare_for_fork()
+        assert app.db_pool._all == []
+        assert gc.get_freeze_count() > 0
+    finally:
+        gc.unfreeze()
+
+
+def test_reinit_after_fork_restarts_log_writer():
+    app.reinit_after_fork()
+    handlers = logging.getLogger().handlers
+    assert len(handlers) == 1
+    assert type(handlers[0]).__name__ == "DeferredQueueHandler"
@@ -0,0 +1,78 @@
+"""
+Tests for the in-memory quiz corpus (quiz_corpus.py)
+Builds a tiny database from schema_mvp_v2.sql, no production DB needed
+"""
+
+import random
+import sqlite3
+
+from quiz_corpus import QuizCorpus, QuizCorpusCache
+from snapshots import file_signature
+
+
+def build_sample_db(conn):
+    """3 whiskeys with descriptors in every section (on top of schema_mvp_v2.sql)"""
+    for i in range(1, 13):
+        conn.execute(
+            "INSERT INTO descriptor_vocabulary (descriptor_id, descriptor_name, category, applicable_sections) "
+            "VALUES (?, ?, 'sweet', '[\"nose\", \"palate\", \"finish\"]')",
+            (i, f"descriptor {i:02d}")
+        )
+    for whiskey_id in (1, 2, 3):
+        conn.execute("INSERT INTO whiskeys (whiskey_id, name) VALUES (?, ?)",
+                     (whiskey_id, f"whiskey {whiskey_id}"))
+    # whiskey 1 -> 1..6, whiskey 2 -> 4..9, whiskey 3 -> 7..12
+    for whiskey_id, start in ((1, 1), (2, 4), (3, 7)):
+        for section in ('nose', 'palate', 'finish'):
+            for offset, descriptor_id in enumerate(range(start, start + 6)):
+                conn.execute("""
+                    INSERT INTO aggregated_whiskey_descriptors
+                    (whiskey_id, descriptor_id, tasting_section, source_review_ids, review_count)
+                    VALUES (?, ?, ?, '[]', ?)
+                """, (whiskey_id, descriptor_id, section, 6 - offset))
+    conn.commit()
+
+
+def test_correct_descriptors_ordered_by_review_count(make_test_db):
+    """Correct descriptors keep the review_count DESC ordering"""
+    conn = make_test_db(build_sample_db, schema=True)
+    corpus = QuizCorpus.load(conn)
+
+    assert corpus.correct_descriptors('nose', 1) == (1, 2, 3, 4, 5, 6)
+    assert corpus.correct_descriptors('finish', 3) == (7, 8, 9, 10, 11, 12)
+    assert corpus.correct_descriptors('nose', 999) == ()
+    assert corpus.sections['palate'].pool == tuple(range(1, 13))
+    assert corpus.name(5) == "descriptor 05"
+
+
+def test_distractors_exclude_correct_descriptors(make_test_db):
+    """Distractors never include one of the whiskey's own descriptors"""
+    conn = make_test_db(build_sample_db, schema=True)
+    corpus = QuizCorpus.load(conn)
+    rng = random.Random(7)
+
+    for _ in range(50):
+        picked = corpus.sample_distractors('nose', 1, 3, rng)
+        assert len(picked) == 3
+        assert len(set(picked)) == 3
+        assert not set(picked) & {1, 2, 3, 4, 5, 6}
+
+
+def test_cache_reloads_when_file_changes(make_test_db, tmp_path):
+    """QuizCorpusCache rebuilds the snapshot after the DB file is modified"""
+    db_path = tmp_path / "quiz.db"
+    make_test_db(build_sample_db, schema=True, path=db_path).close()
+
+    cache = QuizCorpusCache(db_path, lambda: sqlite3.connect(db_path))
+    first = cache.get()
+    assert cache.get() is first
+    assert cache.signature == file_signature(db_path)
+
+    conn = sqlite3.connect(db_path)
+    conn.execute("DELETE FROM aggregated_whiskey_descriptors WHERE whiskey_id = 3")
+    conn.commit()
+    conn.close()
+
+    second = cache.get()
+    assert second is not first
+    assert second.correct_descriptors('nose', 3) == ()
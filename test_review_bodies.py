@@ -0,0 +1,111 @@
+"""
+Tests for the review text side table (review_bodies.py, migration 010)
+"""
+
+from pathlib import Path
+
+import pytest
+
+import review_bodies
+from db_connections import connect_readonly
+from online_migrations import ensure_migrations_table, run_python_migration
+from review_bodies import BODY_COLUMNS, attach_review_texts, inline_body_columns, pack, unpack
+
+MIGRATION = Path(__file__).parent / "migrations" / "010_split_review_bodies.py"
+
+LONG_NOTES = "Cherry, oak and baking spice up front; the finish is long and drying. " * 10
+
+REVIEWS = f"""
+    CREATE TABLE reviews (review_id INTEGER PRIMARY KEY AUTOINCREMENT, whiskey_id INTEGER,
+                          source_url TEXT, {", ".join(f"{column} TEXT" for column in BODY_COLUMNS)});
+    INSERT INTO reviews (whiskey_id, source_url, nose, nose_text, overall_notes) VALUES
+        (1, 'https://example.com/1', 'cherry | oak', 'cherry | oak', '{LONG_NOTES}'),
+        (1, 'https://example.com/2', 'vanilla', 'vanilla', 'short notes'),
+        (2, 'https://example.com/3', NULL, NULL, NULL);
+"""
+
+
+def review_texts(conn):
+    attach_review_texts(conn)
+    return conn.execute("SELECT * FROM review_texts ORDER BY review_id").fetchall()
+
+
+def test_pack_compresses_only_long_values():
+    assert pack("short notes") == "short notes"
+    assert pack(None) is None
+    packed = pack(LONG_NOTES)
+    assert isinstance(packed, bytes) and len(packed) < len(LONG_NOTES)
+    assert unpack(packed) == LONG_NOTES
+    assert pack(LONG_NOTES, compression="none") == LONG_NOTES
+
+
+def test_migration_moves_text_and_view_is_unchanged(make_test_db):
+    conn = make_test_db(REVIEWS, ensure_migrations_table)
+    before = review_texts(conn)
+
+    run_python_migration(conn, MIGRATION, chunk_size=2, log=lambda message: None)
+
+    assert inline_body_columns(conn) == []
+    assert conn.execute("SELECT source_url FROM reviews WHERE review_id = 1").fetchone()[0] == "https://example.com/1"
+    # A review with no text gets no body row; the long notes are stored compressed
+    assert conn.execute("SELECT review_id FROM review_bodies ORDER BY review_id").fetchall() == [(1,), (2,)]
+    assert conn.execute("SELECT typeof(overall_notes) FROM review_bodies WHERE review_id = 1").fetchone()[0] == "blob"
+    assert review_texts(conn) == before
+
+
+def test_review_inserted_during_backfill_is_copied_at_finalize(make_test_db, monkeypatch):
+    conn = make_test_db(REVIEWS, ensure_migrations_table)
+    copy = review_bodies.copy_review_bodies
+
+    def copy_then_insert(conn, first_id=None, last_id=None, missing_only=False):
+        written = copy(conn, first_id, last_id, missing_only)
+        if not missing_only:
+            conn.execute("INSERT INTO reviews (whiskey_id, nose_text) VALUES (3, 'late arrival')")
+        return written
+
+    monkeypatch.setattr(review_bodies, "copy_review_bodies", copy_then_insert)
+    run_python_migration(conn, MIGRATION, chunk_size=10, log=lambda message: None)
+
+    attach_review_texts(conn)
+    assert conn.execute("SELECT nose_text FROM review_texts WHERE whiskey_id = 3").fetchone()[0] == "late arrival"
+
+
+def test_review_edited_after_its_chunk_was_copied_is_recopied(make_test_db, monkeypatch):
+    conn = make_test_db(REVIEWS, ensure_migrations_table)
+    copy = review_bodies.copy_review_bodies
+
+    def copy_then_edit(conn, first_id=None, last_id=None, missing_only=False):
+        written = copy(conn, first_id, last_id, missing_only)
+        if first_id == 3:
+            conn.execute("UPDATE reviews SET overall_notes = 'revised' WHERE review_id = 1")
+            conn.execute("DELETE FROM reviews WHERE review_id = 2")
+        return written
+
+    monkeypatch.setattr(review_bodies, "copy_review_bodies", copy_then_edit)
+    run_python_migration(conn, MIGRATION, chunk_size=2, log=lambda message: None)
+
+    attach_review_texts(conn)
+    assert conn.execute("SELECT review_id, overall_notes FROM review_texts").fetchall() == [(1, "revised"), (3, None)]
+    assert conn.execute("SELECT review_id FROM review_bodies").fetchall() == [(1,)]
+    assert conn.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'").fetchall() == []
+
+
+def test_refuses_scraper_database(make_test_db):
+    conn = make_test_db(REVIEWS, ensure_migrations_table)
+    conn.execute("CREATE TABLE scraper_runs (run_id INTEGER PRIMARY KEY)")
+
+    with pytest.raises(RuntimeError, match="scraper database"):
+        run_python_migration(conn, MIGRATION, log=lambda message: None)
+
+    assert inline_body_columns(conn) == list(BODY_COLUMNS)
+    assert conn.execute("SELECT COUNT(*) FROM migrations").fetchone()[0] == 0
+
+
+def test_view_on_read_only_connection(make_test_db, tmp_path):
+    db_path = tmp_path / "test.db"
+    run_python_migration(make_test_db(REVIEWS, ensure_migrations_table, path=db_path), MIGRATION,
+                         log=lambda message: None)
+
+    conn = connect_readonly(db_path, row_factory=None)
+    assert review_texts(conn)[0][BODY_COLUMNS.index("overall_notes") + 2] == LONG_NOTES
+    assert conn.execute("PRAGMA query_only").fetchone()[0] == 1
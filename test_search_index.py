@@ -0,0 +1,107 @@
+"""
+Tests for the FTS5 whiskey search index (search_index.py + migration 002)
+"""
+
+from search_index import has_search_index, rebuild_search_index, search_whiskeys
+
+MIGRATION = "002_add_whiskey_search_fts.sql"
+
+WHISKEYS = """
+    INSERT INTO distillery_mappings (variant_name, canonical_name)
+    VALUES ('buffalo trace', 'Buffalo Trace Distillery');
+    INSERT INTO whiskeys (name, distillery) VALUES
+        ('eagle rare 10 year', 'buffalo trace'),
+        ('garrison brothers cowboy bourbon (2025)', 'garrison brothers'),
+        ('wild turkey rare breed', 'wild turkey');
+"""
+
+
+def test_fts_matches_like_results(make_test_db):
+    """FTS and LIKE paths return the same whiskeys in the same JSON shape"""
+    conn = make_test_db(WHISKEYS, schema=True, mappings=True, migrations=[MIGRATION])
+    assert has_search_index(conn)
+
+    for query in ("rare", "GARRISON", "trace distillery", "xyz123notfound"):
+        fts = search_whiskeys(conn, query, 20)
+        like = search_whiskeys(conn, query, 20, use_fts=False)
+        assert sorted(fts) == sorted(like), query
+
+
+def test_name_hits_rank_above_distillery_hits(make_test_db):
+    """bm25 weights favour matches in the whiskey name"""
+    conn = make_test_db(WHISKEYS, schema=True, mappings=True, migrations=[MIGRATION])
+    conn.execute("INSERT INTO whiskeys (name, distillery) VALUES ('old elk', 'rare spirits co')")
+    names = [row[1] for row in search_whiskeys(conn, "rare", 20)]
+    assert names[-1] == 'old elk'
+
+
+def test_triggers_keep_index_in_sync(make_test_db):
+    """Inserts, updates, deletes and mapping changes reach the index"""
+    conn = make_test_db(WHISKEYS, schema=True, mappings=True, migrations=[MIGRATION])
+    conn.execute("INSERT INTO whiskeys (name, distillery) VALUES ('blanton''s original', 'buffalo trace')")
+    assert search_whiskeys(conn, "blanton", 5)[0][2] == 'Buffalo Trace Distillery'
+
+    conn.execute("UPDATE whiskeys SET name = 'stagg jr' WHERE name = 'blanton''s original'")
+    assert search_whiskeys(conn, "blanton", 5) == []
+    assert len(search_whiskeys(conn, "stagg", 5)) == 1
+
+    conn.execute("INSERT INTO distillery_mappings (variant_name, canonical_name) "
+                 "VALUES ('wild turkey', 'Wild Turkey Distillery')")
+    assert search_whiskeys(conn, "breed", 5)[0][2] == 'Wild Turkey Distillery'
+    conn.execute("DELETE FROM distillery_mappings WHERE variant_name = 'wild turkey'")
+    assert search_whiskeys(conn, "breed", 5)[0][2] == 'wild turkey'
+
+    conn.execute("DELETE FROM whiskeys WHERE name = 'stagg jr'")
+    assert search_whiskeys(conn, "stagg", 5) == []
+    assert rebuild_search_index(conn) == 3
+
+
+def test_short_queries_and_unmigrated_db_use_like(make_test_db):
+    """Queries under 3 characters and DBs without the index still work"""
+    conn = make_test_db(WHISKEYS, schema=True, mappings=True)
+    assert not has_search_index(conn)
+    assert len(search_whiskeys(conn, "rare", 20, use_fts=False)) == 2
+
+    migrated = make_test_db(WHISKEYS, schema=True, mappings=True, migrations=[MIGRATION])
+    assert len(search_whiskeys(migrated, "ra", 20)) == 2
+
+
+def test_range_filters_use_typed_columns(make_test_db):
+    """Migration 008 columns, backfilled by the scraper's parsers, filter results"""
+    from database import backfill_numeric_attributes
+
+    conn = make_test_db(WHISKEYS, schema=True, mappings=True,
+                        migrations=[MIGRATION, "008_add_numeric_attributes.sql"])
+    conn.executemany("UPDATE whiskeys SET proof = ?, age = ?, price = ? WHERE name = ?", [
+        ("90", "10 Years", "$40", "eagle rare 10 year"),
+        ("136.9 (Barrel Proof)", "NAS", "$150-$200", "garrison brothers cowboy bourbon (2025)"),
+        ("58.4% ABV", None, "N/A", "wild turkey rare breed"),
+    ])
+    assert backfill_numeric_attributes(conn) == 3
+    assert backfill_numeric_attributes(conn) == 0
+
+    def names(query, ranges):
+        return sorted(row[1] for row in search_whiskeys(conn, query, 20, ranges=ranges))
+
+    assert names(None, {'proof_numeric': (100, None)}) == [
+        'garrison brothers cowboy bourbon (2025)', 'wild turkey rare breed'
+    ]
+    assert names("rare", {'proof_numeric': (None, 100)}) == ['eagle rare 10 year']
+    assert names("ra", {'age_months': (96, 144)}) == ['eagle rare 10 year']  # LIKE path
+    assert names(None, {'price_usd': (100, 500), 'proof_numeric': (130, 140)}) == [
+        'garrison brothers cowboy bourbon (2025)'
+    ]
+
+
+def test_parse_range_filters():
+    """Age is given in years; bad or inverted bounds are rejected"""
+    from app import parse_range_filters
+
+    ranges, error = parse_range_filters({'min_proof': '100', 'max_age': '12', 'max_price': ''})
+    assert error is None
+    assert ranges == {'proof_numeric': (100.0, None), 'age_months': (None, 144.0)}
+
+    for args in ({'min_proof': 'abc'}, {'min_price': '-5'}, {'min_age': 'nan'},
+                 {'min_proof': '120', 'max_proof': '90'}):
+        ranges, error = parse_range_filters(args)
+        assert ranges is None and error
@@ -0,0 +1,54 @@
+"""
+Tests for the pluggable JSON serializer (serialization.py)
+"""
+
+import json
+from datetime import date
+
+import pytest
+
+import serialization
+
+PAYLOAD = {
+    "query": "buffalo",
+    "results": [{"whiskey_id": 1, "name": "blanton’s", "distillery": None, "slug": "blantons"}],
+    "count": 1,
+    "ok": True,
+    "ratio": 0.5,
+}
+
+
+def test_backends_produce_identical_bytes():
+    """Switching backends never changes a response body (or its ETag)"""
+    bodies = {name: dumps(PAYLOAD) for name, dumps in serialization.SERIALIZERS.items()}
+    assert len(set(bodies.values())) == 1
+    assert json.loads(bodies["stdlib"]) == PAYLOAD
+
+
+def test_non_native_types_use_flask_default():
+    for dumps in serialization.SERIALIZERS.values():
+        assert dumps({"day": date(2026, 1, 28)}) == b'{"day":"Wed, 28 Jan 2026 00:00:00 GMT"}'
+
+
+def test_use_switches_and_validates():
+    original = serialization.active_serializer()
+    try:
+        serialization.use("stdlib")
+        assert serialization.active_serializer() == "stdlib"
+        assert serialization.dumps([1, 2]) == b"[1,2]"
+    finally:
+        serialization.use(original)
+
+    with pytest.raises(ValueError):
+        serialization.use("pickle")
+
+
+def test_jsonify_uses_provider():
+    from flask import Flask, jsonify
+
+    app = Flask(__name__)
+    app.json = serialization.FastJSONProvider(app)
+    with app.app_context():
+        response = jsonify(PAYLOAD)
+    assert response.get_data() == serialization.dumps(PAYLOAD) + b"\n"
+    assert response.mimetype == "application/json"
@@ -0,0 +1,109 @@
+"""
+Tests for persisted whiskey slugs (migration 005) and slug lookup
+"""
+
+import sqlite3
+
+import pytest
+
+from database import create_whiskeys_table, insert_whiskey
+from slugs import backfill_slugs, create_slug, unique_slug
+
+MIGRATION = "005_add_whiskey_slugs.sql"
+
+
+def insert_names(*names):
+    """Setup step adding whiskeys by name, in whiskey_id order"""
+    return lambda conn: conn.executemany("INSERT INTO whiskeys (name) VALUES (?)", [(name,) for name in names])
+
+
+def test_create_slug():
+    assert create_slug("Jack Daniel's Old No. 7") == "jack-daniels-old-no-7"
+    assert create_slug("Old Forester 1920 (Prohibition Style)") == "old-forester-1920-prohibition-style"
+    assert create_slug("  --Stagg  Jr-- ") == "stagg-jr"
+    assert create_slug(None) == ""
+
+
+def test_backfill_suffixes_collisions_in_id_order(make_test_db):
+    conn = make_test_db(insert_names("Stagg Jr", "stagg jr.", "Stagg-Jr", "???", "stagg jr 2"),
+                        schema=True, migrations=[MIGRATION])
+    assert backfill_slugs(conn) == 5
+    slugs = [row[0] for row in conn.execute("SELECT slug FROM whiskeys ORDER BY whiskey_id")]
+    # "stagg jr 2" would naturally be stagg-jr-2, already taken by the second row
+    assert slugs == ["stagg-jr", "stagg-jr-2", "stagg-jr-3", "whiskey", "stagg-jr-2-2"]
+    assert backfill_slugs(conn) == 0
+
+
+def test_backfill_skips_unmigrated_db(make_test_db):
+    conn = make_test_db(schema=True)
+    assert backfill_slugs(conn) is None
+
+
+def test_unique_slug_and_index(make_test_db):
+    conn = make_test_db(insert_names("eagle rare", "eagle rare 10 year"),
+                        schema=True, migrations=[MIGRATION])
+    backfill_slugs(conn)
+    assert unique_slug(conn, "Eagle Rare!") == "eagle-rare-2"
+    assert unique_slug(conn, "eagle") == "eagle"
+    with pytest.raises(sqlite3.IntegrityError):
+        conn.execute("UPDATE whiskeys SET slug = 'eagle-rare' WHERE whiskey_id = 2")
+
+
+def test_route_names_are_never_slugs(make_test_db):
+    conn = make_test_db(insert_names("Search", "autocomplete", "search"),
+                        schema=True, migrations=[MIGRATION])
+    backfill_slugs(conn)
+    assert [row[0] for row in conn.execute("SELECT slug FROM whiskeys ORDER BY whiskey_id")] == [
+        "search-2", "autocomplete-2", "search-3"]
+    assert unique_slug(conn, "Search!") == "search-4"
+    assert unique_slug(conn, "Autocomplete") == "autocomplete-3"
+
+
+def test_insert_whiskey_sets_slug():
+    """Ingest fills the slug on migrated databases and ignores it otherwise"""
+    conn = sqlite3.connect(":memory:")
+    create_whiskeys_table(conn)
+    insert_whiskey(conn, "Blanton's Original")
+
+    conn.execute("ALTER TABLE whiskeys ADD COLUMN slug TEXT")
+    first = insert_whiskey(conn, "Blanton's Original", "Buffalo Trace")
+    second = insert_whiskey(conn, "blantons original", "Buffalo Trace")
+    rows = dict(conn.execute("SELECT whiskey_id, slug FROM whiskeys"))
+    assert rows == {1: None, first: "blantons-original", second: "blantons-original-2"}
+
+
+def test_slug_endpoint(production_db):
+    from app import app
+
+    with app.test_client() as client:
+        search = client.get('/api/whiskeys/search?q=bourbon')
+        assert search.status_code == 200
+        hit = search.get_json()['results'][0]
+
+        response = client.get(f"/api/whiskeys/{hit['slug']}")
+        assert response.status_code == 200
+        assert response.get_json() == hit
+        assert 'ETag' in response.headers
+
+        assert client.get('/api/whiskeys/no-such-whiskey-anywhere').status_code == 404
+        assert client.get('/api/whiskeys/Bad_Slug').status_code == 400
+
+
+def test_search_leaves_unassigned_slugs_null(production_db):
+    """A whiskey another writer added without a slug gets null, not an unresolvable slug"""
+    from app import app
+
+    conn = sqlite3.connect(production_db)
+    whiskey_id = conn.execute(
+        "INSERT INTO whiskeys (name, distillery) VALUES ('zzunslugged rye', 'nowhere')"
+    ).lastrowid
+    conn.commit()
+    try:
+        with app.test_client() as client:
+            results = client.get('/api/whiskeys/search?q=zzunslugged').get_json()['results']
+            assert [(r['whiskey_id'], r['slug']) for r in results] == [(whiskey_id, None)]
+            assert client.get('/api/whiskeys/zzunslugged-rye').status_code == 404
+    finally:
+        conn.execute("DELETE FROM whiskeys WHERE whiskey_id = ?", (whiskey_id,))
+        conn.commit()
+        conn.close()
@@ -0,0 +1,70 @@
+"""
+Tests for queued, sampled JSON logging (structured_logging.py)
+"""
+
+import json
+import logging
+import queue
+
+import pytest
+from flask import Flask
+
+from structured_logging import (
+    DeferredQueueHandler, JsonFormatter, RequestSamplingFilter, parse_sample_rates
+)
+
+
+def make_record(level=logging.INFO, msg="Search query '%s' returned %d results", args=("rye", 3)):
+    return logging.LogRecord("app", level, __file__, 1, msg, args, None)
+
+
+def test_parse_sample_rates():
+    assert parse_sample_rates("search_whiskeys=0.05, get_quiz=1") == {
+        "search_whiskeys": 0.05, "get_quiz": 1.0
+    }
+    assert parse_sample_rates("") == {}
+    with pytest.raises(ValueError):
+        parse_sample_rates("get_quiz=2")
+
+
+def test_sampling_applies_to_successes_only():
+    app = Flask(__name__)
+    app.add_url_rule('/search', 'search_whiskeys', lambda: '')
+    sampler = RequestSamplingFilter({"search_whiskeys": 0.0}, rng=lambda: 0.5)
+
+    with app.test_request_context('/search'):
+        info = make_record()
+        assert sampler.filter(info) is False
+        error = make_record(logging.ERROR)
+        assert sampler.filter(error) is True
+        assert error.route == "search_whiskeys"
+
+    # Outside a request (startup, scripts) nothing is dropped
+    assert sampler.filter(make_record()) is True
+
+
+def test_queue_handler_defers_formatting():
+    class Loud:
+        def __str__(self):
+            raise AssertionError("formatted in the request thread")
+
+    log_queue = queue.SimpleQueue()
+    DeferredQueueHandler(log_queue).handle(make_record(msg="%s", args=(Loud(),)))
+    assert log_queue.get_nowait().args[0].__class__ is Loud
+
+
+def test_json_formatter_includes_route_extras_and_exception():
+    record = make_record()
+    record.route = "search_whiskeys"
+    record.duration_ms = 1.5
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        import sys
+        record.exc_info = sys.exc_info()
+
+    entry = json.loads(JsonFormatter().format(record))
+    assert entry["message"] == "Search query 'rye' returned 3 results"
+    assert entry["route"] == "search_whiskeys"
+    assert entry["duration_ms"] == 1.5
+    assert "ValueError: boom" in entry["exc"]
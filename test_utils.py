@@ -2,12 +2,15 @@
 Test script for database utility functions.
 """
 
+import pytest
+
 from database import (
     normalize_url, 
     normalize_string, 
     parse_date, 
     get_current_timestamp
 )
+from utils import parse_price, parse_proof
 
 print("Testing Utility Functions")
 print("=" * 50)
@@ -49,4 +52,44 @@ for date in test_dates:
 
 # Test get_current_timestamp
 print("\n4. Testing get_current_timestamp():")
-print(f"  Current UTC: {get_current_timestamp()}")
\ No newline at end of file
+print(f"  Current UTC: {get_current_timestamp()}")
+
+
+@pytest.mark.parametrize('raw, proof', [
+    ("90", 90.0),
+    ("107.8", 107.8),
+    ("114.2 (Barrel Proof)", 114.2),
+    ("100-110", 100.0),
+    ("45% ABV", 90.0),
+    ("ABV: 58.4", 116.8),
+    ("750ml, 90 proof", 90.0),
+    ("1.75 L bottle at 100 proof", 100.0),
+    ("2024 Release, 45%", 90.0),
+    ("Varies", None),
+    ("750ml", None),
+])
+def test_parse_proof(raw, proof):
+    assert parse_proof(raw) == (raw, proof)
+
+
+@pytest.mark.parametrize('raw, price', [
+    ("$30", 30.0),
+    ("$49.99", 49.99),
+    ("$1,200", 1200.0),
+    ("$60-$70", 60.0),
+    ("~$45 (750ml)", 45.0),
+    ("750ml bottle, $45", 45.0),
+    ("45 USD", 45.0),
+    ("USD 45", 45.0),
+    ("750ml", None),
+    ("Around 50 bucks", None),
+    ("N/A", None),
+    ("$0", None),
+])
+def test_parse_price(raw, price):
+    assert parse_price(raw) == (raw, price)
+
+
+def test_parse_missing_values():
+    assert parse_proof(None) == (None, None)
+    assert parse_price("") == (None, None)
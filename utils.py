@@ -208,6 +208,111 @@ def parse_age(age_str: str) -> Tuple[Optional[str], Optional[float]]:
     return (raw, None)
 
 
+# A number in a field, allowing thousands separators ("1,200.50")
+_NUMBER = re.compile(r'\d{1,3}(?:,\d{3})+(?:\.\d+)?|\d+(?:\.\d+)?')
+
+# A number followed by one of these is a bottle size ("750ml"), not a proof
+_VOLUME_UNIT = re.compile(r'\s*(?:ml|cl|l|liters?|litres?|oz)\b', re.IGNORECASE)
+
+# A dollar amount: "$45", "45 USD", "USD 45"
+_DOLLARS = re.compile(
+    r'\$\s*(?P<a>{0})|(?P<b>{0})\s*USD\b|\bUSD\s*(?P<c>{0})'.format(_NUMBER.pattern),
+    re.IGNORECASE
+)
+
+# Anything outside this is a parsing accident, not a proof
+MIN_PROOF, MAX_PROOF = 40.0, 200.0
+
+
+def parse_proof(proof_str: str) -> Tuple[Optional[str], Optional[float]]:
+    """
+    Parse a proof string into raw value and numeric proof.
+    
+    Handles:
+    - "90", "107.8"
+    - "114.2 (Barrel Proof)"
+    - "100-110" (ranges use the lower bound)
+    - "45% ABV" (converted to proof)
+    - "750ml, 90 proof" (bottle sizes and out-of-range numbers are skipped)
+    - "Varies" / "Cask Strength" (no number)
+    
+    Args:
+        proof_str: Raw proof string from the review
+    
+    Returns:
+        Tuple of (raw_proof_string, proof)
+        - proof: Float US proof, or None if missing/unparseable
+        
+    Examples:
+        >>> parse_proof("114.2 (Barrel Proof)")
+        ('114.2 (Barrel Proof)', 114.2)
+        >>> parse_proof("45% ABV")
+        ('45% ABV', 90.0)
+        >>> parse_proof("750ml, 90 proof")
+        ('750ml, 90 proof', 90.0)
+        >>> parse_proof("Varies")
+        ('Varies', None)
+    """
+    if not proof_str:
+        return (None, None)
+    
+    raw = proof_str.strip()
+    # ABV given instead of proof ("ABV: 45"); "45%" is always ABV
+    abv = 'abv' in raw.lower() and 'proof' not in raw.lower()
+    for match in _NUMBER.finditer(raw):
+        rest = raw[match.end():]
+        if _VOLUME_UNIT.match(rest):
+            continue
+        value = float(match.group().replace(',', ''))
+        if abv or rest.lstrip().startswith('%'):
+            value *= 2
+        if MIN_PROOF <= value <= MAX_PROOF:
+            return (raw, round(value, 2))
+    return (raw, None)
+
+
+def parse_price(price_str: str) -> Tuple[Optional[str], Optional[float]]:
+    """
+    Parse a price string into raw value and US dollars.
+    
+    Handles:
+    - "$30", "$49.99", "$1,200"
+    - "$60-$70" (ranges use the lower bound)
+    - "~$45 (750ml)" (first amount wins)
+    - "45 USD", "USD 45"
+    - "N/A" / "750ml" / "Around 50 bucks" (no dollar amount)
+    
+    Args:
+        price_str: Raw price string from the review
+    
+    Returns:
+        Tuple of (raw_price_string, price_usd)
+        - price_usd: Float dollars, or None if missing/unparseable
+        
+    Examples:
+        >>> parse_price("$1,200")
+        ('$1,200', 1200.0)
+        >>> parse_price("$60-$70")
+        ('$60-$70', 60.0)
+        >>> parse_price("750ml")
+        ('750ml', None)
+    """
+    if not price_str:
+        return (None, None)
+    
+    raw = price_str.strip()
+    # Bare numbers are too often bottle sizes or prose ("750ml", "50 bucks")
+    match = _DOLLARS.search(raw)
+    if match is None:
+        return (raw, None)
+    
+    amount = match.group('a') or match.group('b') or match.group('c')
+    value = float(amount.replace(',', ''))
+    if value <= 0:
+        return (raw, None)
+    return (raw, round(value, 2))
+
+
 # Test the functions when running this file directly
 if __name__ == "__main__":
     print("Testing utility functions...\n")
@@ -4,14 +4,15 @@ Verification script to review auto-extracted descriptors
 Shows original review text alongside matched descriptors
 """
 
-import sqlite3
 from pathlib import Path
 
+from db_connections import connect_readonly
+
 DB_PATH = Path("whiskey_mvp_v2.db")
 
 def verify_single_whiskey(whiskey_name=None):
     """Show detailed extraction for a specific whiskey"""
-    conn = sqlite3.connect(DB_PATH)
+    conn = connect_readonly(DB_PATH, row_factory=None)
     cursor = conn.cursor()
 
     # Get whiskey ID
@@ -85,7 +86,7 @@ def verify_single_whiskey(whiskey_name=None):
 
 def show_extraction_stats():
     """Show overall extraction statistics"""
-    conn = sqlite3.connect(DB_PATH)
+    conn = connect_readonly(DB_PATH, row_factory=None)
     cursor = conn.cursor()
 
     print("=" * 80)
@@ -150,7 +151,7 @@ def show_extraction_stats():
 
 def list_all_whiskeys():
     """List all whiskeys in MVP database"""
-    conn = sqlite3.connect(DB_PATH)
+    conn = connect_readonly(DB_PATH, row_factory=None)
     cursor = conn.cursor()
 
     cursor.execute("""
@@ -172,7 +173,7 @@ def list_all_whiskeys():
 
 def check_matching_quality():
     """Check for potential matching issues"""
-    conn = sqlite3.connect(DB_PATH)
+    conn = connect_readonly(DB_PATH, row_factory=None)
     cursor = conn.cursor()
 
     print("=" * 80)